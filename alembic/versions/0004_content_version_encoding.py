@@ -0,0 +1,30 @@
+"""Allow snapshot/delta encoded content version bodies"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("content_versions") as batch:
+        batch.add_column(
+            sa.Column("body_encoding", sa.String(length=16), nullable=False, server_default="plain")
+        )
+        batch.add_column(sa.Column("body_data", sa.LargeBinary(), nullable=True))
+        batch.alter_column("body", existing_type=sa.Text(), nullable=True)
+
+
+def downgrade() -> None:
+    # Encoded rows must be expanded first: python -m app.commands.compact_versions --mode plain
+    with op.batch_alter_table("content_versions") as batch:
+        batch.alter_column("body", existing_type=sa.Text(), nullable=False)
+        batch.drop_column("body_data")
+        batch.drop_column("body_encoding")
@@ -0,0 +1,45 @@
+"""Add time-bucketed analytics rollups and their watermark"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "analytics_rollups",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("granularity", sa.String(length=16), nullable=False),
+        sa.Column("bucket_start", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("event_type", sa.String(length=100), nullable=False),
+        sa.Column("dimension", sa.String(length=100), nullable=False, server_default=""),
+        sa.Column("dimension_value", sa.String(length=255), nullable=False, server_default=""),
+        sa.Column("count", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.UniqueConstraint(
+            "granularity",
+            "event_type",
+            "dimension",
+            "bucket_start",
+            "dimension_value",
+            name="uq_analytics_rollups_bucket",
+        ),
+    )
+    op.create_table(
+        "analytics_rollup_watermarks",
+        sa.Column("name", sa.String(length=100), primary_key=True),
+        sa.Column("last_event_id", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("analytics_rollup_watermarks")
+    op.drop_table("analytics_rollups")
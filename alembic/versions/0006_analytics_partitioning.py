@@ -0,0 +1,127 @@
+"""Partition analytics_events by month (PostgreSQL) and add the archive table"""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+
+JSON_TYPE = sa.JSON().with_variant(postgresql.JSONB(astext_type=sa.Text()), "postgresql")
+
+# Must match app.services.analytics_retention.PARTITION_PREFIX.
+PARTITION_PREFIX = "analytics_events_p"
+
+# Months of partitions created ahead of "now" at upgrade time; the
+# maintenance command keeps extending this window afterwards.
+MONTHS_AHEAD = 3
+
+
+def _is_postgres(bind) -> bool:
+    return bind.dialect.name == "postgresql"
+
+
+def _add_months(value: datetime, months: int) -> datetime:
+    years, month_index = divmod(value.month - 1 + months, 12)
+    return value.replace(year=value.year + years, month=month_index + 1)
+
+
+def _month_start(value: datetime) -> datetime:
+    return value.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def _partition_events(bind) -> None:
+    op.execute("ALTER TABLE analytics_events RENAME TO analytics_events_unpartitioned")
+    op.execute("ALTER INDEX IF EXISTS ix_analytics_events_payload_gin RENAME TO ix_analytics_events_unpartitioned_payload_gin")
+    op.execute(
+        """
+        CREATE TABLE analytics_events (
+            id INTEGER NOT NULL DEFAULT nextval('analytics_events_id_seq'),
+            user_id INTEGER REFERENCES users (id) ON DELETE SET NULL,
+            session_id VARCHAR(128),
+            event_type VARCHAR(100) NOT NULL,
+            payload JSONB,
+            occurred_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(),
+            PRIMARY KEY (id, occurred_at)
+        ) PARTITION BY RANGE (occurred_at)
+        """
+    )
+    op.execute("ALTER SEQUENCE analytics_events_id_seq OWNED BY analytics_events.id")
+    op.execute("CREATE TABLE analytics_events_default PARTITION OF analytics_events DEFAULT")
+    op.execute(
+        "CREATE INDEX ix_analytics_events_payload_gin ON analytics_events USING gin (payload jsonb_path_ops)"
+    )
+
+    now = _month_start(datetime.now(timezone.utc))
+    oldest = bind.execute(sa.text("SELECT min(occurred_at) FROM analytics_events_unpartitioned")).scalar()
+    month = _month_start(oldest.astimezone(timezone.utc)) if oldest is not None else now
+    while month <= _add_months(now, MONTHS_AHEAD):
+        upper = _add_months(month, 1)
+        op.execute(
+            f"CREATE TABLE {PARTITION_PREFIX}{month:%Y%m} PARTITION OF analytics_events "
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{upper.isoformat()}')"
+        )
+        month = upper
+
+    op.execute("INSERT INTO analytics_events SELECT * FROM analytics_events_unpartitioned")
+    op.execute("DROP TABLE analytics_events_unpartitioned")
+
+
+def _unpartition_events() -> None:
+    op.execute("ALTER TABLE analytics_events RENAME TO analytics_events_partitioned")
+    op.execute("ALTER INDEX IF EXISTS ix_analytics_events_payload_gin RENAME TO ix_analytics_events_partitioned_payload_gin")
+    op.execute(
+        """
+        CREATE TABLE analytics_events (
+            id INTEGER NOT NULL DEFAULT nextval('analytics_events_id_seq') PRIMARY KEY,
+            user_id INTEGER REFERENCES users (id) ON DELETE SET NULL,
+            session_id VARCHAR(128),
+            event_type VARCHAR(100) NOT NULL,
+            payload JSONB,
+            occurred_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now()
+        )
+        """
+    )
+    op.execute("ALTER SEQUENCE analytics_events_id_seq OWNED BY analytics_events.id")
+    op.execute("INSERT INTO analytics_events SELECT * FROM analytics_events_partitioned")
+    op.execute("DROP TABLE analytics_events_partitioned CASCADE")
+    op.execute(
+        "CREATE INDEX ix_analytics_events_payload_gin ON analytics_events USING gin (payload jsonb_path_ops)"
+    )
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if _is_postgres(bind):
+        _partition_events(bind)
+
+    op.create_table(
+        "analytics_events_archive",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=False),
+        sa.Column("user_id", sa.Integer(), nullable=True),
+        sa.Column("session_id", sa.String(length=128), nullable=True),
+        sa.Column("event_type", sa.String(length=100), nullable=False),
+        sa.Column("payload", JSON_TYPE, nullable=True),
+        sa.Column("occurred_at", sa.DateTime(timezone=True), nullable=False),
+    )
+    op.create_index(
+        "ix_analytics_events_archive_occurred_at", "analytics_events_archive", ["occurred_at"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_analytics_events_archive_occurred_at", table_name="analytics_events_archive")
+    op.drop_table("analytics_events_archive")
+
+    bind = op.get_bind()
+    if _is_postgres(bind):
+        _unpartition_events()
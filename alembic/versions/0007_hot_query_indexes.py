@@ -0,0 +1,40 @@
+"""Composite and partial indexes for hot query paths"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0007"
+down_revision = "0006"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Sitemap / published listings: status filter then the keyset sort columns.
+    op.create_index(
+        "ix_content_items_status_updated_at", "content_items", ["status", "updated_at", "id"]
+    )
+    op.create_index(
+        "ix_content_items_status_published_at", "content_items", ["status", "published_at", "id"]
+    )
+    # On PostgreSQL this lands on the partitioned parent and cascades to every partition.
+    op.create_index("ix_analytics_events_occurred_at", "analytics_events", ["occurred_at"])
+    op.create_index(
+        "ix_users_reset_token",
+        "users",
+        ["reset_token"],
+        postgresql_where=sa.text("reset_token IS NOT NULL"),
+        sqlite_where=sa.text("reset_token IS NOT NULL"),
+    )
+    # seo_metadata.content_id is already covered by its unique constraint.
+
+
+def downgrade() -> None:
+    op.drop_index("ix_users_reset_token", table_name="users")
+    op.drop_index("ix_analytics_events_occurred_at", table_name="analytics_events")
+    op.drop_index("ix_content_items_status_published_at", table_name="content_items")
+    op.drop_index("ix_content_items_status_updated_at", table_name="content_items")
@@ -0,0 +1,40 @@
+"""Full-text search index for content (tsvector + GIN on PostgreSQL, FTS5 on SQLite)"""
+
+from __future__ import annotations
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "0008"
+down_revision = "0007"
+branch_labels = None
+depends_on = None
+
+
+def _is_postgres(bind) -> bool:
+    return bind.dialect.name == "postgresql"
+
+
+# Existing rows are indexed by `python -m app.commands.rebuild_fulltext`.
+def upgrade() -> None:
+    bind = op.get_bind()
+    if _is_postgres(bind):
+        op.execute("ALTER TABLE content_items ADD COLUMN IF NOT EXISTS search_vector tsvector")
+        op.execute(
+            "CREATE INDEX IF NOT EXISTS ix_content_items_search_vector ON content_items USING gin (search_vector)"
+        )
+    elif bind.dialect.name == "sqlite":
+        op.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS content_fts USING fts5("
+            "title, body, tokenize='unicode61 remove_diacritics 2')"
+        )
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if _is_postgres(bind):
+        op.execute("DROP INDEX IF EXISTS ix_content_items_search_vector")
+        op.execute("ALTER TABLE content_items DROP COLUMN IF EXISTS search_vector")
+    elif bind.dialect.name == "sqlite":
+        op.execute("DROP TABLE IF EXISTS content_fts")
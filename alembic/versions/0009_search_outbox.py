@@ -0,0 +1,33 @@
+"""Transactional outbox for search indexing"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0009"
+down_revision = "0008"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "search_outbox",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("content_id", sa.Integer(), nullable=False),
+        sa.Column("attempts", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("available_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+        sa.Column("last_error", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+    )
+    op.create_index("ix_search_outbox_content_id", "search_outbox", ["content_id"])
+    op.create_index("ix_search_outbox_available_at", "search_outbox", ["available_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_search_outbox_available_at", table_name="search_outbox")
+    op.drop_index("ix_search_outbox_content_id", table_name="search_outbox")
+    op.drop_table("search_outbox")
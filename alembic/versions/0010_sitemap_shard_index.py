@@ -0,0 +1,20 @@
+"""Index for id-range sitemap shards"""
+
+from __future__ import annotations
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "0010"
+down_revision = "0009"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_content_items_status_id", "content_items", ["status", "id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_content_items_status_id", table_name="content_items")
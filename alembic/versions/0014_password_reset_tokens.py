@@ -0,0 +1,48 @@
+"""Hashed password reset tokens in their own table"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0014"
+down_revision = "0013"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "password_reset_tokens",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("token_hash", sa.String(length=64), nullable=False),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("expires_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+        sa.UniqueConstraint("token_hash", name="uq_password_reset_tokens_token_hash"),
+    )
+    op.create_index("ix_password_reset_tokens_user_id", "password_reset_tokens", ["user_id"])
+    op.create_index("ix_password_reset_tokens_expires_at", "password_reset_tokens", ["expires_at"])
+    # Pending plaintext tokens are dropped: users simply request a new link.
+    op.drop_index("ix_users_reset_token", table_name="users")
+    with op.batch_alter_table("users") as batch:
+        batch.drop_column("reset_token_expires")
+        batch.drop_column("reset_token")
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("users") as batch:
+        batch.add_column(sa.Column("reset_token", sa.String(length=255), nullable=True))
+        batch.add_column(sa.Column("reset_token_expires", sa.DateTime(timezone=True), nullable=True))
+    op.create_index(
+        "ix_users_reset_token",
+        "users",
+        ["reset_token"],
+        postgresql_where=sa.text("reset_token IS NOT NULL"),
+        sqlite_where=sa.text("reset_token IS NOT NULL"),
+    )
+    op.drop_index("ix_password_reset_tokens_expires_at", table_name="password_reset_tokens")
+    op.drop_index("ix_password_reset_tokens_user_id", table_name="password_reset_tokens")
+    op.drop_table("password_reset_tokens")
@@ -0,0 +1,24 @@
+"""Safety horizon for the analytics rollup watermark"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0015"
+down_revision = "0014"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("analytics_rollup_watermarks", sa.Column("horizon_event_id", sa.Integer(), nullable=True))
+    op.add_column("analytics_rollup_watermarks", sa.Column("horizon_at", sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("analytics_rollup_watermarks") as batch_op:
+        batch_op.drop_column("horizon_at")
+        batch_op.drop_column("horizon_event_id")
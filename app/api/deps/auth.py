@@ -3,43 +3,60 @@ from __future__ import annotations
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.future import select
 from sqlalchemy.orm import selectinload
 
-from app.core.security import verify_access_token
+from app.core.security import decode_access_token
 from app.db.session import get_session
 from app.models.user import Role, User
+from app.services.principal import Principal, current_roles_version, load_principal
+from app.services.refresh_tokens import revoked_families
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
+optional_oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login", auto_error=False)
 
 
-async def get_current_user(token: str = Depends(oauth2_scheme), session: AsyncSession = Depends(get_session)) -> User:
-    user_id = verify_access_token(token)
-    if not user_id:
+async def get_current_principal(
+    token: str = Depends(oauth2_scheme), session: AsyncSession = Depends(get_session)
+) -> Principal:
+    payload = decode_access_token(token)
+    if not payload or not payload.get("sub"):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid authentication credentials")
+    if payload.get("fam") in revoked_families:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Session revoked")
+    principal = Principal.from_claims(payload)
+    # The session only opens a connection on a cache miss.
+    if principal is not None:
+        current = await current_roles_version(session, principal.id)
+        if current is None:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
+        if current != principal.roles_version:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token roles are outdated")
+    else:
+        principal = await load_principal(session, int(payload["sub"]))
+        if principal is None:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
+    if not principal.is_active:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Inactive user")
+    return principal
+
 
-    stmt = (
-        select(User)
-        .options(selectinload(User.roles).selectinload(Role.permissions))
-        .where(User.id == int(user_id))
-    )
-    result = await session.execute(stmt)
-    user = result.scalar_one_or_none()
+async def get_current_user(
+    principal: Principal = Depends(get_current_principal), session: AsyncSession = Depends(get_session)
+) -> User:
+    """Full ORM user, for the few routes that need more than :class:`Principal`."""
+
+    user = await session.get(User, principal.id, options=(selectinload(User.roles).selectinload(Role.permissions),))
     if not user:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
-    if not user.is_active:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Inactive user")
     return user
 
 
 def require_roles(*roles: str):
     expected = set(roles)
 
-    async def role_checker(user: User = Depends(get_current_user)) -> User:
-        if user.is_superuser:
-            return user
-        if expected.intersection({role.name for role in user.roles}):
-            return user
+    async def role_checker(principal: Principal = Depends(get_current_principal)) -> Principal:
+        if principal.has_any_role(expected):
+            return principal
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Insufficient permissions")
 
     return role_checker
@@ -1,44 +1,86 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, status
+from datetime import datetime
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps.auth import require_roles
+from app.core.export import ExportFormat, export_response
+from app.core.serialization import json_response
 from app.db.session import get_session
-from app.schemas.analytics import AnalyticsEventCreate, AnalyticsEventRead, DashboardRead
+from app.schemas.analytics import (
+    AnalyticsEventBatch,
+    AnalyticsEventCreate,
+    AnalyticsEventRead,
+    AnalyticsEventsAccepted,
+    DashboardData,
+    DashboardRead,
+    DashboardSeries,
+    DashboardSeriesData,
+    RollupPoint,
+)
 from app.services.analytics import AnalyticsService
+from app.services.analytics_buffer import BufferFull, event_buffer
+from app.services.analytics_rollup import RollupService
 
 router = APIRouter(tags=["analytics"])
 
 
-def _event_to_schema(event) -> AnalyticsEventRead:
-    return AnalyticsEventRead.model_validate(event, from_attributes=True)
-
-
 def _dashboard_to_schema(dashboard) -> DashboardRead:
     return DashboardRead.model_validate(dashboard, from_attributes=True)
 
 
+def _ingest_unavailable(exc: BufferFull) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail=str(exc),
+        headers={"Retry-After": str(max(1, round(event_buffer.flush_interval)))},
+    )
+
+
 @router.post(
     "/analytics/events",
-    response_model=AnalyticsEventRead,
-    status_code=status.HTTP_201_CREATED,
+    response_model=AnalyticsEventsAccepted,
+    status_code=status.HTTP_202_ACCEPTED,
 )
 async def create_event(
     payload: AnalyticsEventCreate,
     session: AsyncSession = Depends(get_session),
-) -> AnalyticsEventRead:
+) -> AnalyticsEventsAccepted:
     service = AnalyticsService(session)
-    event = await service.log_event(
-        event_type=payload.event_type,
-        user_id=payload.user_id,
-        session_id=payload.session_id,
-        payload=payload.payload,
-        occurred_at=payload.occurred_at,
-    )
+    try:
+        accepted = await service.log_event(
+            event_type=payload.event_type,
+            user_id=payload.user_id,
+            session_id=payload.session_id,
+            payload=payload.payload,
+            occurred_at=payload.occurred_at,
+        )
+    except BufferFull as exc:
+        raise _ingest_unavailable(exc) from exc
+    await session.commit()
+    return AnalyticsEventsAccepted(accepted=accepted)
+
+
+@router.post(
+    "/analytics/events:batch",
+    response_model=AnalyticsEventsAccepted,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def create_events(
+    payload: AnalyticsEventBatch,
+    session: AsyncSession = Depends(get_session),
+) -> AnalyticsEventsAccepted:
+    service = AnalyticsService(session)
+    try:
+        accepted = await service.log_events([event.model_dump() for event in payload.events])
+    except BufferFull as exc:
+        raise _ingest_unavailable(exc) from exc
     await session.commit()
-    await session.refresh(event)
-    return _event_to_schema(event)
+    return AnalyticsEventsAccepted(accepted=accepted)
 
 
 @router.get(
@@ -46,10 +88,25 @@ async def create_event(
     response_model=list[AnalyticsEventRead],
     dependencies=[Depends(require_roles("editor", "admin"))],
 )
-async def list_events(session: AsyncSession = Depends(get_session)) -> list[AnalyticsEventRead]:
+async def list_events(session: AsyncSession = Depends(get_session)) -> Response:
+    service = AnalyticsService(session)
+    rows = await service.list_event_rows()
+    return json_response(list[AnalyticsEventRead], rows)
+
+
+@router.get(
+    "/analytics/events/export",
+    response_class=StreamingResponse,
+    dependencies=[Depends(require_roles("editor", "admin"))],
+)
+async def export_events(
+    format: ExportFormat = "ndjson",
+    session: AsyncSession = Depends(get_session),
+) -> StreamingResponse:
     service = AnalyticsService(session)
-    events = await service.list_events()
-    return [_event_to_schema(event) for event in events]
+    return export_response(
+        session, service.event_export_statement(), AnalyticsEventRead, filename="events", format=format, orm=False
+    )
 
 
 @router.get(
@@ -61,3 +118,62 @@ async def list_dashboards(session: AsyncSession = Depends(get_session)) -> list[
     service = AnalyticsService(session)
     dashboards = await service.list_dashboards()
     return [_dashboard_to_schema(dashboard) for dashboard in dashboards]
+
+
+@router.get(
+    "/analytics/rollups",
+    response_model=list[RollupPoint],
+    dependencies=[Depends(require_roles("editor", "admin"))],
+)
+async def get_rollups(
+    event_type: str,
+    granularity: Literal["minute", "hour", "day"] = "hour",
+    start: datetime | None = None,
+    end: datetime | None = None,
+    dimension_value: str | None = None,
+    by_dimension: bool = False,
+    session: AsyncSession = Depends(get_session),
+) -> Response:
+    service = RollupService(session)
+    points = await service.series(
+        event_type=event_type,
+        granularity=granularity,
+        start=start,
+        end=end,
+        dimension_value=dimension_value,
+        by_dimension=by_dimension,
+    )
+    return json_response(list[RollupPoint], points)
+
+
+@router.get(
+    "/analytics/dashboards/{dashboard_id}/data",
+    response_model=DashboardData,
+    dependencies=[Depends(require_roles("editor", "admin"))],
+)
+async def get_dashboard_data(
+    dashboard_id: int,
+    start: datetime | None = None,
+    end: datetime | None = None,
+    session: AsyncSession = Depends(get_session),
+) -> DashboardData:
+    dashboard = await AnalyticsService(session).get_dashboard(dashboard_id)
+    if not dashboard:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Dashboard not found")
+    try:
+        definitions = [DashboardSeries.model_validate(item) for item in dashboard.definition.get("series", [])]
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(exc)) from exc
+    service = RollupService(session)
+    series = []
+    for definition in definitions:
+        points = await service.series(
+            event_type=definition.event_type,
+            granularity=definition.granularity,
+            start=start,
+            end=end,
+            dimension_value=definition.dimension_value,
+            by_dimension=definition.by_dimension,
+        )
+        series.append(DashboardSeriesData(**definition.model_dump(), points=points))
+    return DashboardData(dashboard_id=dashboard.id, series=series)
@@ -1,22 +1,18 @@
 from __future__ import annotations
 
-import secrets
-from datetime import datetime, timedelta
-
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import select
+from fastapi.responses import StreamingResponse
 
-from app.api.deps.auth import get_current_user, require_roles
+from app.api.deps.auth import get_current_user, optional_oauth2_scheme, require_roles
+from app.core.config import settings
+from app.core.export import ExportFormat, export_response
 from app.core.security import (
     create_access_token,
+    decode_access_token,
     create_mfa_secret,
-    create_refresh_token,
     generate_mfa_uri,
-    get_password_hash,
     verify_access_token,
     verify_mfa_token,
-    verify_password,
-    verify_refresh_token,
 )
 from app.models.user import Role, User
 from app.schemas.auth import (
@@ -36,18 +32,36 @@ from app.schemas.user import (
     UserUpdate,
 )
 from app.services.auth import AuthService, get_auth_service
+from app.services.passwords import HasherBusy, password_hasher
+from app.services.principal import Principal
+from app.services.refresh_tokens import InvalidRefreshToken, RefreshTokenStore
 
 router = APIRouter(tags=["auth"])
 
 
 def _user_to_schema(user: User) -> UserRead:
-    return UserRead.model_validate(
-        user,
-        from_attributes=True,
-        update={"mfa_enabled": bool(user.mfa_secret)},
+    return UserRead.model_validate(user, from_attributes=True)
+
+
+def _hashing_unavailable(exc: HasherBusy) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(exc), headers={"Retry-After": "1"}
     )
 
 
+async def _hash_password(password: str) -> str:
+    try:
+        return await password_hasher.hash(password)
+    except HasherBusy as exc:
+        raise _hashing_unavailable(exc) from exc
+
+
+def _access_token(user: User, family_id: str) -> str:
+    # With AUTH_TOKEN_CLAIMS the token carries roles and permissions; ``user.roles`` must be loaded.
+    claims = Principal.from_user(user).claims() if settings.auth_token_claims else {}
+    return create_access_token(str(user.id), claims={**claims, "fam": family_id})
+
+
 @router.post("/auth/signup", response_model=SignupResponse, status_code=status.HTTP_201_CREATED)
 async def signup(
     user_in: UserCreate,
@@ -56,7 +70,7 @@ async def signup(
     existing = await auth_service.get_user_by_email(user_in.email)
     if existing:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Email already registered")
-    hashed_password = get_password_hash(user_in.password)
+    hashed_password = await _hash_password(user_in.password)
     mfa_secret = create_mfa_secret() if user_in.mfa_enabled else None
     role_ids = user_in.role_ids or []
     if not role_ids:
@@ -88,15 +102,24 @@ async def login(
     auth_service: AuthService = Depends(get_auth_service),
 ) -> Token:
     user = await auth_service.get_user_by_email(request.email)
-    if not user or not verify_password(request.password, user.hashed_password):
+    if not user:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
+    try:
+        valid, rehashed = await password_hasher.verify_and_update(request.password, user.hashed_password)
+    except HasherBusy as exc:
+        raise _hashing_unavailable(exc) from exc
+    if not valid:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
     if not user.is_active or user.status != "active":
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="User inactive")
     if user.mfa_secret:
         if not request.mfa_token or not verify_mfa_token(user.mfa_secret, request.mfa_token):
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="MFA required")
-    token = create_access_token(str(user.id))
-    refresh = create_refresh_token(str(user.id))
+    refresh, family_id = await RefreshTokenStore(auth_service.session).issue(user.id)
+    token = _access_token(user, family_id)
+    if rehashed:
+        # Stored with outdated hashing parameters: upgrade while we have the plain password.
+        user.hashed_password = rehashed
     await auth_service.record_login(user)
     await auth_service.session.commit()
     return Token(access_token=token, refresh_token=refresh)
@@ -107,20 +130,34 @@ async def refresh_token(
     payload: RefreshRequest,
     auth_service: AuthService = Depends(get_auth_service),
 ) -> Token:
-    user_id = verify_refresh_token(payload.refresh_token)
-    if not user_id:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid refresh token")
-    user = await auth_service.get_user(int(user_id))
+    try:
+        user_id, refresh_token_value, family_id = await RefreshTokenStore(auth_service.session).rotate(
+            payload.refresh_token
+        )
+    except InvalidRefreshToken as exc:
+        # Keeps the family revocation recorded when a consumed token is replayed.
+        await auth_service.session.commit()
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=str(exc)) from exc
+    user = await auth_service.get_user(user_id)
     if not user or not user.is_active or user.status != "active":
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="User inactive")
-    access_token = create_access_token(user_id)
-    refresh_token_value = create_refresh_token(user_id)
+    access_token = _access_token(user, family_id)
+    await auth_service.session.commit()
     return Token(access_token=access_token, refresh_token=refresh_token_value)
 
 
 @router.post("/auth/logout", status_code=status.HTTP_204_NO_CONTENT)
-async def logout() -> None:
-    return None
+async def logout(
+    token: str | None = Depends(optional_oauth2_scheme),
+    auth_service: AuthService = Depends(get_auth_service),
+) -> None:
+    """Revoke the session (refresh token family) of the presented access token."""
+
+    payload = decode_access_token(token) if token else None
+    family_id = payload.get("fam") if payload else None
+    if family_id:
+        await RefreshTokenStore(auth_service.session).revoke_family(family_id)
+        await auth_service.session.commit()
 
 
 @router.get("/auth/me", response_model=UserRead)
@@ -135,9 +172,7 @@ async def request_password_recovery(
 ) -> dict:
     user = await auth_service.get_user_by_email(payload.email)
     if user:
-        user.reset_token = secrets.token_urlsafe(32)
-        user.reset_token_expires = datetime.utcnow() + timedelta(hours=1)
-        auth_service.session.add(user)
+        await auth_service.create_reset_token(user)
         await auth_service.session.commit()
     return {"message": "If the email exists, recovery instructions were sent."}
 
@@ -147,13 +182,12 @@ async def reset_password(
     payload: PasswordReset,
     auth_service: AuthService = Depends(get_auth_service),
 ) -> dict:
-    user = await auth_service.session.scalar(select(User).where(User.reset_token == payload.token))
-    if not user or not user.reset_token_expires or user.reset_token_expires < datetime.utcnow():
+    user = await auth_service.consume_reset_token(payload.token)
+    if not user:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid or expired token")
-    user.hashed_password = get_password_hash(payload.new_password)
-    user.reset_token = None
-    user.reset_token_expires = None
-    auth_service.session.add(user)
+    # Whoever held the old password may still hold a session: end all of them.
+    await auth_service.set_password(user, await _hash_password(payload.new_password))
+    await RefreshTokenStore(auth_service.session).revoke_user(user.id)
     await auth_service.session.commit()
     return {"message": "Password updated"}
 
@@ -170,6 +204,20 @@ async def list_users(
     return [_user_to_schema(user) for user in users]
 
 
+@router.get(
+    "/users/export",
+    response_class=StreamingResponse,
+    dependencies=[Depends(require_roles("admin"))],
+)
+async def export_users(
+    format: ExportFormat = "ndjson",
+    auth_service: AuthService = Depends(get_auth_service),
+) -> StreamingResponse:
+    return export_response(
+        auth_service.session, auth_service.export_statement(), UserRead, filename="users", format=format
+    )
+
+
 @router.post(
     "/users",
     response_model=UserRead,
@@ -184,7 +232,7 @@ async def create_user(
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Email already registered")
     user = await auth_service.create_user(
         email=payload.email,
-        hashed_password=get_password_hash(payload.password),
+        hashed_password=await _hash_password(payload.password),
         full_name=payload.full_name,
         status=payload.status,
         role_ids=payload.role_ids or None,
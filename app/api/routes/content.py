@@ -1,23 +1,42 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from datetime import datetime
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps.auth import get_current_user, require_roles
+from app.api.deps.auth import get_current_principal, require_roles
+from app.core.http_cache import (
+    as_utc,
+    has_conditional_headers,
+    is_not_modified,
+    not_modified,
+    strong_etag,
+    validator_headers,
+    weak_etag,
+)
+from app.core.serialization import RawJSONResponse, json_response
 from app.db.session import get_session
-from app.models.content import ContentCategory, ContentItem
-from app.models.user import User
+from app.models.content import ContentCategory, ContentItem, ContentWorkflowState
 from app.schemas.content import (
     ContentCategoryCreate,
     ContentCategoryRead,
     ContentCreate,
+    ContentPage,
     ContentPublish,
     ContentRead,
     ContentUpdate,
+    ContentVersionMeta,
+    ContentVersionPage,
+    ContentVersionRead,
 )
+from app.services.cache import content_cache
 from app.services.content import ContentService
+from app.services.principal import Principal
 from app.services.seo import SEOService
+from app.services.suggest import suggest_index
 
 router = APIRouter(tags=["content"])
 
@@ -26,11 +45,56 @@ def _content_to_schema(item: ContentItem) -> ContentRead:
     return ContentRead.model_validate(item, from_attributes=True)
 
 
-@router.get("/content", response_model=list[ContentRead])
-async def list_content(session: AsyncSession = Depends(get_session)) -> list[ContentRead]:
+def _content_etag(content_id: int, version_number: int | None, updated_at: datetime) -> str:
+    return strong_etag(content_id, version_number or 0, int(as_utc(updated_at).timestamp() * 1_000_000))
+
+
+def _pack_cached(etag: str, last_modified: datetime, body: bytes) -> bytes:
+    # Cache entries carry their validators so hits can still answer with an ETag.
+    return f"{etag}\n{as_utc(last_modified).isoformat()}\n".encode() + body
+
+
+def _unpack_cached(value: bytes) -> tuple[str, datetime, bytes]:
+    etag, last_modified, body = value.split(b"\n", 2)
+    return etag.decode(), datetime.fromisoformat(last_modified.decode()), body
+
+
+@router.get("/content", response_model=ContentPage)
+async def list_content(
+    request: Request,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: str | None = None,
+    sort: Literal["published_at", "updated_at"] = "updated_at",
+    status_filter: str | None = Query(None, alias="status"),
+    type: str | None = None,
+    workflow_state: ContentWorkflowState | None = None,
+    category: str | None = None,
+    session: AsyncSession = Depends(get_session),
+) -> Response:
     service = ContentService(session)
-    items = await service.list_content()
-    return [_content_to_schema(item) for item in items]
+    last_modified, count = await service.listing_validator(
+        sort=sort, status=status_filter, type=type, workflow_state=workflow_state, category=category
+    )
+    etag = weak_etag(request.url.query, last_modified, count)
+    if is_not_modified(request, etag=etag, last_modified=last_modified):
+        return not_modified(etag, last_modified)
+    try:
+        items, next_cursor = await service.list_content(
+            limit=limit,
+            cursor=cursor,
+            sort=sort,
+            status=status_filter,
+            type=type,
+            workflow_state=workflow_state,
+            category=category,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+    return json_response(
+        ContentPage,
+        {"items": items, "next_cursor": next_cursor},
+        headers=validator_headers(etag, last_modified),
+    )
 
 
 @router.post(
@@ -42,7 +106,7 @@ async def list_content(session: AsyncSession = Depends(get_session)) -> list[Con
 async def create_content(
     payload: ContentCreate,
     session: AsyncSession = Depends(get_session),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
 ) -> ContentRead:
     service = ContentService(session)
     item = await service.create_content(
@@ -57,17 +121,33 @@ async def create_content(
         media_links=[(link.media_id, link.role) for link in payload.media_links],
     )
     await session.commit()
-    await session.refresh(item)
+    item = await service.reload(item)
     return _content_to_schema(item)
 
 
 @router.get("/content/{slug}", response_model=ContentRead)
-async def get_content(slug: str, session: AsyncSession = Depends(get_session)) -> ContentRead:
+async def get_content(slug: str, request: Request, session: AsyncSession = Depends(get_session)) -> Response:
     service = ContentService(session)
+    if has_conditional_headers(request):
+        validator = await service.get_validator(slug)
+        if validator is not None:
+            etag = _content_etag(validator.id, validator.version_number, validator.updated_at)
+            if is_not_modified(request, etag=etag, last_modified=validator.updated_at):
+                return not_modified(etag, validator.updated_at)
+
+    cached = await content_cache.get(slug)
+    if cached is not None:
+        etag, last_modified, body = _unpack_cached(cached)
+        return RawJSONResponse(content=body, headers=validator_headers(etag, last_modified))
     item = await service.get_content_by_slug(slug)
     if not item:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Content not found")
-    return _content_to_schema(item)
+    version_number = item.latest_version.version_number if item.latest_version else None
+    etag = _content_etag(item.id, version_number, item.updated_at)
+    body = _content_to_schema(item).model_dump_json().encode()
+    if item.status == "published":
+        await content_cache.set(slug, _pack_cached(etag, item.updated_at, body))
+    return RawJSONResponse(content=body, headers=validator_headers(etag, item.updated_at))
 
 
 @router.patch(
@@ -79,7 +159,7 @@ async def update_content(
     content_id: int,
     payload: ContentUpdate,
     session: AsyncSession = Depends(get_session),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
 ) -> ContentRead:
     service = ContentService(session)
     item = await service.get_content(content_id)
@@ -101,7 +181,7 @@ async def update_content(
         diff=payload.diff,
     )
     await session.commit()
-    await session.refresh(item)
+    item = await service.reload(item)
     return _content_to_schema(item)
 
 
@@ -113,7 +193,7 @@ async def update_content(
 async def publish_content(
     content_id: int,
     session: AsyncSession = Depends(get_session),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
 ) -> ContentRead:
     service = ContentService(session)
     item = await service.get_content(content_id)
@@ -123,10 +203,49 @@ async def publish_content(
     seo_service = SEOService(session)
     await seo_service.recalculate_for_content(item)
     await session.commit()
-    await session.refresh(item)
+    item = await service.reload(item)
     return _content_to_schema(item)
 
 
+@router.get(
+    "/content/{content_id}/versions",
+    response_model=ContentVersionPage,
+    dependencies=[Depends(require_roles("author", "editor", "admin"))],
+)
+async def list_versions(
+    content_id: int,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: str | None = None,
+    session: AsyncSession = Depends(get_session),
+) -> ContentVersionPage:
+    service = ContentService(session)
+    try:
+        versions, next_cursor = await service.list_versions(content_id, limit=limit, cursor=cursor)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+    return ContentVersionPage(
+        items=[ContentVersionMeta.model_validate(version, from_attributes=True) for version in versions],
+        next_cursor=next_cursor,
+    )
+
+
+@router.get(
+    "/content/{content_id}/versions/{version_number}",
+    response_model=ContentVersionRead,
+    dependencies=[Depends(require_roles("author", "editor", "admin"))],
+)
+async def get_version(
+    content_id: int,
+    version_number: int,
+    session: AsyncSession = Depends(get_session),
+) -> ContentVersionRead:
+    service = ContentService(session)
+    version = await service.get_version(content_id, version_number)
+    if not version:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Version not found")
+    return ContentVersionRead.model_validate(version, from_attributes=True)
+
+
 @router.post(
     "/content/categories",
     response_model=ContentCategoryRead,
@@ -141,6 +260,7 @@ async def create_category(
     session.add(category)
     await session.commit()
     await session.refresh(category)
+    suggest_index.put_category(category)
     return ContentCategoryRead.model_validate(category, from_attributes=True)
 
 
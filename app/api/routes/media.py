@@ -1,9 +1,12 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps.auth import require_roles
+from app.core.export import ExportFormat, export_response
+from app.core.serialization import json_response
 from app.db.session import get_session
 from app.schemas.media import MediaAssetCreate, MediaAssetRead
 from app.services.media import MediaService
@@ -16,10 +19,23 @@ def _asset_to_schema(asset) -> MediaAssetRead:
 
 
 @router.get("/media", response_model=list[MediaAssetRead], dependencies=[Depends(require_roles("author", "editor", "admin"))])
-async def list_media(session: AsyncSession = Depends(get_session)) -> list[MediaAssetRead]:
+async def list_media(session: AsyncSession = Depends(get_session)) -> Response:
     service = MediaService(session)
     assets = await service.list_media()
-    return [_asset_to_schema(asset) for asset in assets]
+    return json_response(list[MediaAssetRead], assets)
+
+
+@router.get(
+    "/media/export",
+    response_class=StreamingResponse,
+    dependencies=[Depends(require_roles("author", "editor", "admin"))],
+)
+async def export_media(
+    format: ExportFormat = "ndjson",
+    session: AsyncSession = Depends(get_session),
+) -> StreamingResponse:
+    service = MediaService(session)
+    return export_response(session, service.export_statement(), MediaAssetRead, filename="media", format=format)
 
 
 @router.post(
@@ -54,7 +70,7 @@ async def upload_media(
             bitrate=variant_payload.bitrate,
         )
     await session.commit()
-    await session.refresh(asset)
+    asset = await service.reload(asset)
     return _asset_to_schema(asset)
 
 
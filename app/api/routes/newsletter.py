@@ -1,10 +1,13 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps.auth import require_roles
+from app.core.export import ExportFormat, export_response
+from app.core.serialization import json_response
 from app.db.session import get_session
 from app.models.newsletter import NewsletterSubscription
 from app.schemas.newsletter import NewsletterSubscriptionCreate, NewsletterSubscriptionRead
@@ -51,5 +54,21 @@ async def unsubscribe(payload: NewsletterSubscriptionCreate, session: AsyncSessi
     response_model=list[NewsletterSubscriptionRead],
     dependencies=[Depends(require_roles("editor", "admin"))],
 )
-async def list_subscribers(session: AsyncSession = Depends(get_session)) -> list[NewsletterSubscription]:
-    return list((await session.scalars(select(NewsletterSubscription))).all())
+async def list_subscribers(session: AsyncSession = Depends(get_session)) -> Response:
+    rows = (await session.execute(select(*NewsletterSubscription.__table__.columns))).mappings().all()
+    return json_response(list[NewsletterSubscriptionRead], rows)
+
+
+@router.get(
+    "/subscribers/export",
+    response_class=StreamingResponse,
+    dependencies=[Depends(require_roles("editor", "admin"))],
+)
+async def export_subscribers(
+    format: ExportFormat = "ndjson",
+    session: AsyncSession = Depends(get_session),
+) -> StreamingResponse:
+    stmt = select(*NewsletterSubscription.__table__.columns).order_by(NewsletterSubscription.id)
+    return export_response(
+        session, stmt, NewsletterSubscriptionRead, filename="subscribers", format=format, orm=False
+    )
@@ -1,34 +1,50 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends
-from sqlalchemy import select
+from fastapi import APIRouter, Depends, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.session import get_session
 from app.models.content import ContentItem
-from app.schemas.content import ContentRead
+from app.core.serialization import json_response
+from app.schemas.content import SearchHit, SearchSuggestion
 from app.services.content import ContentService
-from app.services.search import SearchService
+from app.services.search import SearchService, get_search_service
+from app.services.suggest import suggest_index
 
 router = APIRouter(tags=["search"])
 
 
-def _content_to_schema(item: ContentItem) -> ContentRead:
-    return ContentRead.model_validate(item, from_attributes=True)
+def _hit_to_schema(item: ContentItem, snippet: str | None = None) -> SearchHit:
+    return SearchHit.model_validate(item, from_attributes=True).model_copy(update={"snippet": snippet})
 
 
-@router.get("/search", response_model=list[ContentRead])
-async def search_content(query: str, session: AsyncSession = Depends(get_session)) -> list[ContentRead]:
-    search_service = SearchService()
+@router.get("/search", response_model=list[SearchHit])
+async def search_content(
+    query: str,
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    session: AsyncSession = Depends(get_session),
+    search_service: SearchService = Depends(get_search_service),
+) -> list[SearchHit]:
     service = ContentService(session)
-    options = service._default_options()
-    results = await search_service.search_articles(query)
-    if results:
-        ids = [result.get("id") for result in results if result.get("id")]
-        if ids:
-            stmt = select(ContentItem).where(ContentItem.id.in_(ids)).options(*options)
-            items = (await session.scalars(stmt)).all()
-            return [_content_to_schema(item) for item in items]
-    stmt = select(ContentItem).where(ContentItem.title.ilike(f"%{query}%")).options(*options)
-    items = (await session.scalars(stmt)).all()
-    return [_content_to_schema(item) for item in items]
+    hits = await search_service.search_articles(query, limit=limit, offset=offset)
+    if hits is None:
+        # No external engine, or it is unavailable: built-in full-text index.
+        items = await service.search_content(query, limit=limit, offset=offset)
+        return [_hit_to_schema(item) for item in items]
+
+    # The engine paginates and ranks; hydrate that page in one query, keeping its order.
+    snippets: dict[int, str | None] = {}
+    for hit in hits:
+        try:
+            snippets.setdefault(int(hit["id"]), hit.get("snippet"))
+        except (KeyError, TypeError, ValueError):
+            continue
+    items = await service.get_summaries(list(snippets))
+    return [_hit_to_schema(item, snippets[item.id]) for item in items]
+
+
+@router.get("/search/suggest", response_model=list[SearchSuggestion])
+async def suggest(q: str = Query(..., max_length=100), limit: int = Query(8, ge=1, le=20)) -> Response:
+    # Served from the in-memory prefix index only: no session, no DB round trip.
+    return json_response(list[SearchSuggestion], suggest_index.suggest(q, limit=limit))
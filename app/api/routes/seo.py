@@ -1,22 +1,69 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps.auth import require_roles
+from app.core.http_cache import is_not_modified, not_modified, validator_headers, weak_etag
+from app.core.serialization import RawJSONResponse
 from app.db.session import get_session
 from app.schemas.seo import SEOMetadataRead, SEORecalculateRequest, SitemapEntry
 from app.services.content import ContentService
-from app.services.seo import SEOService
+from app.services.seo import SEOService, render_sitemap_index
 
 router = APIRouter(tags=["seo"])
 
 
+def _shards_validator(shards: list[dict]) -> tuple[datetime | None, int]:
+    last_modified = max((shard["last_modified"] for shard in shards), default=None)
+    count = sum(shard["count"] for shard in shards)
+    return (datetime.fromisoformat(last_modified) if last_modified else None), count
+
+
+class XMLResponse(Response):
+    media_type = "application/xml"
+
+
 @router.get("/seo/sitemaps", response_model=list[SitemapEntry])
-async def get_sitemaps(session: AsyncSession = Depends(get_session)) -> list[SitemapEntry]:
+async def get_sitemaps(request: Request, session: AsyncSession = Depends(get_session)) -> Response:
+    service = SEOService(session)
+    shards = await service.sitemap_shards()
+    last_modified, count = _shards_validator(shards)
+    etag = weak_etag("sitemap", last_modified, count)
+    if is_not_modified(request, etag=etag, last_modified=last_modified):
+        return not_modified(etag, last_modified)
+    # Splice the cached per-shard JSON arrays instead of re-serialising the catalogue.
+    parts = [(await service.render_sitemap_shard(shard["shard"], "json"))[1:-1] for shard in shards]
+    body = b"[" + b",".join(part for part in parts if part) + b"]"
+    return RawJSONResponse(content=body, headers=validator_headers(etag, last_modified))
+
+
+@router.get("/seo/sitemap.xml", response_class=XMLResponse)
+async def get_sitemap_index(request: Request, session: AsyncSession = Depends(get_session)) -> Response:
+    service = SEOService(session)
+    shards = await service.sitemap_shards()
+    last_modified, count = _shards_validator(shards)
+    etag = weak_etag("sitemap-index", last_modified, count)
+    if is_not_modified(request, etag=etag, last_modified=last_modified):
+        return not_modified(etag, last_modified)
+    body = render_sitemap_index(shards, lambda shard: str(request.url_for("get_sitemap_shard", shard=shard)))
+    return XMLResponse(content=body, headers=validator_headers(etag, last_modified))
+
+
+@router.get("/seo/sitemaps/{shard}.xml", response_class=XMLResponse)
+async def get_sitemap_shard(shard: int, request: Request, session: AsyncSession = Depends(get_session)) -> Response:
     service = SEOService(session)
-    sitemap = await service.generate_sitemap()
-    return [SitemapEntry.model_validate(entry) for entry in sitemap]
+    summary = next((item for item in await service.sitemap_shards() if item["shard"] == shard), None)
+    if summary is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Sitemap not found")
+    last_modified, count = _shards_validator([summary])
+    etag = weak_etag("sitemap", shard, last_modified, count)
+    if is_not_modified(request, etag=etag, last_modified=last_modified):
+        return not_modified(etag, last_modified)
+    body = await service.render_sitemap_shard(shard, "xml")
+    return XMLResponse(content=body, headers=validator_headers(etag, last_modified))
 
 
 @router.post(
@@ -0,0 +1,93 @@
+"""Maintain analytics_events partitions and apply the retention policy.
+
+``ensure`` creates upcoming monthly partitions (PostgreSQL); ``retain`` moves
+cold rows to the archive table (SQLite) and archives or drops months older
+than ``ANALYTICS_RETENTION_MONTHS``; ``run`` does both. The command refuses
+to run against a database that has not been upgraded to migration 0006.
+
+    python -m app.commands.analytics_partitions run --mode archive --archive-dir var/analytics-archive
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+
+from sqlalchemy import inspect, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal
+from app.services.analytics_retention import RetentionManager
+
+logger = logging.getLogger("app.commands.analytics_partitions")
+
+REQUIRED_REVISION = "0006"
+
+
+async def check_revision(session: AsyncSession) -> None:
+    """Fail unless the schema is at or beyond :data:`REQUIRED_REVISION`.
+
+    Databases created with ``Base.metadata.create_all`` (no ``alembic_version``
+    table) are accepted as-is.
+    """
+
+    connection = await session.connection()
+    has_version_table = await connection.run_sync(lambda sync: inspect(sync).has_table("alembic_version"))
+    if not has_version_table:
+        return
+    revision = await session.scalar(text("SELECT version_num FROM alembic_version"))
+    # Revisions are zero-padded numbers; compare them as such, not as strings.
+    if revision is None or not revision.isdigit() or int(revision) < int(REQUIRED_REVISION):
+        raise SystemExit(
+            f"Database is at revision {revision!r}; run `alembic upgrade head` (needs {REQUIRED_REVISION}) first"
+        )
+
+
+async def run(*, action: str, mode: str, archive_dir: str, retention_months: int, ahead: int) -> None:
+    async with AsyncSessionLocal() as session:
+        await check_revision(session)
+        manager = RetentionManager(
+            session, retention_months=retention_months, mode=mode, archive_dir=archive_dir
+        )
+        if action in ("ensure", "run"):
+            created = await manager.ensure_partitions(ahead=ahead)
+            logger.info("partitions.ensured", extra={"created": created})
+        if action in ("retain", "run"):
+            moved = await manager.move_cold_rows()
+            expired = await manager.expire()
+            logger.info(
+                "partitions.retained",
+                extra={
+                    "moved_to_archive_table": moved,
+                    "expired_months": [item.month.strftime("%Y-%m") for item in expired if not item.skipped],
+                    "skipped_months": [item.month.strftime("%Y-%m") for item in expired if item.skipped],
+                    "expired_rows": sum(item.rows for item in expired),
+                },
+            )
+        await session.commit()
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("action", choices=("ensure", "retain", "run"), nargs="?", default="run")
+    parser.add_argument("--mode", choices=("archive", "drop"), default=settings.analytics_retention_mode)
+    parser.add_argument("--archive-dir", default=settings.analytics_archive_dir)
+    parser.add_argument("--retention-months", type=int, default=settings.analytics_retention_months)
+    parser.add_argument("--ahead", type=int, default=settings.analytics_partition_months_ahead)
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(
+        run(
+            action=args.action,
+            mode=args.mode,
+            archive_dir=args.archive_dir,
+            retention_months=args.retention_months,
+            ahead=args.ahead,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""Re-encode stored content version bodies.
+
+``--mode delta`` backfills legacy plain rows into periodic compressed
+snapshots plus forward deltas; ``--mode plain`` expands everything back to
+full text (required before downgrading migration 0004).
+
+    python -m app.commands.compact_versions --mode delta --interval 25
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal
+from app.models.content import ContentItem, ContentVersion
+from app.services import version_storage
+
+logger = logging.getLogger("app.commands.compact_versions")
+
+
+async def compact_content(session: AsyncSession, content_id: int, *, mode: str, interval: int) -> tuple[int, int]:
+    """Re-encode every version of one item; returns stored bytes before/after."""
+
+    stmt = (
+        select(
+            ContentVersion.id,
+            ContentVersion.body_encoding,
+            ContentVersion.body,
+            ContentVersion.body_data,
+        )
+        .where(ContentVersion.content_id == content_id)
+        .order_by(ContentVersion.version_number)
+    )
+    rows = (await session.execute(stmt)).all()
+    before = after = 0
+    previous: str | None = None
+    chain_length = 0
+    for row in rows:
+        before += _stored_size(row.body, row.body_data)
+        text = version_storage.decode_body(row.body_encoding, row.body, row.body_data, previous)
+        if mode == "plain":
+            encoded = version_storage.encode_plain(text)
+        else:
+            encoded = version_storage.encode_next(
+                text, previous=previous, chain_length=chain_length, snapshot_interval=interval
+            )
+            chain_length = chain_length + 1 if encoded.body_encoding == version_storage.DELTA else 0
+        after += _stored_size(encoded.body, encoded.body_data)
+        await session.execute(
+            update(ContentVersion)
+            .where(ContentVersion.id == row.id)
+            .values(
+                body=encoded.body,
+                body_encoding=encoded.body_encoding,
+                body_data=encoded.body_data,
+            )
+        )
+        previous = text
+    return before, after
+
+
+def _stored_size(body: str | None, data: bytes | None) -> int:
+    return len(body.encode("utf-8")) if body is not None else len(data or b"")
+
+
+async def run(*, mode: str, interval: int, content_id: int | None = None, batch_size: int = 100) -> None:
+    last_id = 0
+    total_before = total_after = 0
+    while True:
+        async with AsyncSessionLocal() as session:
+            stmt = select(ContentItem.id).where(ContentItem.id > last_id).order_by(ContentItem.id).limit(batch_size)
+            if content_id is not None:
+                stmt = stmt.where(ContentItem.id == content_id)
+            ids = list((await session.scalars(stmt)).all())
+            if not ids:
+                break
+            for item_id in ids:
+                before, after = await compact_content(session, item_id, mode=mode, interval=interval)
+                total_before += before
+                total_after += after
+            await session.commit()
+            last_id = ids[-1]
+            logger.info(
+                "versions.compacted",
+                extra={"last_content_id": last_id, "bytes_before": total_before, "bytes_after": total_after},
+            )
+    logger.info("versions.compaction_done", extra={"bytes_before": total_before, "bytes_after": total_after})
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mode", choices=("delta", "plain"), default="delta")
+    parser.add_argument("--interval", type=int, default=settings.content_snapshot_interval)
+    parser.add_argument("--content-id", type=int, default=None)
+    parser.add_argument("--batch-size", type=int, default=100)
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(
+        run(mode=args.mode, interval=args.interval, content_id=args.content_id, batch_size=args.batch_size)
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""Delete expired password reset and refresh tokens.
+
+Runs once by default; ``--every`` keeps it running as a periodic job. The
+API workers also compact refresh tokens on their own, so this mostly matters
+for reset tokens and for deployments that disable the in-process tasks.
+
+    python -m app.commands.purge_tokens --every 3600
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+
+from app.db.session import AsyncSessionLocal
+from app.services.auth import AuthService
+from app.services.refresh_tokens import RefreshTokenStore, RevokedFamilies
+
+logger = logging.getLogger("app.commands.purge_tokens")
+
+
+async def run_once() -> tuple[int, int]:
+    async with AsyncSessionLocal() as session:
+        reset_tokens = await AuthService(session).purge_reset_tokens()
+        refresh_tokens = await RefreshTokenStore(session, revoked=RevokedFamilies()).compact()
+        await session.commit()
+    logger.info("tokens.purged", extra={"reset_tokens": reset_tokens, "refresh_tokens": refresh_tokens})
+    return reset_tokens, refresh_tokens
+
+
+async def run(*, every: int | None) -> None:
+    while True:
+        await run_once()
+        if not every:
+            return
+        await asyncio.sleep(every)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument(
+        "--every",
+        type=int,
+        nargs="?",
+        const=3600,
+        default=None,
+        help="repeat every N seconds (hourly when given without a value)",
+    )
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(run(every=args.every))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""Rebuild the built-in full-text index from titles and latest bodies.
+
+Run once after migration 0008 (existing rows start unindexed) or whenever
+``FULLTEXT_LANGUAGE`` changes.
+
+    python -m app.commands.rebuild_fulltext --batch-size 200
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+
+from sqlalchemy import select
+from sqlalchemy.orm import load_only
+
+from app.db.session import AsyncSessionLocal
+from app.models.content import ContentItem
+from app.services.content import ContentService
+
+logger = logging.getLogger("app.commands.rebuild_fulltext")
+
+
+async def run(*, batch_size: int = 200) -> int:
+    last_id = 0
+    indexed = 0
+    while True:
+        async with AsyncSessionLocal() as session:
+            stmt = (
+                select(ContentItem)
+                .options(load_only(ContentItem.id, ContentItem.title))
+                .where(ContentItem.id > last_id)
+                .order_by(ContentItem.id)
+                .limit(batch_size)
+            )
+            items = list((await session.scalars(stmt)).all())
+            if not items:
+                break
+            await ContentService(session).sync_fulltext_many(items)
+            await session.commit()
+            indexed += len(items)
+            last_id = items[-1].id
+            logger.info("fulltext.rebuilt", extra={"last_content_id": last_id, "indexed": indexed})
+    return indexed
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch-size", type=int, default=200)
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(run(batch_size=args.batch_size))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""Recompute ``seo_metadata`` for the whole catalogue.
+
+Content is walked by id in chunks; each chunk reads only the latest version
+body per item and is written with one bulk upsert, committed together with
+a ``job_checkpoints`` row. An interrupted run resumes after the last
+committed chunk; ``--restart`` starts over from the first item.
+
+    python -m app.commands.recalculate_seo --chunk-size 1000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal
+from app.models.content import ContentItem
+from app.models.job import JobCheckpoint
+from app.services.seo import SEOService
+
+logger = logging.getLogger("app.commands.recalculate_seo")
+
+CHECKPOINT = "seo_recalculate"
+
+
+async def run(
+    *,
+    chunk_size: int,
+    restart: bool = False,
+    name: str = CHECKPOINT,
+    session_factory: async_sessionmaker[AsyncSession] = AsyncSessionLocal,
+) -> int:
+    """Process every item after the checkpoint; returns the items handled by this run."""
+
+    async with session_factory() as session:
+        if restart:
+            await session.execute(delete(JobCheckpoint).where(JobCheckpoint.name == name))
+            await session.commit()
+        checkpoint = await session.get(JobCheckpoint, name)
+        last_id, processed = (checkpoint.last_id, checkpoint.processed) if checkpoint else (0, 0)
+        total = await session.scalar(select(func.count(ContentItem.id)))
+    if last_id:
+        logger.info("seo.recalculate_resumed", extra={"last_content_id": last_id, "processed": processed})
+
+    handled = 0
+    while True:
+        # One transaction per chunk: the upsert and the checkpoint commit together.
+        async with session_factory() as session:
+            count, chunk_last_id = await SEOService(session).recalculate_batch(after_id=last_id, limit=chunk_size)
+            if not count:
+                await session.execute(delete(JobCheckpoint).where(JobCheckpoint.name == name))
+                await session.commit()
+                break
+            checkpoint = await session.get(JobCheckpoint, name) or JobCheckpoint(name=name)
+            checkpoint.last_id = chunk_last_id
+            checkpoint.processed = processed + count
+            session.add(checkpoint)
+            await session.commit()
+        last_id = chunk_last_id
+        processed += count
+        handled += count
+        logger.info(
+            "seo.recalculate_progress",
+            extra={
+                "processed": processed,
+                "total": total,
+                "percent": round(100 * processed / total, 1) if total else 100.0,
+                "last_content_id": last_id,
+            },
+        )
+    logger.info("seo.recalculate_done", extra={"processed": processed})
+    return handled
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--chunk-size", type=int, default=settings.seo_recalculate_chunk_size)
+    parser.add_argument("--restart", action="store_true", help="ignore the checkpoint and start from the first item")
+    parser.add_argument("--name", default=CHECKPOINT, help="checkpoint name (run independent passes side by side)")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(run(chunk_size=args.chunk_size, restart=args.restart, name=args.name))
+
+
+if __name__ == "__main__":
+    main()
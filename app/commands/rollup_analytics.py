@@ -0,0 +1,63 @@
+"""Fold new analytics events into the minute/hour/day rollup tables.
+
+Runs once by default; ``--every`` keeps it running as a background job that
+catches up from the watermark at a fixed interval.
+
+    python -m app.commands.rollup_analytics --every 60
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal
+from app.services.analytics_rollup import RollupService
+
+logger = logging.getLogger("app.commands.rollup_analytics")
+
+
+async def run_once(*, batch_size: int, dimension: str | None = None) -> int:
+    total = 0
+    while True:
+        # One transaction per batch so a long catch-up does not hold locks.
+        async with AsyncSessionLocal() as session:
+            processed = await RollupService(session, dimension=dimension).roll_up(batch_size=batch_size)
+            await session.commit()
+        if not processed:
+            break
+        total += processed
+        logger.info("rollups.batch", extra={"events": processed})
+    logger.info("rollups.done", extra={"events": total})
+    return total
+
+
+async def run(*, batch_size: int, every: int | None, dimension: str | None = None) -> None:
+    while True:
+        await run_once(batch_size=batch_size, dimension=dimension)
+        if not every:
+            return
+        await asyncio.sleep(every)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch-size", type=int, default=settings.analytics_rollup_batch_size)
+    parser.add_argument(
+        "--every",
+        type=int,
+        nargs="?",
+        const=settings.analytics_rollup_interval_seconds,
+        default=None,
+        help="repeat every N seconds (default interval when given without a value)",
+    )
+    parser.add_argument("--dimension", default=None, help="payload key to break counts down by")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(run(batch_size=args.batch_size, every=args.every, dimension=args.dimension))
+
+
+if __name__ == "__main__":
+    main()
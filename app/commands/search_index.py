@@ -0,0 +1,67 @@
+"""Feed the configured search engine.
+
+``drain`` processes pending ``search_outbox`` rows (``--every`` keeps polling,
+for deployments that run the indexer outside the API process); ``reindex``
+streams every published item to the engine in chunks, e.g. after creating a
+new index or switching provider.
+
+    python -m app.commands.search_index reindex --chunk-size 500
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+
+from app.core.config import settings
+from app.services.search import search_service
+from app.services.search_indexer import SearchIndexer, reindex
+
+logger = logging.getLogger("app.commands.search_index")
+
+
+async def run(*, action: str, every: float | None, batch_size: int, chunk_size: int) -> None:
+    if search_service.client is None:
+        raise SystemExit(f"No search engine configured (SEARCH_PROVIDER={settings.search_provider!r})")
+    if settings.search_provider == "local":
+        # The index lives in each API worker; this process would only update its own copy.
+        raise SystemExit("SEARCH_PROVIDER='local' is refreshed by each API worker; nothing to drain or reindex")
+    try:
+        if action == "reindex":
+            total = await reindex(chunk_size=chunk_size)
+            logger.info("search.reindex_done", extra={"documents": total})
+            return
+        indexer = SearchIndexer(batch_size=batch_size)
+        while True:
+            processed = await indexer.drain()
+            logger.info("search.outbox_drained", extra={"rows": processed})
+            if not every:
+                return
+            await asyncio.sleep(every)
+    finally:
+        search_service.close()
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("action", choices=("drain", "reindex"))
+    parser.add_argument(
+        "--every",
+        type=float,
+        nargs="?",
+        const=settings.search_outbox_interval_seconds,
+        default=None,
+        help="keep draining every N seconds (default interval when given without a value)",
+    )
+    parser.add_argument("--batch-size", type=int, default=settings.search_outbox_batch_size)
+    parser.add_argument("--chunk-size", type=int, default=settings.search_reindex_chunk_size)
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(
+        run(action=args.action, every=args.every, batch_size=args.batch_size, chunk_size=args.chunk_size)
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -63,13 +63,64 @@ class Settings(BaseSettings):
     secret_key: str = "CHANGE_ME"
     access_token_expire_minutes: int = 30
     refresh_token_expire_minutes: int = 60 * 24 * 14
+    auth_revocation_refresh_seconds: int = 10
+    auth_refresh_token_compact_seconds: int = 3600
+    password_reset_token_ttl_minutes: int = 60
     database_url: str = "sqlite+aiosqlite:///./lavamedia.db"
     alembic_database_url: Optional[str] = None
     allowed_origins: List[str] = Field(default_factory=lambda: ["*"])
     mfa_issuer: str = "Lavamedia"
+    content_version_storage: str = "plain"
+    content_snapshot_interval: int = 25
+    content_cache_backend: str = "memory"
+    content_cache_url: str | None = None
+    content_cache_ttl_seconds: int = 60
+    content_cache_max_entries: int = 512
+    content_cache_max_bytes: int = 32 * 1024 * 1024
+    auth_cache_backend: str = "memory"
+    auth_cache_url: str | None = None
+    auth_cache_max_entries: int = 10_000
+    auth_cache_max_bytes: int = 8 * 1024 * 1024
+    auth_principal_cache_ttl_seconds: int = 60
+    auth_token_claims: bool = False
+    auth_claims_max_staleness_seconds: int = 30
+    password_hash_rounds: int | None = None
+    password_hash_max_workers: int = 4
+    password_hash_max_pending: int = 64
+    public_site_url: str = "https://www.lavamedia.example"
+    sitemap_shard_size: int = 50_000
+    sitemap_cache_ttl_seconds: int = 3600
+    sitemap_local_cache_ttl_seconds: int = 60
+    seo_recalculate_chunk_size: int = 500
+    analytics_buffer_size: int = 10_000
+    analytics_flush_batch_size: int = 500
+    analytics_flush_interval_seconds: float = 1.0
+    analytics_flush_retries: int = 3
+    analytics_flush_retry_backoff_seconds: float = 0.5
+    analytics_batch_max_events: int = 500
+    analytics_rollup_dimension: str = "content_id"
+    analytics_rollup_batch_size: int = 5000
+    analytics_rollup_interval_seconds: int = 60
+    analytics_rollup_safety_lag_seconds: int = 30
+    analytics_retention_months: int = 12
+    analytics_retention_mode: str = "archive"
+    analytics_archive_dir: str = "var/analytics-archive"
+    analytics_partition_months_ahead: int = 3
+    analytics_hot_months: int = 2
     search_provider: str = "meilisearch"
     search_url: str | None = None
     search_api_key: str | None = None
+    search_snapshot_path: str | None = None
+    search_local_refresh_seconds: float = 10.0
+    search_timeout_seconds: float = 2.0
+    search_max_workers: int = 4
+    search_outbox_batch_size: int = 200
+    search_outbox_interval_seconds: float = 1.0
+    search_outbox_max_backoff_seconds: int = 300
+    search_outbox_lease_seconds: int = 60
+    search_reindex_chunk_size: int = 500
+    search_suggest_refresh_seconds: float = 30.0
+    fulltext_language: str = "french"
     stripe_api_key: str | None = None
     stripe_webhook_secret: str | None = None
 
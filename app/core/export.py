@@ -0,0 +1,103 @@
+"""Streaming NDJSON / CSV exports.
+
+Exports page through the table with ``yield_per`` on a dedicated session bound
+to the request's engine, so the stream outlives the request-scoped dependency
+and memory stays proportional to ``batch_size`` rather than the table size.
+"""
+
+from __future__ import annotations
+
+import csv
+import io
+import json
+from collections.abc import AsyncIterator
+from typing import Any, Literal
+
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from sqlalchemy import Select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.serialization import type_adapter
+
+ExportFormat = Literal["ndjson", "csv"]
+
+EXPORT_BATCH_SIZE = 1000
+
+MEDIA_TYPES: dict[str, str] = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+
+def csv_header(schema: type[BaseModel]) -> list[str]:
+    return [field.serialization_alias or name for name, field in schema.model_fields.items()]
+
+
+def _csv_cell(value: Any) -> Any:
+    # Nested collections (variants, roles, payloads) are kept as inline JSON.
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, separators=(",", ":"))
+    return "" if value is None else value
+
+
+async def _partitions(session: AsyncSession, stmt: Select, *, batch_size: int, orm: bool) -> AsyncIterator[list]:
+    if orm:
+        result = await session.stream_scalars(stmt, execution_options={"yield_per": batch_size})
+    else:
+        result = (await session.stream(stmt, execution_options={"yield_per": batch_size})).mappings()
+    async for partition in result.partitions(batch_size):
+        yield partition
+        if orm:
+            # Drop the batch from the identity map before fetching the next one.
+            session.expunge_all()
+
+
+async def stream_export(
+    session: AsyncSession,
+    stmt: Select,
+    schema: type[BaseModel],
+    *,
+    format: ExportFormat = "ndjson",
+    orm: bool = True,
+    batch_size: int = EXPORT_BATCH_SIZE,
+) -> AsyncIterator[bytes]:
+    """Yield one encoded chunk per batch of rows."""
+
+    adapter = type_adapter(schema)
+    header = csv_header(schema)
+    if format == "csv":
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(header)
+        yield buffer.getvalue().encode()
+
+    async with AsyncSession(bind=session.bind, expire_on_commit=False) as export_session:
+        async for partition in _partitions(export_session, stmt, batch_size=batch_size, orm=orm):
+            models = [adapter.validate_python(row, from_attributes=True) for row in partition]
+            if format == "ndjson":
+                yield b"".join(adapter.dump_json(model, by_alias=True) + b"\n" for model in models)
+                continue
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            for model in models:
+                data = adapter.dump_python(model, mode="json", by_alias=True)
+                writer.writerow([_csv_cell(data.get(column)) for column in header])
+            yield buffer.getvalue().encode()
+
+
+def export_response(
+    session: AsyncSession,
+    stmt: Select,
+    schema: type[BaseModel],
+    *,
+    filename: str,
+    format: ExportFormat = "ndjson",
+    orm: bool = True,
+    batch_size: int = EXPORT_BATCH_SIZE,
+) -> StreamingResponse:
+    return StreamingResponse(
+        stream_export(session, stmt, schema, format=format, orm=orm, batch_size=batch_size),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{format}"'},
+    )
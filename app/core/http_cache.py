@@ -0,0 +1,70 @@
+"""Validator helpers (ETag / Last-Modified) for conditional GET requests."""
+
+from __future__ import annotations
+
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any
+
+from fastapi import Request, Response, status
+
+
+def as_utc(value: datetime) -> datetime:
+    """SQLite hands back naive UTC datetimes; PostgreSQL aware ones."""
+
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def strong_etag(*parts: Any) -> str:
+    return '"' + "-".join(str(part) for part in parts) + '"'
+
+
+def weak_etag(*parts: Any) -> str:
+    digest = hashlib.blake2b("|".join(str(part) for part in parts).encode(), digest_size=12).hexdigest()
+    return f'W/"{digest}"'
+
+
+def http_date(value: datetime) -> str:
+    return format_datetime(as_utc(value).replace(microsecond=0), usegmt=True)
+
+
+def has_conditional_headers(request: Request) -> bool:
+    return "if-none-match" in request.headers or "if-modified-since" in request.headers
+
+
+def _opaque(tag: str) -> str:
+    tag = tag.strip()
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def is_not_modified(request: Request, *, etag: str, last_modified: datetime | None) -> bool:
+    """Evaluate ``If-None-Match`` (weak comparison) then ``If-Modified-Since``."""
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        candidates = {_opaque(tag) for tag in if_none_match.split(",")}
+        return "*" in candidates or _opaque(etag) in candidates
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        return as_utc(last_modified).replace(microsecond=0) <= since
+    return False
+
+
+def validator_headers(etag: str, last_modified: datetime | None) -> dict[str, str]:
+    headers = {"ETag": etag}
+    if last_modified is not None:
+        headers["Last-Modified"] = http_date(last_modified)
+    return headers
+
+
+def not_modified(etag: str, last_modified: datetime | None) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=validator_headers(etag, last_modified))
@@ -0,0 +1,32 @@
+"""Opaque cursor helpers used by keyset-paginated endpoints."""
+
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+from typing import Any
+
+
+def encode_cursor(position: dict[str, Any]) -> str:
+    """Serialise a keyset position into an URL-safe opaque token."""
+
+    raw = json.dumps(position, separators=(",", ":"), sort_keys=True).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str) -> dict[str, Any]:
+    """Decode a token produced by :func:`encode_cursor`.
+
+    Raises ``ValueError`` when the token is malformed so callers can surface a
+    client error instead of a server error.
+    """
+
+    padded = cursor + "=" * (-len(cursor) % 4)
+    try:
+        position = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (binascii.Error, UnicodeDecodeError, json.JSONDecodeError) as exc:
+        raise ValueError("Invalid cursor") from exc
+    if not isinstance(position, dict):
+        raise ValueError("Invalid cursor")
+    return position
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import hashlib
 from datetime import datetime, timedelta
 from typing import Any
 from uuid import uuid4
@@ -10,39 +11,94 @@ from passlib.context import CryptContext
 
 from app.core.config import settings
 
-pwd_context = CryptContext(schemes=["pbkdf2_sha256"], deprecated="auto")
+
+def _crypt_context(rounds: int | None) -> CryptContext:
+    if rounds is None:
+        return CryptContext(schemes=["pbkdf2_sha256"], deprecated="auto")
+    # Pinning min/max to the target makes any change of rounds flag stored hashes for a rehash on login.
+    return CryptContext(
+        schemes=["pbkdf2_sha256"],
+        deprecated="auto",
+        pbkdf2_sha256__default_rounds=rounds,
+        pbkdf2_sha256__min_rounds=rounds,
+        pbkdf2_sha256__max_rounds=rounds,
+    )
+
+
+pwd_context = _crypt_context(settings.password_hash_rounds)
 ALGORITHM = "HS256"
 
 
-def _create_token(subject: str | Any, expires_delta: timedelta) -> str:
+def _create_token(
+    subject: str | Any,
+    expires_delta: timedelta,
+    claims: dict[str, Any] | None = None,
+    *,
+    token_type: str,
+    jti: str | None = None,
+) -> str:
     now = datetime.utcnow()
     expire = now + expires_delta
-    to_encode = {"sub": str(subject), "exp": expire, "iat": now, "jti": uuid4().hex}
+    to_encode = {
+        **(claims or {}),
+        "sub": str(subject),
+        "exp": expire,
+        "iat": now,
+        "jti": jti or uuid4().hex,
+        "typ": token_type,
+    }
     return jwt.encode(to_encode, settings.secret_key, algorithm=ALGORITHM)
 
 
-def create_access_token(subject: str | Any, expires_delta: timedelta | None = None) -> str:
+def create_access_token(
+    subject: str | Any, expires_delta: timedelta | None = None, *, claims: dict[str, Any] | None = None
+) -> str:
+    """``claims`` are embedded as-is (see ``Principal.claims`` for the authorization claims)."""
+
     if expires_delta is None:
         expires_delta = timedelta(minutes=settings.access_token_expire_minutes)
-    return _create_token(subject, expires_delta)
+    return _create_token(subject, expires_delta, claims, token_type="access")
 
 
-def create_refresh_token(subject: str | Any, expires_delta: timedelta | None = None) -> str:
+def create_refresh_token(
+    subject: str | Any, expires_delta: timedelta | None = None, *, jti: str | None = None, family: str | None = None
+) -> str:
     if expires_delta is None:
         expires_delta = timedelta(minutes=settings.refresh_token_expire_minutes)
-    return _create_token(subject, expires_delta)
+    claims = {"fam": family} if family else None
+    return _create_token(subject, expires_delta, claims, token_type="refresh", jti=jti)
 
 
-def verify_access_token(token: str) -> str | None:
+def _decode_token(token: str) -> dict[str, Any] | None:
     try:
-        payload = jwt.decode(token, settings.secret_key, algorithms=[ALGORITHM])
-        return payload.get("sub")
+        return jwt.decode(token, settings.secret_key, algorithms=[ALGORITHM])
     except JWTError:
         return None
 
 
+def decode_access_token(token: str) -> dict[str, Any] | None:
+    payload = _decode_token(token)
+    # Refresh tokens are only good for /auth/refresh, never as bearer credentials.
+    if payload is None or payload.get("typ") == "refresh":
+        return None
+    return payload
+
+
+def verify_access_token(token: str) -> str | None:
+    payload = decode_access_token(token)
+    return payload.get("sub") if payload else None
+
+
+def decode_refresh_token(token: str) -> dict[str, Any] | None:
+    payload = _decode_token(token)
+    if payload is None or payload.get("typ") != "refresh" or not payload.get("jti"):
+        return None
+    return payload
+
+
 def verify_refresh_token(token: str) -> str | None:
-    return verify_access_token(token)
+    payload = decode_refresh_token(token)
+    return payload.get("sub") if payload else None
 
 
 def get_password_hash(password: str) -> str:
@@ -53,6 +109,12 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
+def hash_token(token: str) -> str:
+    """Digest stored in place of a high-entropy single-use token (reset links)."""
+
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
 def create_mfa_secret() -> str:
     return pyotp.random_base32()
 
@@ -0,0 +1,33 @@
+"""Single-pass JSON serialisation for read-only endpoints.
+
+Routes that opt in validate their ORM objects or row mappings once through a
+cached ``TypeAdapter`` and return the encoded bytes directly, skipping the
+per-item ``model_validate`` and FastAPI's second validation against
+``response_model``. The ``response_model`` declaration is kept for OpenAPI.
+"""
+
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Any, Mapping
+
+from fastapi import Response
+from pydantic import TypeAdapter
+
+
+class RawJSONResponse(Response):
+    media_type = "application/json"
+
+
+@lru_cache(maxsize=None)
+def type_adapter(annotation: Any) -> TypeAdapter:
+    return TypeAdapter(annotation)
+
+
+def dump_json(annotation: Any, value: Any) -> bytes:
+    adapter = type_adapter(annotation)
+    return adapter.dump_json(adapter.validate_python(value, from_attributes=True), by_alias=True)
+
+
+def json_response(annotation: Any, value: Any, *, headers: Mapping[str, str] | None = None) -> RawJSONResponse:
+    return RawJSONResponse(content=dump_json(annotation, value), headers=dict(headers or {}))
@@ -1,15 +1,55 @@
+import inspect
+import logging
+from typing import Any, Callable
+
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase
 
 from app.core.config import settings
 
+logger = logging.getLogger("app.db")
+
+_AFTER_COMMIT = "after_commit"
+
 
 class Base(DeclarativeBase):
     pass
 
 
+class AppSession(AsyncSession):
+    """``AsyncSession`` that runs :func:`after_commit` callbacks once a commit has succeeded.
+
+    Callbacks are dropped on rollback or close, so caches and in-process
+    indexes never reflect a transaction that did not land.
+    """
+
+    async def commit(self) -> None:
+        await super().commit()
+        for callback, args in self.info.pop(_AFTER_COMMIT, []):
+            try:
+                result = callback(*args)
+                if inspect.isawaitable(result):
+                    await result
+            except Exception:
+                logger.exception("db.after_commit_failed", extra={"callback": getattr(callback, "__qualname__", None)})
+
+    async def rollback(self) -> None:
+        self.info.pop(_AFTER_COMMIT, None)
+        await super().rollback()
+
+    async def close(self) -> None:
+        self.info.pop(_AFTER_COMMIT, None)
+        await super().close()
+
+
+def after_commit(session: AsyncSession, callback: Callable[..., Any], *args: Any) -> None:
+    """Run ``callback(*args)`` (sync or async) after ``session`` next commits successfully."""
+
+    session.info.setdefault(_AFTER_COMMIT, []).append((callback, args))
+
+
 engine = create_async_engine(settings.database_url, echo=settings.debug)
-AsyncSessionLocal = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+AsyncSessionLocal = async_sessionmaker(engine, expire_on_commit=False, class_=AppSession)
 
 
 async def get_session() -> AsyncSession:
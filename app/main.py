@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
@@ -9,14 +11,48 @@ from starlette.middleware.trustedhost import TrustedHostMiddleware
 from app.api.routes import analytics, auth, content, media, newsletter, notification, search, seo
 from app.core.logging import setup_logging
 from app.core.config import settings
+from app.db.session import AsyncSessionLocal
 from app.middleware.metrics import MetricsMiddleware
 from app.middleware.observability import RequestLoggingMiddleware
 from app.middleware.rate_limit import RateLimitMiddleware
 from app.middleware.security_headers import SecurityHeadersMiddleware
+from app.services.analytics_buffer import event_buffer
+from app.services.local_search import local_index, local_index_refresher, warm_up
+from app.services.passwords import password_hasher
+from app.services.refresh_tokens import revocation_refresher
+from app.services.search import search_service
+from app.services.search_indexer import search_indexer
+from app.services.suggest import suggest_refresher
 
 setup_logging()
 
-app = FastAPI(title=settings.app_name, debug=settings.debug)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await event_buffer.start()
+    if settings.search_provider == "local":
+        await warm_up(local_index, AsyncSessionLocal, snapshot_path=settings.search_snapshot_path)
+        await local_index_refresher.start()
+    if search_service.client is not None and settings.search_provider != "local":
+        await search_indexer.start()
+    await suggest_refresher.start()
+    await revocation_refresher.start()
+    try:
+        yield
+    finally:
+        # Drain queued analytics events before the worker exits.
+        await event_buffer.stop()
+        await search_indexer.stop()
+        await suggest_refresher.stop()
+        await revocation_refresher.stop()
+        await local_index_refresher.stop()
+        if settings.search_provider == "local" and settings.search_snapshot_path:
+            local_index.save(settings.search_snapshot_path)
+        search_service.close()
+        password_hasher.close()
+
+
+app = FastAPI(title=settings.app_name, debug=settings.debug, lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
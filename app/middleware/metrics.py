@@ -3,7 +3,7 @@ from __future__ import annotations
 import time
 
 from fastapi import Request, Response
-from prometheus_client import Counter, Histogram
+from prometheus_client import Counter, Gauge, Histogram
 from starlette.middleware.base import BaseHTTPMiddleware
 
 
@@ -18,6 +18,40 @@ REQUEST_LATENCY = Histogram(
     labelnames=("method", "path"),
 )
 
+CACHE_HITS = Counter(
+    "cache_hits_total",
+    "Read-through cache hits",
+    labelnames=("cache",),
+)
+CACHE_MISSES = Counter(
+    "cache_misses_total",
+    "Read-through cache misses",
+    labelnames=("cache",),
+)
+ANALYTICS_EVENTS = Counter(
+    "analytics_events_total",
+    "Analytics events by ingestion outcome",
+    labelnames=("outcome",),
+)
+ANALYTICS_BUFFER_DEPTH = Gauge(
+    "analytics_buffer_depth",
+    "Analytics events waiting in the ingestion buffer",
+)
+SEARCH_OUTBOX = Counter(
+    "search_outbox_documents_total",
+    "Search documents processed from the outbox by outcome",
+    labelnames=("outcome",),
+)
+
+PASSWORD_HASH_QUEUE = Gauge(
+    "password_hash_queue_depth",
+    "Password hash/verify calls running or waiting for a worker",
+)
+PASSWORD_HASH_REJECTED = Counter(
+    "password_hash_rejected_total",
+    "Password hash/verify calls rejected because the pool was saturated",
+)
+
 
 class MetricsMiddleware(BaseHTTPMiddleware):
     """Collect Prometheus metrics for each request."""
@@ -1,21 +1,36 @@
-from app.models.analytics import AnalyticsEvent, Dashboard
+from app.models.analytics import (
+    AnalyticsEvent,
+    AnalyticsEventArchive,
+    AnalyticsRollup,
+    AnalyticsRollupWatermark,
+    Dashboard,
+)
 from app.models.content import ContentCategory, ContentItem, ContentMedia, ContentVersion
+from app.models.job import JobCheckpoint
 from app.models.media import MediaAsset, MediaVariant
 from app.models.notification import Webhook
+from app.models.search import SearchOutbox
 from app.models.seo import SEOMetadata
-from app.models.user import Permission, Role, User
+from app.models.user import PasswordResetToken, Permission, RefreshToken, Role, User
 
 __all__ = [
     "AnalyticsEvent",
+    "AnalyticsEventArchive",
+    "AnalyticsRollup",
+    "AnalyticsRollupWatermark",
     "ContentCategory",
     "ContentItem",
     "ContentMedia",
     "ContentVersion",
     "Dashboard",
+    "JobCheckpoint",
     "MediaAsset",
     "MediaVariant",
+    "PasswordResetToken",
     "Permission",
+    "RefreshToken",
     "Role",
+    "SearchOutbox",
     "SEOMetadata",
     "User",
     "Webhook",
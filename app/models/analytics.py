@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from datetime import datetime
 
-from sqlalchemy import DateTime, ForeignKey, Integer, String
+from sqlalchemy import BigInteger, DateTime, ForeignKey, Integer, String, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.db.session import Base
@@ -17,7 +17,22 @@ class AnalyticsEvent(Base):
     session_id: Mapped[str | None] = mapped_column(String(128))
     event_type: Mapped[str] = mapped_column(String(100), nullable=False)
     payload: Mapped[dict | None] = mapped_column(JSONType, nullable=True)
-    occurred_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=datetime.utcnow, nullable=False)
+    occurred_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=datetime.utcnow, nullable=False, index=True
+    )
+
+
+class AnalyticsEventArchive(Base):
+    """Cold copy of ``analytics_events`` used where native partitioning is unavailable (SQLite)."""
+
+    __tablename__ = "analytics_events_archive"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=False)
+    user_id: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    session_id: Mapped[str | None] = mapped_column(String(128))
+    event_type: Mapped[str] = mapped_column(String(100), nullable=False)
+    payload: Mapped[dict | None] = mapped_column(JSONType, nullable=True)
+    occurred_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, index=True)
 
 
 class Dashboard(Base):
@@ -31,3 +46,46 @@ class Dashboard(Base):
     updated_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False
     )
+
+
+class AnalyticsRollup(Base):
+    """Event counts per time bucket, event type and payload dimension value."""
+
+    __tablename__ = "analytics_rollups"
+    # Column order matches the series lookups: fixed keys first, then the time range.
+    __table_args__ = (
+        UniqueConstraint(
+            "granularity",
+            "event_type",
+            "dimension",
+            "bucket_start",
+            "dimension_value",
+            name="uq_analytics_rollups_bucket",
+        ),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    granularity: Mapped[str] = mapped_column(String(16), nullable=False)
+    bucket_start: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    event_type: Mapped[str] = mapped_column(String(100), nullable=False)
+    dimension: Mapped[str] = mapped_column(String(100), nullable=False, default="")
+    dimension_value: Mapped[str] = mapped_column(String(255), nullable=False, default="")
+    count: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+
+
+class AnalyticsRollupWatermark(Base):
+    """Highest ``analytics_events.id`` already folded into the rollups.
+
+    ``horizon_event_id`` is the newest id seen at ``horizon_at``; ids up to it
+    are only folded once the safety lag has passed since then.
+    """
+
+    __tablename__ = "analytics_rollup_watermarks"
+
+    name: Mapped[str] = mapped_column(String(100), primary_key=True)
+    last_event_id: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    horizon_event_id: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    horizon_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False
+    )
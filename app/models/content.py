@@ -5,17 +5,24 @@ from datetime import datetime
 from typing import TYPE_CHECKING, Optional
 
 from sqlalchemy import (
+    DDL,
     Column,
     DateTime,
     Enum,
     ForeignKey,
+    Index,
     Integer,
+    LargeBinary,
     String,
     Table,
     Text,
     UniqueConstraint,
+    and_,
+    event,
+    func,
+    select,
 )
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.orm import Mapped, aliased, mapped_column, query_expression, relationship
 
 from app.db.session import Base
 from app.db.types import JSONType
@@ -43,7 +50,14 @@ class ContentWorkflowState(str, enum.Enum):
 
 class ContentItem(Base):
     __tablename__ = "content_items"
-    __table_args__ = (UniqueConstraint("slug", name="uq_content_items_slug"),)
+    __table_args__ = (
+        UniqueConstraint("slug", name="uq_content_items_slug"),
+        # Published listings, the sitemap and keyset pagination filter on status then walk the sort key.
+        Index("ix_content_items_status_updated_at", "status", "updated_at", "id"),
+        Index("ix_content_items_status_published_at", "status", "published_at", "id"),
+        # Sitemap shards are published items within an id range, in id order.
+        Index("ix_content_items_status_id", "status", "id"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     type: Mapped[str] = mapped_column(String(50), nullable=False)
@@ -61,9 +75,16 @@ class ContentItem(Base):
         DateTime(timezone=True), default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False
     )
 
+    # Populated only by summary queries through ``with_expression``.
+    latest_version_id: Mapped[int | None] = query_expression()
+    latest_version_number: Mapped[int | None] = query_expression()
+
     versions: Mapped[list["ContentVersion"]] = relationship(
         back_populates="content", cascade="all, delete-orphan", order_by="ContentVersion.version_number"
     )
+    latest_version: Mapped[Optional["ContentVersion"]] = relationship(
+        primaryjoin=lambda: _latest_version_join(), viewonly=True, uselist=False
+    )
     categories: Mapped[list["ContentCategory"]] = relationship(
         secondary=content_category_links, back_populates="content_items"
     )
@@ -72,6 +93,37 @@ class ContentItem(Base):
     )
 
 
+# Full-text search structures (app.services.fulltext) live outside the ORM
+# mapping: a weighted tsvector column on PostgreSQL, an FTS5 table on SQLite.
+event.listen(
+    ContentItem.__table__,
+    "after_create",
+    DDL(
+        "CREATE VIRTUAL TABLE IF NOT EXISTS content_fts USING fts5("
+        "title, body, tokenize='unicode61 remove_diacritics 2')"
+    ).execute_if(dialect="sqlite"),
+)
+event.listen(
+    ContentItem.__table__,
+    "after_create",
+    DDL("ALTER TABLE content_items ADD COLUMN IF NOT EXISTS search_vector tsvector").execute_if(
+        dialect="postgresql"
+    ),
+)
+event.listen(
+    ContentItem.__table__,
+    "after_create",
+    DDL(
+        "CREATE INDEX IF NOT EXISTS ix_content_items_search_vector ON content_items USING gin (search_vector)"
+    ).execute_if(dialect="postgresql"),
+)
+event.listen(
+    ContentItem.__table__,
+    "before_drop",
+    DDL("DROP TABLE IF EXISTS content_fts").execute_if(dialect="sqlite"),
+)
+
+
 class ContentVersion(Base):
     __tablename__ = "content_versions"
     __table_args__ = (
@@ -83,13 +135,29 @@ class ContentVersion(Base):
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     content_id: Mapped[int] = mapped_column(ForeignKey("content_items.id", ondelete="CASCADE"), nullable=False)
     version_number: Mapped[int] = mapped_column(Integer, nullable=False)
-    body: Mapped[str] = mapped_column(Text, nullable=False)
+    # NULL unless ``body_encoding`` is "plain"; see app.services.version_storage.
+    body: Mapped[str | None] = mapped_column(Text, nullable=True)
+    body_encoding: Mapped[str] = mapped_column(String(16), default="plain", nullable=False)
+    body_data: Mapped[bytes | None] = mapped_column(LargeBinary, nullable=True)
     diff: Mapped[dict | None] = mapped_column(JSONType, nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=datetime.utcnow, nullable=False)
 
     content: Mapped[ContentItem] = relationship(back_populates="versions")
 
 
+def _latest_version_join():
+    newer = aliased(ContentVersion)
+    latest_number = (
+        select(func.max(newer.version_number))
+        .where(newer.content_id == ContentVersion.content_id)
+        .scalar_subquery()
+    )
+    return and_(
+        ContentItem.id == ContentVersion.content_id,
+        ContentVersion.version_number == latest_number,
+    )
+
+
 class ContentCategory(Base):
     __tablename__ = "content_categories"
     __table_args__ = (UniqueConstraint("slug", name="uq_content_categories_slug"),)
@@ -1,9 +1,11 @@
 from __future__ import annotations
 
 from datetime import datetime
+from typing import Literal
 
 from pydantic import ConfigDict, Field
 
+from app.core.config import settings
 from app.schemas.base import ORMBaseModel, StrictBaseModel
 
 
@@ -15,6 +17,14 @@ class AnalyticsEventCreate(StrictBaseModel):
     occurred_at: datetime | None = None
 
 
+class AnalyticsEventBatch(StrictBaseModel):
+    events: list[AnalyticsEventCreate] = Field(min_length=1, max_length=settings.analytics_batch_max_events)
+
+
+class AnalyticsEventsAccepted(StrictBaseModel):
+    accepted: int
+
+
 class AnalyticsEventRead(AnalyticsEventCreate, ORMBaseModel):
     id: int
 
@@ -30,3 +40,26 @@ class DashboardRead(ORMBaseModel):
     updated_at: datetime
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class RollupPoint(StrictBaseModel):
+    bucket_start: datetime
+    dimension_value: str | None = None
+    count: int
+
+
+class DashboardSeries(StrictBaseModel):
+    event_type: str
+    granularity: Literal["minute", "hour", "day"] = "hour"
+    dimension_value: str | None = None
+    by_dimension: bool = False
+    label: str | None = None
+
+
+class DashboardSeriesData(DashboardSeries):
+    points: list[RollupPoint]
+
+
+class DashboardData(StrictBaseModel):
+    dashboard_id: int
+    series: list[DashboardSeriesData]
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from datetime import datetime
+from typing import Literal
 
 from pydantic import ConfigDict, Field
 
@@ -23,6 +24,20 @@ class ContentVersionRead(ORMBaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+class ContentVersionMeta(ORMBaseModel):
+    id: int
+    content_id: int
+    version_number: int
+    created_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class ContentVersionPage(StrictBaseModel):
+    items: list[ContentVersionMeta]
+    next_cursor: str | None = None
+
+
 class ContentCategoryBase(StrictBaseModel):
     name: str
     slug: str
@@ -71,10 +86,46 @@ class ContentRead(ContentBase, ORMBaseModel):
     updated_at: datetime
     created_by: int | None = None
     updated_by: int | None = None
-    versions: list[ContentVersionRead] = Field(default_factory=list)
+    latest_version: ContentVersionRead | None = None
 
     model_config = ConfigDict(from_attributes=True)
 
 
+class ContentSummary(ORMBaseModel):
+    id: int
+    type: str
+    title: str
+    slug: str
+    status: str
+    workflow_state: ContentWorkflowState
+    published_at: datetime | None = None
+    created_at: datetime
+    updated_at: datetime
+    created_by: int | None = None
+    updated_by: int | None = None
+    latest_version_id: int | None = None
+    latest_version_number: int | None = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class SearchHit(ContentSummary):
+    """A search result: the listing projection plus the engine's highlighted excerpt."""
+
+    snippet: str | None = None
+
+
+class SearchSuggestion(ORMBaseModel):
+    type: Literal["content", "category"]
+    id: int
+    label: str
+    slug: str
+
+
+class ContentPage(StrictBaseModel):
+    items: list[ContentSummary]
+    next_cursor: str | None = None
+
+
 class ContentPublish(StrictBaseModel):
     publish: bool = True
@@ -32,7 +32,7 @@ class MediaAssetBase(StrictBaseModel):
     duration: float | None = None
     metadata: dict | None = Field(
         default=None,
-        validation_alias=AliasChoices("metadata", "_metadata"),
+        validation_alias=AliasChoices("_metadata", "metadata"),
         serialization_alias="metadata",
     )
 
@@ -1,14 +1,16 @@
 from __future__ import annotations
 
+from collections.abc import Sequence
 from datetime import datetime
 
-from sqlalchemy import select
+from sqlalchemy import insert, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from fastapi import Depends
 
 from app.db.session import get_session
 from app.models.analytics import AnalyticsEvent, Dashboard
+from app.services.analytics_buffer import event_buffer
 
 
 class AnalyticsService:
@@ -23,25 +25,65 @@ class AnalyticsService:
         session_id: str | None = None,
         payload: dict | None = None,
         occurred_at: datetime | None = None,
-    ) -> AnalyticsEvent:
-        event = AnalyticsEvent(
-            user_id=user_id,
-            session_id=session_id,
-            event_type=event_type,
-            payload=payload,
-            occurred_at=occurred_at or datetime.utcnow(),
+    ) -> int:
+        return await self.log_events(
+            [
+                {
+                    "event_type": event_type,
+                    "user_id": user_id,
+                    "session_id": session_id,
+                    "payload": payload,
+                    "occurred_at": occurred_at,
+                }
+            ]
         )
-        self.session.add(event)
-        await self.session.flush()
-        return event
+
+    async def log_events(self, events: Sequence[dict]) -> int:
+        """Queue ``events`` on the ingestion buffer, or insert them directly when it is not running.
+
+        Raises :class:`BufferFull` when the buffer cannot take the whole batch.
+        """
+
+        now = datetime.utcnow()
+        rows = [
+            {
+                "event_type": event["event_type"],
+                "user_id": event.get("user_id"),
+                "session_id": event.get("session_id"),
+                "payload": event.get("payload"),
+                "occurred_at": event.get("occurred_at") or now,
+            }
+            for event in events
+        ]
+        if event_buffer.running:
+            event_buffer.submit(rows)
+        elif rows:
+            await self.session.execute(insert(AnalyticsEvent), rows)
+        return len(rows)
 
     async def list_events(self, *, limit: int = 200) -> list[AnalyticsEvent]:
         stmt = select(AnalyticsEvent).order_by(AnalyticsEvent.occurred_at.desc()).limit(limit)
         return list((await self.session.scalars(stmt)).all())
 
+    async def list_event_rows(self, *, limit: int = 200) -> list:
+        """Same as :meth:`list_events` but as column mappings, without ORM identity overhead."""
+
+        stmt = (
+            select(*AnalyticsEvent.__table__.columns)
+            .order_by(AnalyticsEvent.occurred_at.desc())
+            .limit(limit)
+        )
+        return list((await self.session.execute(stmt)).mappings().all())
+
+    def event_export_statement(self):
+        return select(*AnalyticsEvent.__table__.columns).order_by(AnalyticsEvent.id)
+
     async def list_dashboards(self) -> list[Dashboard]:
         return list((await self.session.scalars(select(Dashboard))).all())
 
+    async def get_dashboard(self, dashboard_id: int) -> Dashboard | None:
+        return await self.session.get(Dashboard, dashboard_id)
+
 
 async def get_analytics_service(session: AsyncSession = Depends(get_session)) -> AnalyticsService:
     return AnalyticsService(session)
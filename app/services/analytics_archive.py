@@ -0,0 +1,96 @@
+"""On-disk columnar archive for expired analytics events.
+
+Parquet (zstd) when ``pyarrow`` is installed; otherwise gzip-compressed JSON
+lines where each line is one row group stored column by column. Both are
+written incrementally so a month never has to fit in memory.
+"""
+
+from __future__ import annotations
+
+import gzip
+import json
+from collections.abc import Iterator, Sequence
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+try:
+    import pyarrow
+    import pyarrow.parquet as parquet
+except ImportError:  # pragma: no cover - optional dependency
+    pyarrow = None  # type: ignore[assignment]
+    parquet = None  # type: ignore[assignment]
+
+
+COLUMNS = ("id", "user_id", "session_id", "event_type", "payload", "occurred_at")
+
+PARQUET_SUFFIX = ".parquet"
+JSON_SUFFIX = ".columns.json.gz"
+
+
+def _encode_row(row: Any) -> dict[str, Any]:
+    occurred_at = row["occurred_at"]
+    return {
+        "id": row["id"],
+        "user_id": row["user_id"],
+        "session_id": row["session_id"],
+        "event_type": row["event_type"],
+        "payload": None if row["payload"] is None else json.dumps(row["payload"], separators=(",", ":")),
+        "occurred_at": occurred_at.isoformat() if isinstance(occurred_at, datetime) else occurred_at,
+    }
+
+
+class ArchiveWriter:
+    """Append row groups to one archive file; use as a context manager."""
+
+    def __init__(self, directory: str | Path, name: str, *, use_parquet: bool | None = None) -> None:
+        self.use_parquet = pyarrow is not None if use_parquet is None else use_parquet
+        suffix = PARQUET_SUFFIX if self.use_parquet else JSON_SUFFIX
+        self.path = Path(directory) / f"{name}{suffix}"
+        self.rows = 0
+        self._handle: Any = None
+
+    def __enter__(self) -> ArchiveWriter:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if not self.use_parquet:
+            self._handle = gzip.open(self.path, "wt", encoding="utf-8")
+        return self
+
+    def write_group(self, rows: Sequence[Any]) -> None:
+        if not rows:
+            return
+        encoded = [_encode_row(row) for row in rows]
+        columns = {column: [row[column] for row in encoded] for column in COLUMNS}
+        if self.use_parquet:
+            table = pyarrow.table(columns)
+            if self._handle is None:
+                self._handle = parquet.ParquetWriter(self.path, table.schema, compression="zstd")
+            self._handle.write_table(table)
+        else:
+            self._handle.write(json.dumps(columns, separators=(",", ":")) + "\n")
+        self.rows += len(rows)
+
+    def __exit__(self, *exc_info: Any) -> None:
+        if self._handle is not None:
+            self._handle.close()
+
+
+def _row_groups(path: Path) -> Iterator[dict[str, list]]:
+    if path.name.endswith(PARQUET_SUFFIX):
+        for batch in parquet.ParquetFile(path).iter_batches():
+            yield batch.to_pydict()
+        return
+    with gzip.open(path, "rt", encoding="utf-8") as handle:
+        for line in handle:
+            yield json.loads(line)
+
+
+def read_archive(path: str | Path) -> Iterator[dict[str, Any]]:
+    """Yield archived rows back as dicts (payload decoded, timestamps as ISO strings)."""
+
+    for columns in _row_groups(Path(path)):
+        for index in range(len(columns["id"])):
+            row = {column: columns[column][index] for column in COLUMNS}
+            if row["payload"] is not None:
+                row["payload"] = json.loads(row["payload"])
+            yield row
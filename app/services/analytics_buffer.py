@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import Sequence
+
+from sqlalchemy import insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal
+from app.middleware.metrics import ANALYTICS_BUFFER_DEPTH, ANALYTICS_EVENTS
+from app.models.analytics import AnalyticsEvent
+
+logger = logging.getLogger("app.analytics")
+
+
+class BufferFull(Exception):
+    """Raised when a submission does not fit in the ingestion buffer."""
+
+
+class EventBuffer:
+    """Bounded in-process buffer drained by a background task with multi-row inserts.
+
+    The flusher wakes up as soon as ``batch_size`` events are waiting, and at
+    least every ``flush_interval`` seconds otherwise. A failed INSERT is retried
+    up to ``retries`` times with exponential backoff; after that the batch is
+    dropped and counted as ``dropped``. A batch rejected by a constraint is
+    split until only the offending rows are left out.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_size: int,
+        batch_size: int,
+        flush_interval: float,
+        retries: int = settings.analytics_flush_retries,
+        retry_backoff: float = settings.analytics_flush_retry_backoff_seconds,
+        session_factory: async_sessionmaker[AsyncSession] = AsyncSessionLocal,
+    ) -> None:
+        self.max_size = max_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.retries = retries
+        self.retry_backoff = retry_backoff
+        self.session_factory = session_factory
+        self._pending: list[dict] = []
+        self._wakeup: asyncio.Event | None = None
+        self._task: asyncio.Task | None = None
+        self._stopping = False
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._stopping
+
+    def submit(self, rows: Sequence[dict]) -> None:
+        """Enqueue all of ``rows`` or none of them."""
+
+        if not self.running:
+            raise BufferFull("ingestion buffer is not accepting events")
+        if self.max_size - len(self._pending) < len(rows):
+            ANALYTICS_EVENTS.labels("rejected").inc(len(rows))
+            raise BufferFull("ingestion buffer is full")
+        self._pending.extend(rows)
+        ANALYTICS_EVENTS.labels("accepted").inc(len(rows))
+        ANALYTICS_BUFFER_DEPTH.set(len(self._pending))
+        if len(self._pending) >= self.batch_size:
+            self._wakeup.set()
+
+    async def start(self) -> None:
+        if self._task is not None:
+            return
+        # Created here so the event binds to the loop that serves requests.
+        self._wakeup = asyncio.Event()
+        self._stopping = False
+        self._task = asyncio.create_task(self._run(), name="analytics-flusher")
+
+    async def stop(self) -> None:
+        """Stop accepting events and write everything still buffered."""
+
+        if self._task is None:
+            return
+        self._stopping = True
+        self._wakeup.set()
+        await self._task
+        await self.flush()
+        self._task = None
+
+    async def flush(self) -> None:
+        """Write every buffered event now, ``batch_size`` rows per INSERT."""
+
+        while self._pending:
+            batch = self._pending[: self.batch_size]
+            del self._pending[: self.batch_size]
+            await self._write(batch)
+
+    async def _run(self) -> None:
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+
+    async def _write(self, batch: list[dict]) -> None:
+        try:
+            await self._write_batch(batch)
+        finally:
+            ANALYTICS_BUFFER_DEPTH.set(len(self._pending))
+
+    async def _write_batch(self, batch: list[dict]) -> None:
+        for attempt in range(self.retries + 1):
+            try:
+                async with self.session_factory() as session:
+                    await session.execute(insert(AnalyticsEvent), batch)
+                    await session.commit()
+            except IntegrityError:
+                # A bad row (e.g. an unknown user_id) fails the whole INSERT on every retry:
+                # bisect so only the offending rows are dropped.
+                if len(batch) == 1:
+                    ANALYTICS_EVENTS.labels("dropped").inc()
+                    logger.warning("analytics.event_rejected", extra={"event_type": batch[0].get("event_type")})
+                    return
+                middle = len(batch) // 2
+                await self._write_batch(batch[:middle])
+                await self._write_batch(batch[middle:])
+                return
+            except Exception:
+                ANALYTICS_EVENTS.labels("failed").inc(len(batch))
+                if attempt == self.retries:
+                    ANALYTICS_EVENTS.labels("dropped").inc(len(batch))
+                    logger.exception("analytics.flush_dropped", extra={"events": len(batch)})
+                    return
+                logger.warning("analytics.flush_failed", extra={"events": len(batch), "attempt": attempt + 1})
+                await asyncio.sleep(self.retry_backoff * 2**attempt)
+            else:
+                ANALYTICS_EVENTS.labels("written").inc(len(batch))
+                return
+
+event_buffer = EventBuffer(
+    max_size=settings.analytics_buffer_size,
+    batch_size=settings.analytics_flush_batch_size,
+    flush_interval=settings.analytics_flush_interval_seconds,
+)
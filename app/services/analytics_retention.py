@@ -0,0 +1,247 @@
+"""Monthly partitions and retention for ``analytics_events``.
+
+On PostgreSQL the table is range-partitioned by ``occurred_at`` (migration
+0006): partitions are created ahead of time and expired ones are archived
+and dropped whole. Rows that landed in the DEFAULT partition (no monthly
+partition existed yet) are moved into the new partition when it is created,
+and expire from the default partition month by month. SQLite has no
+partitioning, so rows leave the hot table for ``analytics_events_archive``
+once they fall outside ``hot_months`` and expire from there month by month.
+
+Raw rows never leave ``analytics_events`` before every rollup watermark has
+passed them; without any watermark nothing is moved or expired.
+"""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+
+from sqlalchemy import column, delete, func, insert, select, table, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.http_cache import as_utc
+from app.models.analytics import AnalyticsEvent, AnalyticsEventArchive, AnalyticsRollupWatermark
+from app.services.analytics_archive import ArchiveWriter
+
+logger = logging.getLogger("app.analytics.retention")
+
+PARTITION_PREFIX = "analytics_events_p"
+DEFAULT_PARTITION = "analytics_events_default"
+
+_EVENT_COLUMNS = [event_column.name for event_column in AnalyticsEvent.__table__.columns]
+
+_ARCHIVE_BATCH_SIZE = 5000
+
+
+def month_start(value: datetime) -> datetime:
+    return as_utc(value).replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def add_months(value: datetime, months: int) -> datetime:
+    years, month_index = divmod(value.month - 1 + months, 12)
+    return value.replace(year=value.year + years, month=month_index + 1)
+
+
+def partition_name(month: datetime) -> str:
+    return f"{PARTITION_PREFIX}{month:%Y%m}"
+
+
+def partition_month(name: str) -> datetime | None:
+    suffix = name.removeprefix(PARTITION_PREFIX)
+    if name == suffix or len(suffix) != 6 or not suffix.isdigit():
+        return None
+    return month_start(datetime(int(suffix[:4]), int(suffix[4:]), 1))
+
+
+@dataclass
+class ExpiredMonth:
+    month: datetime
+    rows: int
+    archive_path: Path | None = None
+    skipped: bool = False
+
+
+class RetentionManager:
+    def __init__(
+        self,
+        session: AsyncSession,
+        *,
+        retention_months: int | None = None,
+        mode: str | None = None,
+        archive_dir: str | Path | None = None,
+        hot_months: int | None = None,
+    ) -> None:
+        self.session = session
+        self.retention_months = retention_months or settings.analytics_retention_months
+        self.mode = mode or settings.analytics_retention_mode
+        self.archive_dir = Path(archive_dir or settings.analytics_archive_dir)
+        self.hot_months = hot_months or settings.analytics_hot_months
+        if self.mode not in ("archive", "drop"):
+            raise ValueError(f"Unknown retention mode: {self.mode}")
+
+    @property
+    def is_postgres(self) -> bool:
+        return self.session.bind.dialect.name == "postgresql"
+
+    def retention_cutoff(self, now: datetime | None = None) -> datetime:
+        return add_months(month_start(now or datetime.utcnow()), -self.retention_months)
+
+    async def ensure_partitions(self, *, now: datetime | None = None, ahead: int | None = None) -> list[str]:
+        """Create the current month's partition and ``ahead`` future ones (PostgreSQL only)."""
+
+        if not self.is_postgres:
+            return []
+        ahead = settings.analytics_partition_months_ahead if ahead is None else ahead
+        current = month_start(now or datetime.utcnow())
+        existing = {name for name, _ in await self.partitions()}
+        created = []
+        for offset in range(ahead + 1):
+            month = add_months(current, offset)
+            name = partition_name(month)
+            if name in existing:
+                continue
+            bounds = f"FROM ('{month.isoformat()}') TO ('{add_months(month, 1).isoformat()}')"
+            in_month = f"occurred_at >= '{month.isoformat()}' AND occurred_at < '{add_months(month, 1).isoformat()}'"
+            stranded = await self.session.scalar(
+                text(f"SELECT EXISTS (SELECT 1 FROM {DEFAULT_PARTITION} WHERE {in_month})")
+            )
+            if stranded:
+                # Creating the partition would fail while the default one holds rows for its range:
+                # move them into a standalone table first, then attach it.
+                await self.session.execute(
+                    text(f"CREATE TABLE {name} (LIKE analytics_events INCLUDING DEFAULTS INCLUDING CONSTRAINTS)")
+                )
+                await self.session.execute(
+                    text(
+                        f"WITH moved AS (DELETE FROM {DEFAULT_PARTITION} WHERE {in_month} RETURNING *) "
+                        f"INSERT INTO {name} SELECT * FROM moved"
+                    )
+                )
+                await self.session.execute(
+                    text(f"ALTER TABLE analytics_events ATTACH PARTITION {name} FOR VALUES {bounds}")
+                )
+                logger.info("analytics.partition_backfilled", extra={"partition": name})
+            else:
+                await self.session.execute(
+                    text(f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF analytics_events FOR VALUES {bounds}")
+                )
+            created.append(name)
+        return created
+
+    async def partitions(self) -> list[tuple[str, datetime]]:
+        """Monthly partitions of ``analytics_events``, oldest first (PostgreSQL only)."""
+
+        if not self.is_postgres:
+            return []
+        rows = await self.session.execute(
+            text(
+                "SELECT child.relname FROM pg_inherits "
+                "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+                "WHERE pg_inherits.inhparent = 'analytics_events'::regclass"
+            )
+        )
+        months = [(name, partition_month(name)) for (name,) in rows]
+        return sorted(((name, month) for name, month in months if month is not None), key=lambda item: item[1])
+
+    async def move_cold_rows(self, *, now: datetime | None = None) -> int:
+        """SQLite fallback: move rows older than the hot window into the archive table."""
+
+        if self.is_postgres:
+            return 0
+        rollup_floor = await self._rollup_floor()
+        if rollup_floor is None:
+            logger.warning("analytics.retention_no_rollup_watermark")
+            return 0
+        cutoff = add_months(month_start(now or datetime.utcnow()), -(self.hot_months - 1))
+        source = AnalyticsEvent.__table__
+        # Rows the rollup job has not folded in yet stay in the hot table it reads.
+        cold = (source.c.occurred_at < cutoff) & (source.c.id <= rollup_floor)
+        moved = await self.session.scalar(select(func.count()).select_from(source).where(cold))
+        if moved:
+            await self.session.execute(
+                insert(AnalyticsEventArchive.__table__).from_select(_EVENT_COLUMNS, select(*source.columns).where(cold))
+            )
+            await self.session.execute(delete(source).where(cold))
+        return moved or 0
+
+    async def expire(self, *, now: datetime | None = None) -> list[ExpiredMonth]:
+        """Archive (or just drop) every month older than the retention window."""
+
+        cutoff = self.retention_cutoff(now)
+        if self.is_postgres:
+            months = [(month, table(name, *self._columns()), True) for name, month in await self.partitions()]
+            months.extend(
+                (month, source, False)
+                for month, source in await self._months_before(table(DEFAULT_PARTITION, *self._columns()), cutoff)
+            )
+        else:
+            months = [
+                (month, source, False)
+                for month, source in await self._months_before(AnalyticsEventArchive.__table__, cutoff)
+            ]
+        rollup_floor = await self._rollup_floor()
+        return [
+            await self._expire_month(month, source, rollup_floor, drop_table=drop_table)
+            for month, source, drop_table in months
+            if add_months(month, 1) <= cutoff
+        ]
+
+    async def _months_before(self, source, cutoff: datetime) -> list:
+        """``(month, source)`` for every month of ``source`` before ``cutoff``."""
+
+        oldest = await self.session.scalar(select(func.min(source.c.occurred_at)))
+        months = []
+        month = month_start(oldest) if oldest is not None else cutoff
+        while month < cutoff:
+            months.append((month, source))
+            month = add_months(month, 1)
+        return months
+
+    async def _expire_month(
+        self, month: datetime, source, rollup_floor: int | None, *, drop_table: bool
+    ) -> ExpiredMonth:
+        upper = add_months(month, 1)
+        in_month = (source.c.occurred_at >= month) & (source.c.occurred_at < upper)
+        newest = await self.session.scalar(select(func.max(source.c.id)).where(in_month))
+        if newest is None and not drop_table:
+            return ExpiredMonth(month=month, rows=0)
+        if newest is not None and (rollup_floor is None or newest > rollup_floor):
+            # Keep raw rows until the rollup job has folded them in.
+            logger.warning("analytics.retention_skipped", extra={"month": month.isoformat()})
+            return ExpiredMonth(month=month, rows=0, skipped=True)
+
+        expired = ExpiredMonth(month=month, rows=0)
+        if self.mode == "archive" and newest is not None:
+            with ArchiveWriter(self.archive_dir, f"analytics_events_{month:%Y%m}") as writer:
+                result = await self.session.stream(
+                    select(*source.columns).where(in_month).order_by(source.c.id),
+                    execution_options={"yield_per": _ARCHIVE_BATCH_SIZE},
+                )
+                async for rows in result.mappings().partitions(_ARCHIVE_BATCH_SIZE):
+                    writer.write_group(rows)
+            expired.rows = writer.rows
+            expired.archive_path = writer.path
+        elif newest is not None:
+            expired.rows = await self.session.scalar(select(func.count()).select_from(source).where(in_month))
+
+        if drop_table:
+            await self.session.execute(text(f"ALTER TABLE analytics_events DETACH PARTITION {source.name}"))
+            await self.session.execute(text(f"DROP TABLE {source.name}"))
+        else:
+            await self.session.execute(delete(source).where(in_month))
+        logger.info(
+            "analytics.retention_expired",
+            extra={"month": month.isoformat(), "rows": expired.rows, "mode": self.mode},
+        )
+        return expired
+
+    async def _rollup_floor(self) -> int | None:
+        return await self.session.scalar(select(func.min(AnalyticsRollupWatermark.last_event_id)))
+
+    @staticmethod
+    def _columns():
+        return [column(event_column.name, event_column.type) for event_column in AnalyticsEvent.__table__.columns]
@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import func, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from fastapi import Depends
+
+from app.core.config import settings
+from app.core.http_cache import as_utc
+from app.db.session import get_session
+from app.models.analytics import AnalyticsEvent, AnalyticsRollup, AnalyticsRollupWatermark
+
+GRANULARITIES = ("minute", "hour", "day")
+
+_TRUNCATE = {
+    "minute": {"second": 0, "microsecond": 0},
+    "hour": {"minute": 0, "second": 0, "microsecond": 0},
+    "day": {"hour": 0, "minute": 0, "second": 0, "microsecond": 0},
+}
+
+_BUCKET_KEY = ("granularity", "bucket_start", "event_type", "dimension", "dimension_value")
+
+# SQLite before 3.32 allows 999 bound parameters per statement; a rollup row binds
+# its bucket key plus the count.
+_UPSERT_CHUNK = 999 // (len(_BUCKET_KEY) + 1)
+
+
+def truncate(value: datetime, granularity: str) -> datetime:
+    return as_utc(value).replace(**_TRUNCATE[granularity])
+
+
+def dimension_value(payload: dict | None, dimension: str) -> str:
+    if not dimension or not isinstance(payload, dict):
+        return ""
+    value = payload.get(dimension)
+    return "" if value is None else str(value)
+
+
+class RollupService:
+    """Maintains ``analytics_rollups`` incrementally from ``analytics_events``.
+
+    Each run folds events above the watermark (by id) into minute, hour and day
+    buckets; the counts and the new watermark are written in the same
+    transaction, so a run is either fully applied or not at all.
+
+    Ids are allocated before commit, so a slow insert can become visible after
+    a higher id. Runs therefore only fold up to a horizon (the newest id) read
+    at least ``safety_lag`` ago, by which time every lower id has committed.
+    """
+
+    def __init__(
+        self, session: AsyncSession, *, dimension: str | None = None, safety_lag: float | None = None
+    ) -> None:
+        self.session = session
+        self.dimension = settings.analytics_rollup_dimension if dimension is None else dimension
+        lag = settings.analytics_rollup_safety_lag_seconds if safety_lag is None else safety_lag
+        self.safety_lag = timedelta(seconds=lag)
+
+    async def _watermark(self) -> AnalyticsRollupWatermark:
+        watermark = await self.session.get(AnalyticsRollupWatermark, self.dimension)
+        if watermark is None:
+            watermark = AnalyticsRollupWatermark(name=self.dimension, last_event_id=0)
+            self.session.add(watermark)
+        return watermark
+
+    async def roll_up(self, *, batch_size: int | None = None) -> int:
+        """Fold the next batch of events into the rollups; returns how many were read."""
+
+        watermark = await self._watermark()
+        now = datetime.now(timezone.utc)
+        if watermark.horizon_event_id is None or watermark.last_event_id >= watermark.horizon_event_id:
+            newest = await self.session.scalar(select(func.max(AnalyticsEvent.id)))
+            if newest is None or newest <= watermark.last_event_id:
+                return 0
+            watermark.horizon_event_id, watermark.horizon_at = newest, now
+            await self.session.flush()
+        if as_utc(watermark.horizon_at) > now - self.safety_lag:
+            return 0
+        stmt = (
+            select(AnalyticsEvent.id, AnalyticsEvent.event_type, AnalyticsEvent.payload, AnalyticsEvent.occurred_at)
+            .where(AnalyticsEvent.id > watermark.last_event_id, AnalyticsEvent.id <= watermark.horizon_event_id)
+            .order_by(AnalyticsEvent.id)
+            .limit(batch_size or settings.analytics_rollup_batch_size)
+        )
+        events = (await self.session.execute(stmt)).all()
+        if not events:
+            watermark.last_event_id = watermark.horizon_event_id
+            await self.session.flush()
+            return 0
+        counts: Counter[tuple[str, datetime, str, str]] = Counter()
+        for event in events:
+            value = dimension_value(event.payload, self.dimension)
+            for granularity in GRANULARITIES:
+                counts[(granularity, truncate(event.occurred_at, granularity), event.event_type, value)] += 1
+        await self._upsert(counts)
+        watermark.last_event_id = events[-1].id
+        await self.session.flush()
+        return len(events)
+
+    async def catch_up(self, *, batch_size: int | None = None) -> int:
+        """Run :meth:`roll_up` until the watermark reaches the newest event past the safety lag."""
+
+        total = 0
+        while processed := await self.roll_up(batch_size=batch_size):
+            total += processed
+        return total
+
+    async def _upsert(self, counts: Counter) -> None:
+        dialect = postgresql if self.session.bind.dialect.name == "postgresql" else sqlite
+        rows = [
+            {
+                "granularity": granularity,
+                "bucket_start": bucket_start,
+                "event_type": event_type,
+                "dimension": self.dimension,
+                "dimension_value": value,
+                "count": count,
+            }
+            for (granularity, bucket_start, event_type, value), count in counts.items()
+        ]
+        for start in range(0, len(rows), _UPSERT_CHUNK):
+            stmt = dialect.insert(AnalyticsRollup).values(rows[start : start + _UPSERT_CHUNK])
+            stmt = stmt.on_conflict_do_update(
+                index_elements=list(_BUCKET_KEY),
+                set_={"count": AnalyticsRollup.count + stmt.excluded["count"]},
+            )
+            await self.session.execute(stmt)
+
+    async def series(
+        self,
+        *,
+        event_type: str,
+        granularity: str = "hour",
+        start: datetime | None = None,
+        end: datetime | None = None,
+        dimension_value: str | None = None,
+        by_dimension: bool = False,
+    ) -> list:
+        """Bucketed counts for ``event_type``; summed across dimension values unless
+        ``dimension_value`` or ``by_dimension`` asks for them."""
+
+        split = by_dimension or dimension_value is not None
+        columns = [AnalyticsRollup.bucket_start]
+        if split:
+            columns.append(AnalyticsRollup.dimension_value)
+        stmt = (
+            select(*columns, func.sum(AnalyticsRollup.count).label("count"))
+            .where(
+                AnalyticsRollup.granularity == granularity,
+                AnalyticsRollup.event_type == event_type,
+                AnalyticsRollup.dimension == self.dimension,
+            )
+            .group_by(*columns)
+            .order_by(*columns)
+        )
+        if dimension_value is not None:
+            stmt = stmt.where(AnalyticsRollup.dimension_value == dimension_value)
+        if start is not None:
+            stmt = stmt.where(AnalyticsRollup.bucket_start >= truncate(start, granularity))
+        if end is not None:
+            stmt = stmt.where(AnalyticsRollup.bucket_start < as_utc(end))
+        return list((await self.session.execute(stmt)).mappings().all())
+
+
+async def get_rollup_service(session: AsyncSession = Depends(get_session)) -> RollupService:
+    return RollupService(session)
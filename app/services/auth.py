@@ -1,15 +1,19 @@
 from __future__ import annotations
 
-from datetime import datetime
+import secrets
+from datetime import datetime, timedelta
 
-from sqlalchemy import select
+from sqlalchemy import delete, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from fastapi import Depends
 
-from app.db.session import get_session
-from app.models.user import Permission, Role, User
+from app.core.config import settings
+from app.core.security import hash_token
+from app.db.session import after_commit, get_session
+from app.models.user import PasswordResetToken, Permission, Role, User, user_roles
+from app.services.principal import invalidate_principals, invalidate_roles_versions
 
 
 class AuthService:
@@ -25,6 +29,49 @@ class AuthService:
         stmt = select(User).options(*self._user_options()).where(User.email == email)
         return await self.session.scalar(stmt)
 
+    async def consume_reset_token(self, token: str) -> User | None:
+        """Use up ``token`` and any other pending reset of its user; ``None`` if unknown, expired or already used.
+
+        The token row is claimed with ``DELETE ... RETURNING``, so of two
+        concurrent resets with the same token only one gets a user back.
+        """
+
+        user_id = await self.session.scalar(
+            delete(PasswordResetToken)
+            .where(
+                PasswordResetToken.token_hash == hash_token(token),
+                PasswordResetToken.expires_at > datetime.utcnow(),
+            )
+            .returning(PasswordResetToken.user_id)
+        )
+        if user_id is None:
+            return None
+        await self.session.execute(delete(PasswordResetToken).where(PasswordResetToken.user_id == user_id))
+        return await self.session.get(User, user_id)
+
+    async def create_reset_token(self, user: User) -> str:
+        """Replace any pending reset for ``user``; returns the token to send (only its hash is stored)."""
+
+        await self.session.execute(delete(PasswordResetToken).where(PasswordResetToken.user_id == user.id))
+        token = secrets.token_urlsafe(32)
+        self.session.add(
+            PasswordResetToken(
+                token_hash=hash_token(token),
+                user_id=user.id,
+                expires_at=datetime.utcnow() + timedelta(minutes=settings.password_reset_token_ttl_minutes),
+            )
+        )
+        await self.session.flush()
+        return token
+
+    async def purge_reset_tokens(self) -> int:
+        """Delete expired reset tokens; returns how many rows were removed."""
+
+        result = await self.session.execute(
+            delete(PasswordResetToken).where(PasswordResetToken.expires_at <= datetime.utcnow())
+        )
+        return result.rowcount or 0
+
     async def get_user(self, user_id: int) -> User | None:
         return await self.session.get(User, user_id, options=self._user_options())
 
@@ -32,6 +79,9 @@ class AuthService:
         stmt = select(User).options(*self._user_options())
         return list((await self.session.scalars(stmt)).all())
 
+    def export_statement(self):
+        return select(User).options(*self._user_options()).order_by(User.id)
+
     async def create_user(
         self,
         *,
@@ -78,12 +128,26 @@ class AuthService:
             stmt = select(Role).options(selectinload(Role.permissions)).where(Role.id.in_(role_ids))
             roles = list((await self.session.scalars(stmt)).all())
             user.roles = roles
+        if is_active is not None or role_ids is not None:
+            user.roles_version += 1
         if stripe_customer_id is not None:
             user.stripe_customer_id = stripe_customer_id
         self.session.add(user)
         await self.session.flush()
+        after_commit(self.session, invalidate_principals, user.id)
+        after_commit(self.session, invalidate_roles_versions, user.id)
         return user
 
+    async def set_password(self, user: User, hashed_password: str) -> None:
+        """Store a new password hash; tokens carrying the old ``roles_version`` stop validating."""
+
+        user.hashed_password = hashed_password
+        user.roles_version += 1
+        self.session.add(user)
+        await self.session.flush()
+        after_commit(self.session, invalidate_principals, user.id)
+        after_commit(self.session, invalidate_roles_versions, user.id)
+
     async def get_role_by_name(self, name: str) -> Role | None:
         stmt = select(Role).options(selectinload(Role.permissions)).where(Role.name == name)
         return await self.session.scalar(stmt)
@@ -98,8 +162,11 @@ class AuthService:
         return role
 
     async def delete_user(self, user: User) -> None:
+        user_id = user.id
         await self.session.delete(user)
         await self.session.flush()
+        after_commit(self.session, invalidate_principals, user_id)
+        after_commit(self.session, invalidate_roles_versions, user_id)
 
     async def record_login(self, user: User) -> None:
         user.last_login_at = datetime.utcnow()
@@ -144,6 +211,15 @@ class AuthService:
             role.permissions = permissions
         self.session.add(role)
         await self.session.flush()
+        holders = list(
+            (await self.session.scalars(select(user_roles.c.user_id).where(user_roles.c.role_id == role.id))).all()
+        )
+        if holders and permission_codes is not None:
+            await self.session.execute(
+                update(User).where(User.id.in_(holders)).values(roles_version=User.roles_version + 1)
+            )
+        after_commit(self.session, invalidate_principals, *holders)
+        after_commit(self.session, invalidate_roles_versions, *holders)
         return role
 
     async def list_permissions(self) -> list[Permission]:
@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import logging
+import time
+from collections import OrderedDict
+from typing import Protocol
+
+from app.core.config import settings
+from app.middleware.metrics import CACHE_HITS, CACHE_MISSES
+
+try:
+    from redis import asyncio as redis_asyncio
+except ImportError:  # pragma: no cover - optional dependency
+    redis_asyncio = None  # type: ignore[assignment]
+
+
+logger = logging.getLogger("app.cache")
+
+
+class CacheBackend(Protocol):
+    async def get(self, key: str) -> bytes | None: ...
+
+    async def set(self, key: str, value: bytes, ttl: int) -> None: ...
+
+    async def delete(self, *keys: str) -> None: ...
+
+
+class MemoryCache:
+    """In-process LRU bounded by entry count, total bytes and a per-entry TTL."""
+
+    def __init__(self, *, max_entries: int, max_bytes: int) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
+        self._size = 0
+
+    async def get(self, key: str) -> bytes | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            self._pop(key)
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: bytes, ttl: int) -> None:
+        if len(value) > self.max_bytes:
+            return
+        self._pop(key)
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._size += len(value)
+        while len(self._entries) > self.max_entries or self._size > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._pop(oldest)
+
+    async def delete(self, *keys: str) -> None:
+        for key in keys:
+            self._pop(key)
+
+    def _pop(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._size -= len(entry[1])
+
+
+class RedisCache:
+    """Shared backend so every worker sees the same entries and invalidations."""
+
+    def __init__(self, url: str) -> None:
+        self.client = redis_asyncio.from_url(url)
+
+    async def get(self, key: str) -> bytes | None:
+        return await self.client.get(key)
+
+    async def set(self, key: str, value: bytes, ttl: int) -> None:
+        await self.client.set(key, value, ex=ttl)
+
+    async def delete(self, *keys: str) -> None:
+        if keys:
+            await self.client.delete(*keys)
+
+
+def create_cache_backend(
+    backend: str | None = None,
+    *,
+    url: str | None = None,
+    max_entries: int | None = None,
+    max_bytes: int | None = None,
+) -> CacheBackend | None:
+    """Backend from the given options, defaulting to the ``CONTENT_CACHE_*`` settings."""
+
+    if backend is None:
+        backend, url = settings.content_cache_backend, settings.content_cache_url
+    if backend == "none":
+        return None
+    if backend == "redis":
+        if url and redis_asyncio is not None:
+            return RedisCache(url)
+        # Local stand-in so single-worker and test setups behave the same way.
+        logger.warning("cache.redis_unavailable", extra={"fallback": "memory"})
+    return MemoryCache(
+        max_entries=max_entries or settings.content_cache_max_entries,
+        max_bytes=max_bytes or settings.content_cache_max_bytes,
+    )
+
+
+class ReadThroughCache:
+    """Namespaced read-through cache of serialised payloads."""
+
+    def __init__(self, name: str, backend: CacheBackend | None, *, ttl: int) -> None:
+        self.name = name
+        self.backend = backend
+        self.ttl = ttl
+
+    def _key(self, key: str) -> str:
+        return f"{self.name}:{key}"
+
+    async def get(self, key: str) -> bytes | None:
+        if self.backend is None:
+            return None
+        value = await self.backend.get(self._key(key))
+        if value is None:
+            CACHE_MISSES.labels(self.name).inc()
+        else:
+            CACHE_HITS.labels(self.name).inc()
+        return value
+
+    async def set(self, key: str, value: bytes) -> None:
+        if self.backend is not None:
+            await self.backend.set(self._key(key), value, self.ttl)
+
+    async def invalidate(self, *keys: str) -> None:
+        if self.backend is not None:
+            await self.backend.delete(*(self._key(key) for key in keys if key))
+
+
+content_cache = ReadThroughCache(
+    "content_by_slug",
+    create_cache_backend(),
+    ttl=settings.content_cache_ttl_seconds,
+)
@@ -2,13 +2,16 @@ from __future__ import annotations
 
 from datetime import datetime
 
-from sqlalchemy import select
+from sqlalchemy import and_, func, select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import load_only, selectinload, with_expression
+from sqlalchemy.orm.attributes import set_committed_value
 
 from fastapi import Depends
 
-from app.db.session import get_session
+from app.core.config import settings
+from app.core.pagination import decode_cursor, encode_cursor
+from app.db.session import after_commit, get_session
 from app.models.content import (
     ContentCategory,
     ContentItem,
@@ -16,6 +19,27 @@ from app.models.content import (
     ContentVersion,
     ContentWorkflowState,
 )
+from app.models.search import SearchOutbox
+from app.services import fulltext, version_storage
+from app.services.cache import content_cache
+from app.services.search import search_service
+from app.services.seo import invalidate_sitemap
+from app.services.suggest import suggest_index
+
+CONTENT_SORT_KEYS = ("published_at", "updated_at")
+SUMMARY_COLUMNS = (
+    ContentItem.id,
+    ContentItem.type,
+    ContentItem.title,
+    ContentItem.slug,
+    ContentItem.status,
+    ContentItem.workflow_state,
+    ContentItem.published_at,
+    ContentItem.created_by,
+    ContentItem.updated_by,
+    ContentItem.created_at,
+    ContentItem.updated_at,
+)
 
 
 class ContentService:
@@ -24,17 +48,155 @@ class ContentService:
 
     def _default_options(self):
         return (
-            selectinload(ContentItem.versions),
+            selectinload(ContentItem.latest_version),
             selectinload(ContentItem.categories),
             selectinload(ContentItem.media_links).selectinload(ContentMedia.media),
         )
 
-    async def list_content(self) -> list[ContentItem]:
-        stmt = select(ContentItem).options(*self._default_options())
-        return list((await self.session.scalars(stmt)).all())
+    def _summary_options(self):
+        """Column-level options for listings: scalars plus the latest version id/number."""
+
+        latest_number = (
+            select(func.max(ContentVersion.version_number))
+            .where(ContentVersion.content_id == ContentItem.id)
+            .correlate(ContentItem)
+            .scalar_subquery()
+        )
+        latest_id = (
+            select(ContentVersion.id)
+            .where(ContentVersion.content_id == ContentItem.id)
+            .order_by(ContentVersion.version_number.desc())
+            .limit(1)
+            .correlate(ContentItem)
+            .scalar_subquery()
+        )
+        return (
+            load_only(*SUMMARY_COLUMNS),
+            with_expression(ContentItem.latest_version_id, latest_id),
+            with_expression(ContentItem.latest_version_number, latest_number),
+        )
+
+    def _filter_listing(
+        self,
+        stmt,
+        *,
+        sort: str,
+        status: str | None,
+        type: str | None,
+        workflow_state: ContentWorkflowState | None,
+        category: str | None,
+    ):
+        if sort == "published_at":
+            stmt = stmt.where(ContentItem.published_at.is_not(None))
+        if status is not None:
+            stmt = stmt.where(ContentItem.status == status)
+        if type is not None:
+            stmt = stmt.where(ContentItem.type == type)
+        if workflow_state is not None:
+            stmt = stmt.where(ContentItem.workflow_state == workflow_state)
+        if category is not None:
+            stmt = stmt.where(ContentItem.categories.any(ContentCategory.slug == category))
+        return stmt
+
+    async def listing_validator(
+        self,
+        *,
+        sort: str = "updated_at",
+        status: str | None = None,
+        type: str | None = None,
+        workflow_state: ContentWorkflowState | None = None,
+        category: str | None = None,
+    ) -> tuple[datetime | None, int]:
+        """Return ``(max(updated_at), count)`` over a listing's filtered set."""
+
+        stmt = self._filter_listing(
+            select(func.max(ContentItem.updated_at), func.count(ContentItem.id)),
+            sort=sort,
+            status=status,
+            type=type,
+            workflow_state=workflow_state,
+            category=category,
+        )
+        last_modified, count = (await self.session.execute(stmt)).one()
+        return last_modified, count
+
+    async def list_content(
+        self,
+        *,
+        limit: int = 20,
+        cursor: str | None = None,
+        sort: str = "updated_at",
+        status: str | None = None,
+        type: str | None = None,
+        workflow_state: ContentWorkflowState | None = None,
+        category: str | None = None,
+    ) -> tuple[list[ContentItem], str | None]:
+        """Return one keyset page of content summaries, newest first, and the next cursor.
+
+        Items are ordered by ``(sort, id)`` descending. Sorting on
+        ``published_at`` only returns items that have been published.
+        """
+
+        if sort not in CONTENT_SORT_KEYS:
+            raise ValueError(f"Unsupported sort key: {sort}")
+        sort_column = getattr(ContentItem, sort)
+
+        stmt = self._filter_listing(
+            select(ContentItem).options(*self._summary_options()),
+            sort=sort,
+            status=status,
+            type=type,
+            workflow_state=workflow_state,
+            category=category,
+        )
+        if cursor:
+            position = decode_cursor(cursor)
+            if position.get("sort") != sort:
+                raise ValueError("Cursor does not match the requested sort key")
+            try:
+                key = datetime.fromisoformat(position["key"])
+                last_id = int(position["id"])
+            except (KeyError, TypeError, ValueError) as exc:
+                raise ValueError("Invalid cursor") from exc
+            stmt = stmt.where(tuple_(sort_column, ContentItem.id) < tuple_(key, last_id))
+
+        stmt = stmt.order_by(sort_column.desc(), ContentItem.id.desc()).limit(limit + 1)
+        items = list((await self.session.scalars(stmt)).all())
+
+        next_cursor = None
+        if len(items) > limit:
+            items = items[:limit]
+            last = items[-1]
+            next_cursor = encode_cursor(
+                {"sort": sort, "key": getattr(last, sort).isoformat(), "id": last.id}
+            )
+        return items, next_cursor
+
+    async def get_validator(self, slug: str):
+        """Return ``(id, updated_at, latest_version_number)`` for ``slug`` without loading relationships."""
+
+        latest_number = (
+            select(func.max(ContentVersion.version_number))
+            .where(ContentVersion.content_id == ContentItem.id)
+            .correlate(ContentItem)
+            .scalar_subquery()
+        )
+        stmt = select(ContentItem.id, ContentItem.updated_at, latest_number.label("version_number")).where(
+            ContentItem.slug == slug
+        )
+        return (await self.session.execute(stmt)).one_or_none()
 
     async def get_content(self, content_id: int) -> ContentItem | None:
-        return await self.session.get(ContentItem, content_id, options=self._default_options())
+        item = await self.session.get(ContentItem, content_id, options=self._default_options())
+        return await self._hydrate_latest(item)
+
+    async def reload(self, item: ContentItem) -> ContentItem:
+        """Re-read ``item`` and its relationships after a commit."""
+
+        item = await self.session.get(
+            ContentItem, item.id, options=self._default_options(), populate_existing=True
+        )
+        return await self._hydrate_latest(item)
 
     async def get_content_by_slug(self, slug: str) -> ContentItem | None:
         stmt = (
@@ -42,7 +204,7 @@ class ContentService:
             .where(ContentItem.slug == slug)
             .options(*self._default_options())
         )
-        return await self.session.scalar(stmt)
+        return await self._hydrate_latest(await self.session.scalar(stmt))
 
     async def create_content(
         self,
@@ -66,7 +228,14 @@ class ContentService:
             created_by=created_by,
             updated_by=created_by,
         )
-        version = ContentVersion(content=item, version_number=1, body=body)
+        encoded = await self._encode_body(None, 1, body)
+        version = ContentVersion(
+            content=item,
+            version_number=1,
+            body=encoded.body,
+            body_encoding=encoded.body_encoding,
+            body_data=encoded.body_data,
+        )
         item.versions.append(version)
         if category_ids:
             categories = list(
@@ -80,6 +249,11 @@ class ContentService:
             ]
         self.session.add(item)
         await self.session.flush()
+        await fulltext.sync(self.session, item.id, title=item.title, body=body)
+        if item.status == "published":
+            self._enqueue_search(item)
+            after_commit(self.session, suggest_index.put_content, item)
+            after_commit(self.session, invalidate_sitemap, item.id)
         return item
 
     async def update_content(
@@ -96,6 +270,7 @@ class ContentService:
         new_body: str | None = None,
         diff: dict | None = None,
     ) -> ContentItem:
+        previous_slug = item.slug
         if title is not None:
             item.title = title
         if slug is not None:
@@ -119,18 +294,159 @@ class ContentService:
                 for media_id, role in media_links
             ]
         if new_body is not None:
-            version_number = (item.versions[-1].version_number + 1) if item.versions else 1
+            version_number = await self.next_version_number(item.id, lock=True)
+            encoded = await self._encode_body(item.id, version_number, new_body)
             version = ContentVersion(
-                content=item,
+                content_id=item.id,
                 version_number=version_number,
-                body=new_body,
+                body=encoded.body,
+                body_encoding=encoded.body_encoding,
+                body_data=encoded.body_data,
                 diff=diff,
             )
-            item.versions.append(version)
+            self.session.add(version)
         self.session.add(item)
         await self.session.flush()
+        if new_body is not None:
+            await fulltext.sync(self.session, item.id, title=item.title, body=new_body)
+        elif title is not None:
+            await self._sync_fulltext(item)
+        self._enqueue_search(item)
+        after_commit(self.session, suggest_index.put_content, item)
+        after_commit(self.session, content_cache.invalidate, previous_slug, item.slug)
+        after_commit(self.session, invalidate_sitemap, item.id)
         return item
 
+    async def next_version_number(self, content_id: int, *, lock: bool = False) -> int:
+        """``MAX(version_number) + 1``; with ``lock``, the content row is locked first.
+
+        Writers must lock: two concurrent edits would otherwise both read the
+        same maximum and the second INSERT would hit the unique constraint.
+        """
+
+        if lock:
+            await self.session.execute(select(ContentItem.id).where(ContentItem.id == content_id).with_for_update())
+        stmt = select(func.max(ContentVersion.version_number)).where(ContentVersion.content_id == content_id)
+        return (await self.session.scalar(stmt) or 0) + 1
+
+    async def list_versions(
+        self,
+        content_id: int,
+        *,
+        limit: int = 20,
+        cursor: str | None = None,
+    ) -> tuple[list[ContentVersion], str | None]:
+        """Page through version metadata, newest first, without loading bodies."""
+
+        stmt = (
+            select(ContentVersion)
+            .options(
+                load_only(
+                    ContentVersion.id,
+                    ContentVersion.content_id,
+                    ContentVersion.version_number,
+                    ContentVersion.created_at,
+                )
+            )
+            .where(ContentVersion.content_id == content_id)
+        )
+        if cursor:
+            position = decode_cursor(cursor)
+            try:
+                before = int(position["version"])
+            except (KeyError, TypeError, ValueError) as exc:
+                raise ValueError("Invalid cursor") from exc
+            stmt = stmt.where(ContentVersion.version_number < before)
+        stmt = stmt.order_by(ContentVersion.version_number.desc()).limit(limit + 1)
+        versions = list((await self.session.scalars(stmt)).all())
+
+        next_cursor = None
+        if len(versions) > limit:
+            versions = versions[:limit]
+            next_cursor = encode_cursor({"version": versions[-1].version_number})
+        return versions, next_cursor
+
+    async def get_version(self, content_id: int, version_number: int) -> ContentVersion | None:
+        stmt = select(ContentVersion).where(
+            ContentVersion.content_id == content_id,
+            ContentVersion.version_number == version_number,
+        )
+        version = await self.session.scalar(stmt)
+        if version is not None:
+            await self.hydrate_body(version)
+        return version
+
+    async def reconstruct_body(self, content_id: int, version_number: int) -> tuple[int, str]:
+        """Rebuild a version body; returns ``(base_version_number, body)``.
+
+        Reads the closest non-delta version at or below ``version_number`` and
+        replays the deltas up to it, so the cost is bounded by the snapshot
+        interval rather than by the history length.
+        """
+
+        base_number = (
+            select(func.max(ContentVersion.version_number))
+            .where(
+                ContentVersion.content_id == content_id,
+                ContentVersion.version_number <= version_number,
+                ContentVersion.body_encoding != version_storage.DELTA,
+            )
+            .scalar_subquery()
+        )
+        stmt = (
+            select(
+                ContentVersion.version_number,
+                ContentVersion.body_encoding,
+                ContentVersion.body,
+                ContentVersion.body_data,
+            )
+            .where(
+                ContentVersion.content_id == content_id,
+                ContentVersion.version_number >= base_number,
+                ContentVersion.version_number <= version_number,
+            )
+            .order_by(ContentVersion.version_number)
+        )
+        rows = (await self.session.execute(stmt)).all()
+        if not rows or rows[-1].version_number != version_number:
+            raise LookupError(f"Version {version_number} of content {content_id} not found")
+        body = version_storage.rebuild([(row.body_encoding, row.body, row.body_data) for row in rows])
+        return rows[0].version_number, body
+
+    async def hydrate_body(self, version: ContentVersion) -> ContentVersion:
+        """Expose the decoded text on ``version.body`` without marking it dirty."""
+
+        if version.body_encoding == version_storage.PLAIN:
+            return version
+        if version.body_encoding == version_storage.SNAPSHOT:
+            body = version_storage.decode_body(version.body_encoding, None, version.body_data, None)
+        else:
+            _, body = await self.reconstruct_body(version.content_id, version.version_number)
+        set_committed_value(version, "body", body)
+        return version
+
+    async def _hydrate_latest(self, item: ContentItem | None) -> ContentItem | None:
+        if item is not None and item.latest_version is not None:
+            await self.hydrate_body(item.latest_version)
+        return item
+
+    async def _encode_body(
+        self, content_id: int | None, version_number: int, body: str
+    ) -> version_storage.EncodedBody:
+        if settings.content_version_storage != "delta":
+            return version_storage.encode_plain(body)
+        previous = None
+        chain_length = 0
+        if content_id is not None and version_number > 1:
+            base_number, previous = await self.reconstruct_body(content_id, version_number - 1)
+            chain_length = version_number - 1 - base_number
+        return version_storage.encode_next(
+            body,
+            previous=previous,
+            chain_length=chain_length,
+            snapshot_interval=settings.content_snapshot_interval,
+        )
+
     async def publish_content(self, item: ContentItem, *, published_by: int | None = None) -> ContentItem:
         item.status = "published"
         item.workflow_state = ContentWorkflowState.published
@@ -138,8 +454,99 @@ class ContentService:
         item.updated_by = published_by
         self.session.add(item)
         await self.session.flush()
+        await self._sync_fulltext(item)
+        self._enqueue_search(item)
+        after_commit(self.session, suggest_index.put_content, item)
+        after_commit(self.session, content_cache.invalidate, item.slug)
+        after_commit(self.session, invalidate_sitemap, item.id)
         return item
 
+    async def latest_body(self, content_id: int) -> str | None:
+        """Decoded text of the newest version, or ``None`` for an item without versions."""
+
+        version_number = await self.next_version_number(content_id) - 1
+        if not version_number:
+            return None
+        _, body = await self.reconstruct_body(content_id, version_number)
+        return body
+
+    async def latest_bodies(self, content_ids: list[int]) -> dict[int, str]:
+        """Decoded latest body per item in one query (plus a replay for delta-encoded heads)."""
+
+        if not content_ids:
+            return {}
+        latest = (
+            select(ContentVersion.content_id, func.max(ContentVersion.version_number).label("version_number"))
+            .where(ContentVersion.content_id.in_(content_ids))
+            .group_by(ContentVersion.content_id)
+            .subquery()
+        )
+        stmt = select(
+            ContentVersion.content_id,
+            ContentVersion.version_number,
+            ContentVersion.body_encoding,
+            ContentVersion.body,
+            ContentVersion.body_data,
+        ).join(
+            latest,
+            and_(
+                ContentVersion.content_id == latest.c.content_id,
+                ContentVersion.version_number == latest.c.version_number,
+            ),
+        )
+        bodies: dict[int, str] = {}
+        for row in await self.session.execute(stmt):
+            if row.body_encoding == version_storage.DELTA:
+                _, bodies[row.content_id] = await self.reconstruct_body(row.content_id, row.version_number)
+            else:
+                bodies[row.content_id] = version_storage.decode_body(
+                    row.body_encoding, row.body, row.body_data, None
+                )
+        return bodies
+
+    async def _sync_fulltext(self, item: ContentItem) -> None:
+        """Re-index ``item`` from its title and latest (possibly delta-encoded) body."""
+
+        body = await self.latest_body(item.id)
+        await fulltext.sync(self.session, item.id, title=item.title, body=body)
+
+    async def sync_fulltext_many(self, items: list[ContentItem]) -> None:
+        """Re-index ``items`` with one :meth:`latest_bodies` lookup for the whole batch."""
+
+        bodies = await self.latest_bodies([item.id for item in items])
+        await fulltext.sync_many(self.session, [(item.id, item.title, bodies.get(item.id)) for item in items])
+
+    def _enqueue_search(self, item: ContentItem) -> None:
+        """Record in the current transaction that the engine document for ``item`` is stale."""
+
+        if search_service.client is None or settings.search_provider == "local":
+            # No engine to drain the outbox into, or every worker catches its own index up
+            # from updated_at (LocalIndexRefresher).
+            return
+        self.session.add(SearchOutbox(content_id=item.id))
+
+    async def get_summaries(self, ids: list[int]) -> list[ContentItem]:
+        """Published summaries for ``ids`` in the given order, in one query; unknown ids are skipped."""
+
+        if not ids:
+            return []
+        stmt = (
+            select(ContentItem)
+            .where(ContentItem.id.in_(ids), ContentItem.status == "published")
+            .options(*self._summary_options())
+        )
+        by_id = {item.id: item for item in (await self.session.scalars(stmt)).all()}
+        return [by_id[content_id] for content_id in ids if content_id in by_id]
+
+    async def search_content(self, query: str, *, limit: int = 20, offset: int = 0) -> list[ContentItem]:
+        """Return one ranked page of published summaries matching ``query`` (built-in full-text index)."""
+
+        stmt = fulltext.search_statement(self.session, query)
+        if stmt is None:
+            return []
+        stmt = stmt.options(*self._summary_options()).limit(limit).offset(offset)
+        return list((await self.session.scalars(stmt)).all())
+
 
 async def get_content_service(session: AsyncSession = Depends(get_session)) -> ContentService:
     return ContentService(session)
@@ -0,0 +1,87 @@
+"""Built-in full-text search over content titles and latest bodies.
+
+Used when no external search engine is configured. PostgreSQL keeps a
+weighted ``content_items.search_vector`` (GIN index) ranked with ``ts_rank``;
+SQLite keeps a ``content_fts`` FTS5 table keyed by content id, ranked with
+``bm25``. Both are written by :class:`~app.services.content.ContentService`
+inside the same transaction as the content change.
+"""
+
+from __future__ import annotations
+
+import re
+
+from sqlalchemy import Select, column, func, literal, literal_column, select, table, text
+from sqlalchemy.dialects.postgresql import REGCONFIG
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.content import ContentItem
+
+FTS_TABLE = "content_fts"
+
+# Title matches weigh more than body matches (FTS5 bm25 column weights).
+TITLE_WEIGHT = 10.0
+BODY_WEIGHT = 1.0
+
+_WORD = re.compile(r"\w+", re.UNICODE)
+
+_fts = table(FTS_TABLE, column("rowid"))
+
+
+def _is_postgres(session: AsyncSession) -> bool:
+    return session.bind.dialect.name == "postgresql"
+
+
+def fts5_query(query: str) -> str | None:
+    """Turn free text into a safe FTS5 expression: every word, as a prefix, all required."""
+
+    words = _WORD.findall(query)
+    if not words:
+        return None
+    return " ".join(f'"{word}"*' for word in words)
+
+
+async def sync(session: AsyncSession, content_id: int, *, title: str, body: str | None) -> None:
+    await sync_many(session, [(content_id, title, body)])
+
+
+async def sync_many(session: AsyncSession, documents: list[tuple[int, str, str | None]]) -> None:
+    """Re-index ``(content_id, title, body)`` rows, one executemany per statement."""
+
+    if not documents:
+        return
+    params = [{"id": content_id, "title": title, "body": body or ""} for content_id, title, body in documents]
+    if _is_postgres(session):
+        await session.execute(
+            text(
+                "UPDATE content_items SET search_vector = "
+                "setweight(to_tsvector(CAST(:config AS regconfig), :title), 'A') || "
+                "setweight(to_tsvector(CAST(:config AS regconfig), :body), 'B') "
+                "WHERE id = :id"
+            ),
+            [{**row, "config": settings.fulltext_language} for row in params],
+        )
+        return
+    await session.execute(text(f"DELETE FROM {FTS_TABLE} WHERE rowid = :id"), [{"id": row["id"]} for row in params])
+    await session.execute(text(f"INSERT INTO {FTS_TABLE} (rowid, title, body) VALUES (:id, :title, :body)"), params)
+
+
+def search_statement(session: AsyncSession, query: str) -> Select | None:
+    """Published items matching ``query``, best match first; ``None`` when nothing is searchable."""
+
+    stmt = select(ContentItem).where(ContentItem.status == "published")
+    if _is_postgres(session):
+        if not query.strip():
+            return None
+        vector = literal_column("content_items.search_vector")
+        tsquery = func.websearch_to_tsquery(literal(settings.fulltext_language, REGCONFIG), query)
+        return stmt.where(vector.op("@@")(tsquery)).order_by(func.ts_rank(vector, tsquery).desc(), ContentItem.id)
+    match = fts5_query(query)
+    if match is None:
+        return None
+    return (
+        stmt.join(_fts, _fts.c.rowid == ContentItem.id)
+        .where(literal_column(FTS_TABLE).op("MATCH")(match))
+        .order_by(func.bm25(literal_column(FTS_TABLE), TITLE_WEIGHT, BODY_WEIGHT), ContentItem.id)
+    )
@@ -0,0 +1,448 @@
+"""In-process inverted index used by ``SEARCH_PROVIDER=local``.
+
+Postings are stored column-wise in ``array('I')`` buffers (document
+ordinals and term frequencies), so a term costs two compact arrays rather
+than a dict of Python ints. Documents get append-only ordinals; updating a
+document tombstones its previous ordinal, and :meth:`LocalSearchIndex.compact`
+renumbers once tombstones pile up.
+
+Snapshots are a directory of raw little-endian ``uint32`` files plus a small
+JSON header. Loading maps the postings files with :mod:`mmap` and slices them
+through memoryviews, so a restart does not copy or re-tokenize the catalogue;
+a term's postings are only copied into a mutable array when it is next
+updated.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import bisect
+import heapq
+import json
+import logging
+import math
+import mmap
+import os
+import re
+import shutil
+import sys
+import tempfile
+import unicodedata
+from array import array
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Sequence
+
+from sqlalchemy import select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal
+from app.models.content import ContentItem
+
+logger = logging.getLogger("app.search.local")
+
+# Each sync re-reads this far behind its watermark: a slow transaction can commit
+# rows whose updated_at predates ones already indexed.
+SYNC_OVERLAP = timedelta(minutes=1)
+
+SNAPSHOT_VERSION = 1
+
+# BM25 parameters and the tf boost applied to title tokens (a cheap BM25F).
+K1 = 1.2
+B = 0.75
+TITLE_BOOST = 3
+
+# Upper bound on dictionary terms a single query word may expand to. Short
+# prefixes keep the word itself and its most common completions (by document
+# frequency); rarer completions are not searched.
+MAX_PREFIX_EXPANSIONS = 64
+
+_WORD = re.compile(r"\w+", re.UNICODE)
+
+
+def fold(text: str) -> str:
+    """Lowercase and strip diacritics (``Élection`` -> ``election``)."""
+
+    decomposed = unicodedata.normalize("NFKD", text.casefold())
+    return "".join(char for char in decomposed if not unicodedata.combining(char))
+
+
+def tokenize(text: str | None) -> list[str]:
+    return _WORD.findall(fold(text or ""))
+
+
+class LocalSearchIndex:
+    def __init__(self) -> None:
+        self._terms: dict[str, tuple[Sequence[int], Sequence[int]]] = {}
+        self._sorted_terms: list[str] = []
+        self._doc_ids = array("I")
+        self._doc_lengths = array("I")
+        self._titles: list[str] = []
+        self._ordinals: dict[int, int] = {}
+        self._dead: set[int] = set()
+        self._total_length = 0
+        self._maps: list[mmap.mmap] = []
+        # Newest ``updated_at`` seen by :func:`sync_from_db`, and the documents
+        # applied within :data:`SYNC_OVERLAP` of it (skipped when re-read unchanged).
+        self.watermark: datetime | None = None
+        self.recent: dict[int, datetime] = {}
+
+    def __len__(self) -> int:
+        return len(self._ordinals)
+
+    def __contains__(self, doc_id: int) -> bool:
+        return doc_id in self._ordinals
+
+    # -- writes -----------------------------------------------------------
+
+    def add(self, doc_id: int, title: str, body: str | None = None) -> None:
+        """Index (or re-index) one document."""
+
+        self.remove(doc_id)
+        frequencies: dict[str, int] = {}
+        for term in tokenize(title):
+            frequencies[term] = frequencies.get(term, 0) + TITLE_BOOST
+        for term in tokenize(body):
+            frequencies[term] = frequencies.get(term, 0) + 1
+
+        ordinal = len(self._doc_ids)
+        length = sum(frequencies.values())
+        self._doc_ids.append(doc_id)
+        self._doc_lengths.append(length)
+        self._titles.append(title)
+        self._ordinals[doc_id] = ordinal
+        self._total_length += length
+        for term, frequency in frequencies.items():
+            docs, freqs = self._mutable_postings(term)
+            docs.append(ordinal)
+            freqs.append(frequency)
+
+        if len(self._dead) > max(1024, len(self._ordinals)):
+            self.compact()
+
+    def remove(self, doc_id: int) -> None:
+        ordinal = self._ordinals.pop(doc_id, None)
+        if ordinal is not None:
+            self._dead.add(ordinal)
+            self._total_length -= self._doc_lengths[ordinal]
+
+    def compact(self) -> None:
+        """Drop tombstoned ordinals and renumber the survivors densely."""
+
+        if not self._dead:
+            return
+        remap: dict[int, int] = {}
+        doc_ids, doc_lengths, titles = array("I"), array("I"), []
+        for ordinal, doc_id in enumerate(self._doc_ids):
+            if ordinal in self._dead:
+                continue
+            remap[ordinal] = len(doc_ids)
+            doc_ids.append(doc_id)
+            doc_lengths.append(self._doc_lengths[ordinal])
+            titles.append(self._titles[ordinal])
+
+        terms: dict[str, tuple[Sequence[int], Sequence[int]]] = {}
+        for term, (docs, freqs) in self._terms.items():
+            new_docs, new_freqs = array("I"), array("I")
+            for ordinal, frequency in zip(docs, freqs):
+                target = remap.get(ordinal)
+                if target is not None:
+                    new_docs.append(target)
+                    new_freqs.append(frequency)
+            if new_docs:
+                terms[term] = (new_docs, new_freqs)
+
+        self._terms = terms
+        self._sorted_terms = sorted(terms)
+        self._doc_ids, self._doc_lengths, self._titles = doc_ids, doc_lengths, titles
+        self._ordinals = {doc_id: ordinal for ordinal, doc_id in enumerate(doc_ids)}
+        self._dead = set()
+        self._release_maps()
+
+    def _mutable_postings(self, term: str) -> tuple[array, array]:
+        postings = self._terms.get(term)
+        if postings is None:
+            postings = (array("I"), array("I"))
+            self._terms[term] = postings
+            bisect.insort(self._sorted_terms, term)
+        elif not isinstance(postings[0], array):
+            # First write since the snapshot was mapped: copy out of the mmap.
+            postings = (array("I", postings[0]), array("I", postings[1]))
+            self._terms[term] = postings
+        return postings
+
+    # -- reads ------------------------------------------------------------
+
+    def _expand(self, word: str) -> list[str]:
+        position = bisect.bisect_left(self._sorted_terms, word)
+        matches = []
+        while position < len(self._sorted_terms) and self._sorted_terms[position].startswith(word):
+            matches.append(self._sorted_terms[position])
+            position += 1
+        if len(matches) > MAX_PREFIX_EXPANSIONS:
+            matches = heapq.nlargest(
+                MAX_PREFIX_EXPANSIONS, matches, key=lambda term: (term == word, len(self._terms[term][0]))
+            )
+        return matches
+
+    def search(self, query: str, *, limit: int = 20, offset: int = 0) -> list[dict[str, Any]]:
+        """BM25-ranked hits; every query word must match a term it prefixes."""
+
+        words = list(dict.fromkeys(tokenize(query)))
+        live = len(self._ordinals)
+        if not words or not live:
+            return []
+        average_length = self._total_length / live
+
+        scores: dict[int, float] | None = None
+        for word in words:
+            word_scores: dict[int, float] = {}
+            for term in self._expand(word):
+                docs, freqs = self._terms[term]
+                # Document frequency includes tombstones until the next compaction.
+                frequency_in_docs = min(len(docs), live)
+                idf = math.log(1 + (live - frequency_in_docs + 0.5) / (frequency_in_docs + 0.5))
+                for ordinal, frequency in zip(docs, freqs):
+                    if ordinal in self._dead or (scores is not None and ordinal not in scores):
+                        continue
+                    norm = K1 * (1 - B + B * self._doc_lengths[ordinal] / average_length)
+                    score = idf * frequency * (K1 + 1) / (frequency + norm)
+                    if score > word_scores.get(ordinal, 0.0):
+                        word_scores[ordinal] = score
+            if scores is None:
+                scores = word_scores
+            else:
+                scores = {ordinal: scores[ordinal] + score for ordinal, score in word_scores.items()}
+            if not scores:
+                return []
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], self._doc_ids[item[0]]))
+        return [
+            {"id": self._doc_ids[ordinal], "title": self._titles[ordinal], "score": round(score, 6)}
+            for ordinal, score in ranked[offset : offset + limit]
+        ]
+
+    # -- snapshots --------------------------------------------------------
+
+    def save(self, path: str | os.PathLike[str]) -> None:
+        """Write a compacted snapshot to ``path`` (a directory), replacing any previous one."""
+
+        self.compact()
+        target = Path(path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        # Per-call staging names: workers sharing SEARCH_SNAPSHOT_PATH may save concurrently.
+        staging = Path(tempfile.mkdtemp(prefix=f".{target.name}.", dir=target.parent))
+        previous = staging.with_name(staging.name + ".old")
+        try:
+            self._write_snapshot(staging)
+            if target.exists():
+                target.rename(previous)
+            staging.rename(target)
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+            shutil.rmtree(previous, ignore_errors=True)
+
+    def _write_snapshot(self, staging: Path) -> None:
+        offsets, docs, freqs = array("I", [0]), array("I"), array("I")
+        for term in self._sorted_terms:
+            term_docs, term_freqs = self._terms[term]
+            docs.extend(term_docs)
+            freqs.extend(term_freqs)
+            offsets.append(len(docs))
+        for name, values in (
+            ("offsets", offsets),
+            ("docs", docs),
+            ("freqs", freqs),
+            ("doc_ids", self._doc_ids),
+            ("doc_lengths", self._doc_lengths),
+        ):
+            _write_u32(staging / f"{name}.u32", values)
+        (staging / "terms.txt").write_text("\n".join(self._sorted_terms), encoding="utf-8")
+        header = {
+            "version": SNAPSHOT_VERSION,
+            "titles": self._titles,
+            "watermark": self.watermark.isoformat() if self.watermark else None,
+        }
+        (staging / "index.json").write_text(json.dumps(header), encoding="utf-8")
+
+    def load(self, path: str | os.PathLike[str]) -> "LocalSearchIndex":
+        """Replace this index's contents with the snapshot at ``path``."""
+
+        source = Path(path)
+        header = json.loads((source / "index.json").read_text(encoding="utf-8"))
+        if header.get("version") != SNAPSHOT_VERSION:
+            raise ValueError(f"Unsupported search snapshot version: {header.get('version')!r}")
+
+        # Drop the views into a previously loaded snapshot so its maps can be closed.
+        self._terms = {}
+        self._release_maps()
+        self.__init__()
+        offsets = _read_u32(source / "offsets.u32")
+        docs = self._map_u32(source / "docs.u32")
+        freqs = self._map_u32(source / "freqs.u32")
+        terms_text = (source / "terms.txt").read_text(encoding="utf-8")
+        terms = terms_text.split("\n") if terms_text else []
+        for position, term in enumerate(terms):
+            start, end = offsets[position], offsets[position + 1]
+            self._terms[term] = (docs[start:end], freqs[start:end])
+        self._sorted_terms = terms
+        self._doc_ids = _read_u32(source / "doc_ids.u32")
+        self._doc_lengths = _read_u32(source / "doc_lengths.u32")
+        self._titles = header["titles"]
+        self._ordinals = {doc_id: ordinal for ordinal, doc_id in enumerate(self._doc_ids)}
+        self._total_length = sum(self._doc_lengths)
+        self.watermark = datetime.fromisoformat(header["watermark"]) if header["watermark"] else None
+        return self
+
+    def _map_u32(self, path: Path) -> memoryview:
+        if path.stat().st_size == 0:
+            return memoryview(array("I"))
+        with path.open("rb") as handle:
+            mapped = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        self._maps.append(mapped)
+        return memoryview(mapped).cast("I")
+
+    def _release_maps(self) -> None:
+        # Compaction or a reload has dropped every view into the snapshot.
+        for mapped in self._maps:
+            try:
+                mapped.close()
+            except BufferError:  # pragma: no cover - a caller still holds a view
+                pass
+        self._maps = []
+
+
+def _write_u32(path: Path, values: array) -> None:
+    if sys.byteorder != "little":  # pragma: no cover - snapshots are little-endian
+        values = array("I", values)
+        values.byteswap()
+    with path.open("wb") as handle:
+        values.tofile(handle)
+
+
+def _read_u32(path: Path) -> array:
+    values = array("I")
+    values.frombytes(path.read_bytes())
+    if sys.byteorder != "little":  # pragma: no cover
+        values.byteswap()
+    return values
+
+
+async def sync_from_db(index: LocalSearchIndex, session: AsyncSession, *, batch_size: int = 200) -> int:
+    """Index published content changed since ``index.watermark``; returns the number of documents touched.
+
+    The scan starts :data:`SYNC_OVERLAP` behind the watermark, because a
+    transaction can commit after rows with a later ``updated_at`` were read.
+
+    Bodies come from the latest ``ContentVersion`` (decoding delta chains), so
+    a cold start and a restart from a snapshot share the same code path.
+    """
+
+    from app.services.content import ContentService
+
+    service = ContentService(session)
+    touched = 0
+    last: tuple[datetime, int] | None = None
+    while True:
+        stmt = select(ContentItem.id, ContentItem.title, ContentItem.status, ContentItem.updated_at)
+        if index.watermark is not None:
+            stmt = stmt.where(ContentItem.updated_at > index.watermark - SYNC_OVERLAP)
+        if last is not None:
+            stmt = stmt.where(tuple_(ContentItem.updated_at, ContentItem.id) > tuple_(*last))
+        rows = (
+            await session.execute(stmt.order_by(ContentItem.updated_at, ContentItem.id).limit(batch_size))
+        ).all()
+        if not rows:
+            break
+        for row in rows:
+            if index.recent.get(row.id) == row.updated_at:
+                continue
+            if row.status == "published":
+                index.add(row.id, row.title, await service.latest_body(row.id))
+            else:
+                index.remove(row.id)
+            index.recent[row.id] = row.updated_at
+            touched += 1
+        last = (rows[-1].updated_at, rows[-1].id)
+    if last is not None:
+        index.watermark = max(last[0], index.watermark or last[0])
+        index.recent = prune_recent(index.recent, index.watermark)
+    return touched
+
+
+def prune_recent(recent: dict[int, datetime], watermark: datetime) -> dict[int, datetime]:
+    """Drop entries that fell out of the overlap window behind ``watermark``."""
+
+    floor = watermark - SYNC_OVERLAP
+    return {ref: updated_at for ref, updated_at in recent.items() if updated_at > floor}
+
+
+async def warm_up(
+    index: LocalSearchIndex,
+    session_factory: Callable[[], AsyncSession],
+    *,
+    snapshot_path: str | None = None,
+) -> int:
+    """Restore ``index`` from its snapshot (if any), then catch up with the database."""
+
+    if snapshot_path and Path(snapshot_path, "index.json").exists():
+        try:
+            index.load(snapshot_path)
+        except (OSError, ValueError, KeyError) as exc:
+            logger.warning("search.snapshot_unreadable", extra={"path": snapshot_path, "error": str(exc)})
+            index.__init__()
+    async with session_factory() as session:
+        touched = await sync_from_db(index, session)
+    logger.info("search.local_ready", extra={"documents": len(index), "synced": touched})
+    return touched
+
+
+class LocalIndexRefresher:
+    """Background task applying content changes to this process's index (every worker runs one)."""
+
+    def __init__(
+        self,
+        index: LocalSearchIndex,
+        *,
+        interval: float = settings.search_local_refresh_seconds,
+        session_factory: async_sessionmaker[AsyncSession] = AsyncSessionLocal,
+    ) -> None:
+        self.index = index
+        self.interval = interval
+        self.session_factory = session_factory
+        self._task: asyncio.Task | None = None
+
+    async def start(self) -> None:
+        if self._task is not None:
+            return
+        self._task = asyncio.create_task(self._run(), name="search-local-refresh")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def refresh(self) -> int:
+        async with self.session_factory() as session:
+            touched = await sync_from_db(self.index, session)
+        if touched:
+            logger.info("search.local_refreshed", extra={"documents": len(self.index), "synced": touched})
+        return touched
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.refresh()
+            except Exception:  # pragma: no cover - depends on database failures
+                logger.exception("search.local_refresh_failed")
+
+
+local_index = LocalSearchIndex()
+local_index_refresher = LocalIndexRefresher(local_index)
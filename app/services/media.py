@@ -18,9 +18,19 @@ class MediaService:
         stmt = select(MediaAsset).options(selectinload(MediaAsset.variants))
         return list((await self.session.scalars(stmt)).all())
 
+    def export_statement(self):
+        return select(MediaAsset).options(selectinload(MediaAsset.variants)).order_by(MediaAsset.id)
+
     async def get_asset(self, asset_id: int) -> MediaAsset | None:
         return await self.session.get(MediaAsset, asset_id, options=(selectinload(MediaAsset.variants),))
 
+    async def reload(self, asset: MediaAsset) -> MediaAsset:
+        """Re-read ``asset`` and its variants after a commit."""
+
+        return await self.session.get(
+            MediaAsset, asset.id, options=(selectinload(MediaAsset.variants),), populate_existing=True
+        )
+
     async def create_asset(
         self,
         *,
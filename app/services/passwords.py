@@ -0,0 +1,74 @@
+"""Password hashing off the event loop.
+
+pbkdf2 costs tens of milliseconds of CPU per call; run inline, a burst of
+logins stalls every other request on the worker. :class:`PasswordHasher`
+runs hashing and verification in a dedicated thread pool (``hashlib``
+releases the GIL while deriving keys, so threads run in parallel) and caps
+the number of calls running or queued: past ``max_pending`` it raises
+:class:`HasherBusy` immediately, which routes turn into a 503.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable
+
+from passlib.context import CryptContext
+
+from app.core.config import settings
+from app.core.security import pwd_context
+from app.middleware.metrics import PASSWORD_HASH_QUEUE, PASSWORD_HASH_REJECTED
+
+
+class HasherBusy(Exception):
+    """Raised when the hashing pool already has ``max_pending`` calls in flight."""
+
+
+class PasswordHasher:
+    def __init__(
+        self,
+        *,
+        context: CryptContext = pwd_context,
+        max_workers: int = settings.password_hash_max_workers,
+        max_pending: int = settings.password_hash_max_pending,
+    ) -> None:
+        self.context = context
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.pending = 0
+        self._executor: ThreadPoolExecutor | None = None
+
+    async def _run(self, func: Callable[..., Any], *args: Any) -> Any:
+        if self.pending >= self.max_pending:
+            PASSWORD_HASH_REJECTED.inc()
+            raise HasherBusy("password hashing is saturated")
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="password")
+        self.pending += 1
+        PASSWORD_HASH_QUEUE.set(self.pending)
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, partial(func, *args))
+        finally:
+            self.pending -= 1
+            PASSWORD_HASH_QUEUE.set(self.pending)
+
+    async def hash(self, password: str) -> str:
+        return await self._run(self.context.hash, password)
+
+    async def verify(self, password: str, hashed: str) -> bool:
+        return await self._run(self.context.verify, password, hashed)
+
+    async def verify_and_update(self, password: str, hashed: str) -> tuple[bool, str | None]:
+        """Verify ``password``; also return a fresh hash when ``hashed`` uses outdated parameters."""
+
+        return await self._run(self.context.verify_and_update, password, hashed)
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+password_hasher = PasswordHasher()
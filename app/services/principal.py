@@ -0,0 +1,152 @@
+"""Cached authorization principal for authenticated requests.
+
+Resolving a bearer token used to mean a ``users`` query plus two chained
+``selectinload`` round trips (roles, then permissions) on every protected
+call. The handful of fields authorization needs are kept as an immutable
+:class:`Principal` in a TTL/LRU cache keyed by user id, so a warm request
+does no database work at all. :class:`~app.services.auth.AuthService`
+invalidates entries once a change to a user, their roles or a role's
+permissions has committed; the TTL bounds staleness for writes made outside
+the service.
+
+With ``AUTH_TOKEN_CLAIMS`` enabled, access tokens carry the principal itself
+(:meth:`Principal.claims`) and only ``users.roles_version`` is looked up,
+through a cache whose TTL (``AUTH_CLAIMS_MAX_STALENESS_SECONDS``) bounds how
+long a token can outlive a role change or deactivation on another worker.
+"""
+
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from app.core.config import settings
+from app.models.user import Role, User
+from app.services.cache import CacheBackend, ReadThroughCache, create_cache_backend
+
+
+def _auth_cache_backend() -> CacheBackend | None:
+    return create_cache_backend(
+        settings.auth_cache_backend,
+        url=settings.auth_cache_url,
+        max_entries=settings.auth_cache_max_entries,
+        max_bytes=settings.auth_cache_max_bytes,
+    )
+
+
+# Sized separately from the content cache: one small entry per active user.
+principal_cache = ReadThroughCache("principal", _auth_cache_backend(), ttl=settings.auth_principal_cache_ttl_seconds)
+roles_version_cache = ReadThroughCache(
+    "roles_version", _auth_cache_backend(), ttl=settings.auth_claims_max_staleness_seconds
+)
+
+
+@dataclass(frozen=True, slots=True)
+class Principal:
+    id: int
+    is_active: bool
+    is_superuser: bool
+    roles: frozenset[str]
+    permissions: frozenset[str]
+    roles_version: int = 0
+
+    @classmethod
+    def from_user(cls, user: User) -> Principal:
+        return cls(
+            id=user.id,
+            is_active=user.is_active,
+            is_superuser=user.is_superuser,
+            roles=frozenset(role.name for role in user.roles),
+            permissions=frozenset(permission.code for role in user.roles for permission in role.permissions),
+            roles_version=user.roles_version,
+        )
+
+    def claims(self) -> dict[str, Any]:
+        """Authorization claims for a stateless access token."""
+
+        return {
+            "roles": sorted(self.roles),
+            "perms": sorted(self.permissions),
+            "su": self.is_superuser,
+            "act": self.is_active,
+            "rv": self.roles_version,
+        }
+
+    @classmethod
+    def from_claims(cls, payload: dict[str, Any]) -> Principal | None:
+        """Principal carried by a verified token, ``None`` for tokens without claims."""
+
+        if "rv" not in payload:
+            return None
+        return cls(
+            id=int(payload["sub"]),
+            is_active=bool(payload["act"]),
+            is_superuser=bool(payload["su"]),
+            roles=frozenset(payload["roles"]),
+            permissions=frozenset(payload["perms"]),
+            roles_version=int(payload["rv"]),
+        )
+
+    def has_any_role(self, roles: set[str]) -> bool:
+        return self.is_superuser or not roles.isdisjoint(self.roles)
+
+    def dumps(self) -> bytes:
+        return json.dumps(
+            [
+                self.id,
+                self.is_active,
+                self.is_superuser,
+                sorted(self.roles),
+                sorted(self.permissions),
+                self.roles_version,
+            ],
+            separators=(",", ":"),
+        ).encode()
+
+    @classmethod
+    def loads(cls, raw: bytes) -> Principal:
+        user_id, is_active, is_superuser, roles, permissions, roles_version = json.loads(raw)
+        return cls(user_id, is_active, is_superuser, frozenset(roles), frozenset(permissions), roles_version)
+
+
+async def load_principal(session: AsyncSession, user_id: int) -> Principal | None:
+    """Cached principal for ``user_id``; ``None`` when the user does not exist."""
+
+    key = str(user_id)
+    cached = await principal_cache.get(key)
+    if cached is not None:
+        return Principal.loads(cached)
+    stmt = select(User).options(selectinload(User.roles).selectinload(Role.permissions)).where(User.id == user_id)
+    user = await session.scalar(stmt)
+    if user is None:
+        return None
+    principal = Principal.from_user(user)
+    await principal_cache.set(key, principal.dumps())
+    return principal
+
+
+async def current_roles_version(session: AsyncSession, user_id: int) -> int | None:
+    """``users.roles_version`` (cached for the staleness window); ``None`` when the user is gone."""
+
+    key = str(user_id)
+    cached = await roles_version_cache.get(key)
+    if cached is not None:
+        return int(cached)
+    version = await session.scalar(select(User.roles_version).where(User.id == user_id))
+    if version is None:
+        return None
+    await roles_version_cache.set(key, str(version).encode())
+    return version
+
+
+async def invalidate_principals(*user_ids: int) -> None:
+    await principal_cache.invalidate(*(str(user_id) for user_id in user_ids))
+
+
+async def invalidate_roles_versions(*user_ids: int) -> None:
+    await roles_version_cache.invalidate(*(str(user_id) for user_id in user_ids))
@@ -0,0 +1,245 @@
+"""Refresh token rotation and revocation.
+
+Every refresh token is a ``refresh_tokens`` row keyed by its ``jti``. A login
+starts a *family* (its id is the first token's ``jti``); each
+``/auth/refresh`` marks the presented token used and issues the next one in
+the same family. Presenting an already-used token means it leaked, so the
+whole family is revoked. Access tokens carry their family id (``fam``), and
+:data:`revoked_families` — a plain dict of revoked family ids, patched
+locally on revocation and caught up from ``revoked_at`` by
+:class:`RevocationRefresher` — lets every authenticated request check
+revocation with one hash lookup. Expired rows and entries are compacted
+periodically.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.core.security import create_refresh_token, decode_refresh_token
+from app.db.session import AsyncSessionLocal
+from app.models.user import RefreshToken
+
+logger = logging.getLogger("app.auth.refresh_tokens")
+
+# Re-read revocations this far behind the watermark: commits can land after a later revoked_at.
+REVOCATION_OVERLAP = timedelta(minutes=1)
+
+
+class InvalidRefreshToken(Exception):
+    """Raised for unknown, expired, revoked or reused refresh tokens."""
+
+
+class RevokedFamilies:
+    """Revoked family ids mapped to the expiry of their last token."""
+
+    def __init__(self) -> None:
+        self._expires: dict[str, datetime] = {}
+        self.watermark: datetime | None = None
+
+    def __contains__(self, family_id: object) -> bool:
+        return family_id in self._expires
+
+    def __len__(self) -> int:
+        return len(self._expires)
+
+    def add(self, family_id: str, expires_at: datetime) -> None:
+        current = self._expires.get(family_id)
+        if current is None or expires_at > current:
+            self._expires[family_id] = expires_at
+
+    def prune(self, now: datetime) -> int:
+        """Forget families whose tokens have all expired anyway."""
+
+        expired = [family_id for family_id, expires_at in self._expires.items() if expires_at <= now]
+        for family_id in expired:
+            del self._expires[family_id]
+        return len(expired)
+
+    async def refresh(self, session: AsyncSession) -> int:
+        """Load families revoked since :attr:`watermark` (by any worker)."""
+
+        stmt = select(
+            RefreshToken.family_id, func.max(RefreshToken.expires_at), func.max(RefreshToken.revoked_at)
+        ).where(RefreshToken.revoked_at.is_not(None), RefreshToken.expires_at > datetime.utcnow())
+        if self.watermark is not None:
+            stmt = stmt.where(RefreshToken.revoked_at > self.watermark - REVOCATION_OVERLAP)
+        rows = (await session.execute(stmt.group_by(RefreshToken.family_id))).all()
+        for family_id, expires_at, revoked_at in rows:
+            self.add(family_id, expires_at)
+            if self.watermark is None or revoked_at > self.watermark:
+                self.watermark = revoked_at
+        return len(rows)
+
+
+class RefreshTokenStore:
+    def __init__(self, session: AsyncSession, *, revoked: RevokedFamilies | None = None) -> None:
+        self.session = session
+        self.revoked = revoked if revoked is not None else revoked_families
+
+    async def issue(self, user_id: int, *, family_id: str | None = None) -> tuple[str, str]:
+        """Store and encode a new refresh token; returns ``(token, jti)``.
+
+        Without ``family_id`` the token starts a new family named after its ``jti``.
+        """
+
+        jti = uuid4().hex
+        family_id = family_id or jti
+        self.session.add(
+            RefreshToken(
+                jti=jti,
+                family_id=family_id,
+                user_id=user_id,
+                expires_at=datetime.utcnow() + timedelta(minutes=settings.refresh_token_expire_minutes),
+            )
+        )
+        await self.session.flush()
+        return create_refresh_token(str(user_id), jti=jti, family=family_id), jti
+
+    async def rotate(self, token: str) -> tuple[int, str, str]:
+        """Consume ``token`` and issue its successor; returns ``(user_id, new_token, family_id)``.
+
+        Reuse of a consumed token revokes its family; the caller must commit
+        even when :class:`InvalidRefreshToken` is raised.
+        """
+
+        payload = decode_refresh_token(token)
+        if payload is None:
+            raise InvalidRefreshToken("Invalid refresh token")
+        jti = payload["jti"]
+        family_id = payload.get("fam") or jti
+        if family_id in self.revoked:
+            raise InvalidRefreshToken("Refresh token revoked")
+        now = datetime.utcnow()
+        # Conditional update: of two concurrent rotations of the same token only one wins.
+        claimed = await self.session.execute(
+            update(RefreshToken)
+            .where(
+                RefreshToken.jti == jti,
+                RefreshToken.used_at.is_(None),
+                RefreshToken.revoked_at.is_(None),
+                RefreshToken.expires_at > now,
+            )
+            .values(used_at=now)
+        )
+        if claimed.rowcount != 1:
+            row = await self.session.get(RefreshToken, jti)
+            if row is not None and row.used_at is not None and row.revoked_at is None:
+                await self.revoke_family(row.family_id)
+                logger.warning("auth.refresh_token_reused", extra={"user_id": row.user_id, "family": row.family_id})
+                raise InvalidRefreshToken("Refresh token reuse detected")
+            raise InvalidRefreshToken("Invalid refresh token")
+        user_id = int(payload["sub"])
+        new_token, new_jti = await self.issue(user_id, family_id=family_id)
+        await self.session.execute(update(RefreshToken).where(RefreshToken.jti == jti).values(replaced_by=new_jti))
+        return user_id, new_token, family_id
+
+    async def revoke_family(self, family_id: str) -> None:
+        now = datetime.utcnow()
+        await self.session.execute(
+            update(RefreshToken)
+            .where(RefreshToken.family_id == family_id, RefreshToken.revoked_at.is_(None))
+            .values(revoked_at=now)
+        )
+        expires_at = await self.session.scalar(
+            select(func.max(RefreshToken.expires_at)).where(RefreshToken.family_id == family_id)
+        )
+        self.revoked.add(family_id, expires_at or now + timedelta(minutes=settings.refresh_token_expire_minutes))
+
+    async def revoke_user(self, user_id: int) -> int:
+        """Revoke every live family of ``user_id``; returns how many families were revoked."""
+
+        now = datetime.utcnow()
+        rows = (
+            await self.session.execute(
+                update(RefreshToken)
+                .where(
+                    RefreshToken.user_id == user_id,
+                    RefreshToken.revoked_at.is_(None),
+                    RefreshToken.expires_at > now,
+                )
+                .values(revoked_at=now)
+                .returning(RefreshToken.family_id, RefreshToken.expires_at)
+            )
+        ).all()
+        for family_id, expires_at in rows:
+            self.revoked.add(family_id, expires_at)
+        return len({family_id for family_id, _ in rows})
+
+    async def compact(self) -> int:
+        """Delete expired tokens; returns how many rows were removed."""
+
+        now = datetime.utcnow()
+        result = await self.session.execute(delete(RefreshToken).where(RefreshToken.expires_at <= now))
+        self.revoked.prune(now)
+        return result.rowcount or 0
+
+
+class RevocationRefresher:
+    """Background task syncing :data:`revoked_families` and compacting expired tokens."""
+
+    def __init__(
+        self,
+        revoked: RevokedFamilies,
+        *,
+        interval: float = settings.auth_revocation_refresh_seconds,
+        compact_interval: float = settings.auth_refresh_token_compact_seconds,
+        session_factory: async_sessionmaker[AsyncSession] = AsyncSessionLocal,
+    ) -> None:
+        self.revoked = revoked
+        self.interval = interval
+        self.compact_interval = compact_interval
+        self.session_factory = session_factory
+        self._task: asyncio.Task | None = None
+        self._last_compaction = 0.0
+
+    async def start(self) -> None:
+        if self._task is not None:
+            return
+        await self.refresh()
+        self._task = asyncio.create_task(self._run(), name="refresh-token-revocations")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def refresh(self) -> None:
+        async with self.session_factory() as session:
+            await self.revoked.refresh(session)
+
+    async def compact(self) -> int:
+        async with self.session_factory() as session:
+            removed = await RefreshTokenStore(session, revoked=self.revoked).compact()
+            await session.commit()
+        if removed:
+            logger.info("auth.refresh_tokens_compacted", extra={"rows": removed})
+        return removed
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.refresh()
+                if loop.time() - self._last_compaction >= self.compact_interval:
+                    self._last_compaction = loop.time()
+                    await self.compact()
+            except Exception:  # pragma: no cover - depends on database failures
+                logger.exception("auth.revocation_refresh_failed")
+
+
+revoked_families = RevokedFamilies()
+revocation_refresher = RevocationRefresher(revoked_families)
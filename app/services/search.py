@@ -1,6 +1,20 @@
+"""External search engine access.
+
+The meilisearch and elasticsearch SDKs are synchronous, so every call runs in
+a small dedicated thread pool (``SEARCH_MAX_WORKERS``) under a per-call
+timeout (``SEARCH_TIMEOUT_SECONDS``) instead of blocking the event loop. One
+long-lived :data:`search_service` keeps the client, and its connection pool,
+for the whole process. The ``local`` provider is in-process and called
+directly.
+"""
+
 from __future__ import annotations
 
-from typing import Any, Iterable
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Iterable
 
 try:
     from meilisearch import Client as MeiliClient
@@ -13,50 +27,165 @@ except ImportError:  # pragma: no cover - optional dependency
     Elasticsearch = None  # type: ignore
 
 from app.core.config import settings
+from app.services.local_search import local_index
+
+logger = logging.getLogger("app.search")
+
+# Snippet length (words) and the tags engines wrap matched terms in.
+SNIPPET_WORDS = 24
+HIGHLIGHT_TAGS = ("<mark>", "</mark>")
 
 
 class SearchService:
-    def __init__(self) -> None:
+    def __init__(self, *, timeout: float | None = None, max_workers: int | None = None) -> None:
         self.provider = settings.search_provider
+        self.timeout = timeout if timeout is not None else settings.search_timeout_seconds
+        self.max_workers = max_workers or settings.search_max_workers
         self.client = self._create_client()
+        self._executor: ThreadPoolExecutor | None = None
 
     def _create_client(self) -> Any:
         if self.provider == "meilisearch" and settings.search_url and MeiliClient:
-            return MeiliClient(settings.search_url, settings.search_api_key)
+            return MeiliClient(settings.search_url, settings.search_api_key, timeout=self.timeout)
         if self.provider == "elasticsearch" and settings.search_url and Elasticsearch:
-            return Elasticsearch(settings.search_url, api_key=settings.search_api_key)
+            return Elasticsearch(
+                settings.search_url, api_key=settings.search_api_key, request_timeout=self.timeout
+            )
+        if self.provider == "local":
+            return local_index
         return None
 
-    async def index_article(self, article: dict[str, Any]) -> None:
-        if not self.client:
-            return
+    async def _call(self, func: Callable[..., Any], *args: Any) -> Any:
+        """Run a blocking client call off the event loop, bounded by :attr:`timeout`.
+
+        The timeout covers time spent waiting for a free worker, so a saturated
+        pool fails fast instead of queueing requests behind a slow engine.
+        """
+
+        if self.provider == "local":
+            return func(*args)
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="search")
+        loop = asyncio.get_running_loop()
+        return await asyncio.wait_for(loop.run_in_executor(self._executor, partial(func, *args)), self.timeout)
+
+    def _index_sync(self, articles: list[dict[str, Any]]) -> None:
         if self.provider == "meilisearch":
-            self.client.index("articles").add_documents([article])
+            self.client.index("articles").add_documents(articles)
         elif self.provider == "elasticsearch":
-            self.client.index(index="articles", id=article["id"], document=article)
+            operations: list[dict[str, Any]] = []
+            for article in articles:
+                operations.append({"index": {"_index": "articles", "_id": article["id"]}})
+                operations.append(article)
+            result = self.client.bulk(operations=operations)
+            if result.get("errors"):
+                raise RuntimeError("elasticsearch bulk indexing reported errors")
+        elif self.provider == "local":
+            for article in articles:
+                self.client.add(int(article["id"]), article.get("title") or "", article.get("body"))
 
-    async def search_articles(self, query: str) -> list[dict[str, Any]]:
-        if not self.client:
-            return []
+    def _search_sync(self, query: str, limit: int, offset: int) -> list[dict[str, Any]]:
         if self.provider == "meilisearch":
-            results = self.client.index("articles").search(query)
-            return results.get("hits", [])
+            results = self.client.index("articles").search(
+                query,
+                {
+                    "limit": limit,
+                    "offset": offset,
+                    # ``_formatted`` only carries retrieved attributes, so the cropped body needs "body" here.
+                    "attributesToRetrieve": ["id", "body"],
+                    "attributesToCrop": ["body"],
+                    "cropLength": SNIPPET_WORDS,
+                    "attributesToHighlight": ["body"],
+                    "highlightPreTag": HIGHLIGHT_TAGS[0],
+                    "highlightPostTag": HIGHLIGHT_TAGS[1],
+                },
+            )
+            return [
+                {"id": hit.get("id"), "snippet": (hit.get("_formatted") or {}).get("body") or None}
+                for hit in results.get("hits", [])
+            ]
         if self.provider == "elasticsearch":
-            results = self.client.search(index="articles", body={"query": {"multi_match": {"query": query}}})
-            hits = results.get("hits", {}).get("hits", [])
-            return [hit.get("_source", {}) for hit in hits]
+            results = self.client.search(
+                index="articles",
+                body={
+                    "query": {"multi_match": {"query": query, "fields": ["title^3", "body"]}},
+                    "from": offset,
+                    "size": limit,
+                    "_source": ["id"],
+                    "highlight": {
+                        "pre_tags": [HIGHLIGHT_TAGS[0]],
+                        "post_tags": [HIGHLIGHT_TAGS[1]],
+                        "fields": {"body": {"fragment_size": SNIPPET_WORDS * 6, "number_of_fragments": 1}},
+                    },
+                },
+            )
+            return [
+                {
+                    "id": hit.get("_source", {}).get("id"),
+                    "snippet": (hit.get("highlight", {}).get("body") or [None])[0],
+                }
+                for hit in results.get("hits", {}).get("hits", [])
+            ]
+        if self.provider == "local":
+            return [{"id": hit["id"], "snippet": None} for hit in self.client.search(query, limit=limit, offset=offset)]
         return []
 
-    async def remove_articles(self, ids: Iterable[int]) -> None:
-        if not self.client:
-            return
-        ids_list = list(ids)
+    def _remove_sync(self, ids: list[int]) -> None:
         if self.provider == "meilisearch":
-            self.client.index("articles").delete_documents(ids_list)
+            self.client.index("articles").delete_documents(ids)
         elif self.provider == "elasticsearch":
-            for doc_id in ids_list:
+            for doc_id in ids:
                 self.client.delete(index="articles", id=doc_id, ignore=[404])
+        elif self.provider == "local":
+            for doc_id in ids:
+                self.client.remove(int(doc_id))
+
+    async def index_article(self, article: dict[str, Any]) -> None:
+        await self.index_articles([article])
+
+    async def index_articles(self, articles: list[dict[str, Any]]) -> None:
+        """Upsert many documents in one engine request."""
+
+        if self.client is None or not articles:
+            return
+        await self._call(self._index_sync, articles)
+
+    async def search_articles(
+        self, query: str, *, limit: int = 20, offset: int = 0
+    ) -> list[dict[str, Any]] | None:
+        """Return one page of ``{"id", "snippet"}`` hits in relevance order.
+
+        ``None`` (as opposed to an empty page) means no engine is configured or
+        it failed or timed out, and the caller should fall back.
+        """
+
+        if self.client is None:
+            return None
+        try:
+            return await self._call(self._search_sync, query, limit, offset)
+        except Exception as exc:
+            logger.warning(
+                "search.engine_unavailable",
+                extra={"provider": self.provider, "error": repr(exc)},
+            )
+            return None
+
+    async def remove_articles(self, ids: Iterable[int]) -> None:
+        ids_list = list(ids)
+        if self.client is None or not ids_list:
+            return
+        await self._call(self._remove_sync, ids_list)
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        if self.provider == "elasticsearch" and self.client is not None:
+            self.client.close()
+
+
+search_service = SearchService()
 
 
 def get_search_service() -> SearchService:
-    return SearchService()
+    return search_service
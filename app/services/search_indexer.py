@@ -0,0 +1,221 @@
+"""Propagate content changes to the search engine through ``search_outbox``.
+
+:class:`~app.services.content.ContentService` writes an outbox row in the same
+transaction as each create/update/publish. :class:`SearchIndexer` drains the
+table in batches: rows for the same content id are coalesced into a single
+document, published items are upserted in one bulk request and everything
+else is removed. A failed batch stays in the table with an exponential
+backoff, so nothing is lost while the engine is down.
+
+A batch is claimed by pushing its ``available_at`` past a lease and
+committing, so no transaction or row lock is held during the engine request;
+the rows are deleted (or rescheduled) in a second transaction. A worker that
+dies mid-batch leaves its rows to be picked up again once the lease expires.
+
+``SEARCH_PROVIDER=local`` does not use the outbox: each worker refreshes its
+own in-process index (see :class:`~app.services.local_search.LocalIndexRefresher`).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Any
+
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal
+from app.middleware.metrics import SEARCH_OUTBOX
+from app.models.content import ContentItem
+from app.models.search import SearchOutbox
+from app.services.content import ContentService
+from app.services.search import SearchService, search_service
+
+logger = logging.getLogger("app.search.indexer")
+
+
+def search_document(item: ContentItem, body: str | None) -> dict[str, Any]:
+    return {
+        "id": item.id,
+        "title": item.title,
+        "slug": item.slug,
+        "type": item.type,
+        "body": body or "",
+        "published_at": item.published_at.isoformat() if item.published_at else None,
+    }
+
+
+async def build_documents(session: AsyncSession, items: list[ContentItem]) -> list[dict[str, Any]]:
+    service = ContentService(session)
+    return [search_document(item, await service.latest_body(item.id)) for item in items]
+
+
+class SearchIndexer:
+    def __init__(
+        self,
+        *,
+        search: SearchService = search_service,
+        batch_size: int = settings.search_outbox_batch_size,
+        interval: float = settings.search_outbox_interval_seconds,
+        max_backoff: int = settings.search_outbox_max_backoff_seconds,
+        lease: int = settings.search_outbox_lease_seconds,
+        session_factory: async_sessionmaker[AsyncSession] = AsyncSessionLocal,
+    ) -> None:
+        self.search = search
+        self.batch_size = batch_size
+        self.interval = interval
+        self.max_backoff = max_backoff
+        self.lease = timedelta(seconds=lease)
+        self.session_factory = session_factory
+        self._wakeup: asyncio.Event | None = None
+        self._task: asyncio.Task | None = None
+        self._stopping = False
+
+    def backoff(self, attempts: int) -> timedelta:
+        return timedelta(seconds=min(self.max_backoff, 2**attempts))
+
+    async def drain_once(self) -> int:
+        """Process one batch of due outbox rows; returns how many rows were handled."""
+
+        async with self.session_factory() as session:
+            now = datetime.utcnow()
+            stmt = (
+                select(SearchOutbox)
+                .where(SearchOutbox.available_at <= now)
+                .order_by(SearchOutbox.id)
+                .limit(self.batch_size)
+                .with_for_update(skip_locked=True)
+            )
+            rows = list((await session.scalars(stmt)).all())
+            if not rows:
+                return 0
+            for row in rows:
+                row.available_at = now + self.lease
+            content_ids = sorted({row.content_id for row in rows})
+            # Older rows for the same ids (including ones still backing off) are covered by this batch.
+            covered = list(
+                (
+                    await session.scalars(
+                        select(SearchOutbox.id).where(
+                            SearchOutbox.content_id.in_(content_ids), SearchOutbox.id <= rows[-1].id
+                        )
+                    )
+                ).all()
+            )
+            items = list(
+                (
+                    await session.scalars(
+                        select(ContentItem).where(
+                            ContentItem.id.in_(content_ids), ContentItem.status == "published"
+                        )
+                    )
+                ).all()
+            )
+            documents = await build_documents(session, items)
+            await session.commit()
+        row_ids = [row.id for row in rows]
+        removed = sorted(set(content_ids) - {item.id for item in items})
+        try:
+            await self.search.index_articles(documents)
+            await self.search.remove_articles(removed)
+        except Exception as exc:
+            async with self.session_factory() as session:
+                claimed = list((await session.scalars(select(SearchOutbox).where(SearchOutbox.id.in_(row_ids)))).all())
+                for row in claimed:
+                    row.attempts += 1
+                    row.available_at = datetime.utcnow() + self.backoff(row.attempts)
+                    row.last_error = repr(exc)[:1000]
+                await session.commit()
+            SEARCH_OUTBOX.labels("failed").inc(len(content_ids))
+            logger.warning(
+                "search.outbox_failed",
+                extra={
+                    "documents": len(content_ids),
+                    "attempts": max((row.attempts for row in claimed), default=0),
+                    "error": repr(exc),
+                },
+            )
+            return len(rows)
+
+        async with self.session_factory() as session:
+            await session.execute(delete(SearchOutbox).where(SearchOutbox.id.in_(covered)))
+            await session.commit()
+        SEARCH_OUTBOX.labels("indexed").inc(len(documents))
+        SEARCH_OUTBOX.labels("removed").inc(len(removed))
+        return len(rows)
+
+    async def drain(self) -> int:
+        """Process due rows until none are left."""
+
+        total = 0
+        while processed := await self.drain_once():
+            total += processed
+        return total
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._stopping
+
+    async def start(self) -> None:
+        if self._task is not None:
+            return
+        self._wakeup = asyncio.Event()
+        self._stopping = False
+        self._task = asyncio.create_task(self._run(), name="search-indexer")
+
+    async def stop(self) -> None:
+        """Stop polling; undrained rows stay in the outbox for the next run."""
+
+        if self._task is None:
+            return
+        self._stopping = True
+        self._wakeup.set()
+        await self._task
+        self._task = None
+
+    async def _run(self) -> None:
+        while not self._stopping:
+            try:
+                await self.drain()
+            except Exception:  # pragma: no cover - depends on database failures
+                logger.exception("search.outbox_drain_failed")
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+
+async def reindex(
+    *,
+    search: SearchService = search_service,
+    chunk_size: int = settings.search_reindex_chunk_size,
+    session_factory: async_sessionmaker[AsyncSession] = AsyncSessionLocal,
+) -> int:
+    """Push every published item to the engine, ``chunk_size`` documents per request."""
+
+    last_id = 0
+    total = 0
+    while True:
+        async with session_factory() as session:
+            stmt = (
+                select(ContentItem)
+                .where(ContentItem.status == "published", ContentItem.id > last_id)
+                .order_by(ContentItem.id)
+                .limit(chunk_size)
+            )
+            items = list((await session.scalars(stmt)).all())
+            if not items:
+                break
+            documents = await build_documents(session, items)
+        await search.index_articles(documents)
+        total += len(documents)
+        last_id = items[-1].id
+        logger.info("search.reindexed", extra={"documents": total, "last_content_id": last_id})
+    return total
+
+
+search_indexer = SearchIndexer()
@@ -1,13 +1,84 @@
 from __future__ import annotations
 
-from sqlalchemy import select
+import json
+from typing import Callable
+from xml.sax.saxutils import escape
+
+from sqlalchemy import func, select
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from fastapi import Depends
 
+from app.core.config import settings
+from app.core.http_cache import as_utc
+from app.core.serialization import dump_json
 from app.db.session import get_session
 from app.models.content import ContentItem
 from app.models.seo import SEOMetadata
+from app.schemas.seo import SitemapEntry
+from app.services.cache import ReadThroughCache, RedisCache, create_cache_backend
+
+# Sitemap shards cover fixed content id ranges, so a change to one item only
+# touches the shard ``content_id // SITEMAP_SHARD_SIZE`` (and the shard list).
+SITEMAP_SHARD_SIZE = settings.sitemap_shard_size
+
+_RECALCULATED_FIELDS = ("meta_title", "meta_description", "canonical_url")
+# Each upserted row binds content_id and the recalculated fields; SQLite before
+# 3.32 rejects statements with more than 999 parameters.
+_UPSERT_CHUNK = 999 // (1 + len(_RECALCULATED_FIELDS))
+
+_sitemap_backend = create_cache_backend()
+# invalidate_sitemap() only reaches this worker's memory cache; without a shared
+# backend the other workers' copies have to expire quickly instead.
+sitemap_cache = ReadThroughCache(
+    "sitemap",
+    _sitemap_backend,
+    ttl=(
+        settings.sitemap_cache_ttl_seconds
+        if isinstance(_sitemap_backend, RedisCache)
+        else settings.sitemap_local_cache_ttl_seconds
+    ),
+)
+
+
+def sitemap_shard(content_id: int) -> int:
+    return content_id // SITEMAP_SHARD_SIZE
+
+
+def _cache_key(name: str) -> str:
+    # Keyed by shard size so a configuration change never serves another layout's shards.
+    return f"{SITEMAP_SHARD_SIZE}:{name}"
+
+
+async def invalidate_sitemap(content_id: int) -> None:
+    shard = sitemap_shard(content_id)
+    await sitemap_cache.invalidate(_cache_key("shards"), _cache_key(f"{shard}.json"), _cache_key(f"{shard}.xml"))
+
+
+SITEMAP_NS = "http://www.sitemaps.org/schemas/sitemap/0.9"
+
+
+def render_urlset(entries: list[dict[str, str | None]]) -> bytes:
+    lines = ['<?xml version="1.0" encoding="UTF-8"?>', f'<urlset xmlns="{SITEMAP_NS}">']
+    for entry in entries:
+        lines.append(f"<url><loc>{escape(settings.public_site_url)}/article/{escape(entry['slug'])}</loc>")
+        if entry["last_modified"]:
+            lines.append(f"<lastmod>{entry['last_modified']}</lastmod>")
+        lines.append("</url>")
+    lines.append("</urlset>")
+    return "\n".join(lines).encode()
+
+
+def render_sitemap_index(shards: list[dict], shard_url: Callable[[int], str]) -> bytes:
+    lines = ['<?xml version="1.0" encoding="UTF-8"?>', f'<sitemapindex xmlns="{SITEMAP_NS}">']
+    for shard in shards:
+        lines.append(f"<sitemap><loc>{escape(shard_url(shard['shard']))}</loc>")
+        if shard["last_modified"]:
+            lines.append(f"<lastmod>{shard['last_modified']}</lastmod>")
+        lines.append("</sitemap>")
+    lines.append("</sitemapindex>")
+    return "\n".join(lines).encode()
 
 
 class SEOService:
@@ -17,31 +88,114 @@ class SEOService:
     async def get_metadata(self, content_id: int) -> SEOMetadata | None:
         return await self.session.scalar(select(SEOMetadata).where(SEOMetadata.content_id == content_id))
 
-    async def generate_sitemap(self) -> list[dict[str, str | None]]:
-        stmt = select(ContentItem).where(ContentItem.status == "published")
-        items = (await self.session.scalars(stmt)).all()
-        sitemap: list[dict[str, str | None]] = []
-        for item in items:
-            sitemap.append(
-                {
-                    "slug": item.slug,
-                    "type": item.type,
-                    "last_modified": item.updated_at.isoformat() if item.updated_at else None,
-                }
+    async def sitemap_shards(self) -> list[dict]:
+        """Non-empty shards as ``{"shard", "last_modified", "count"}``, cached until a publish touches one."""
+
+        cached = await sitemap_cache.get(_cache_key("shards"))
+        if cached is not None:
+            return json.loads(cached)
+        max_id = await self.session.scalar(select(func.max(ContentItem.id)))
+        shards = []
+        for shard in range(sitemap_shard(max_id) + 1 if max_id else 0):
+            stmt = select(func.max(ContentItem.updated_at), func.count(ContentItem.id)).where(
+                ContentItem.status == "published",
+                ContentItem.id >= shard * SITEMAP_SHARD_SIZE,
+                ContentItem.id < (shard + 1) * SITEMAP_SHARD_SIZE,
             )
-        return sitemap
+            last_modified, count = (await self.session.execute(stmt)).one()
+            if count:
+                shards.append(
+                    {"shard": shard, "last_modified": as_utc(last_modified).isoformat(), "count": count}
+                )
+        await sitemap_cache.set(_cache_key("shards"), json.dumps(shards).encode())
+        return shards
+
+    async def sitemap_entries(self, shard: int) -> list[dict[str, str | None]]:
+        stmt = (
+            select(ContentItem.slug, ContentItem.type, ContentItem.updated_at)
+            .where(
+                ContentItem.status == "published",
+                ContentItem.id >= shard * SITEMAP_SHARD_SIZE,
+                ContentItem.id < (shard + 1) * SITEMAP_SHARD_SIZE,
+            )
+            .order_by(ContentItem.id)
+        )
+        return [
+            {
+                "slug": row.slug,
+                "type": row.type,
+                "last_modified": as_utc(row.updated_at).isoformat() if row.updated_at else None,
+            }
+            for row in await self.session.execute(stmt)
+        ]
+
+    async def render_sitemap_shard(self, shard: int, format: str) -> bytes:
+        """Rendered ``json`` or ``xml`` body of one shard, from the cache when possible."""
+
+        cached = await sitemap_cache.get(_cache_key(f"{shard}.{format}"))
+        if cached is not None:
+            return cached
+        entries = await self.sitemap_entries(shard)
+        rendered = {"json": dump_json(list[SitemapEntry], entries), "xml": render_urlset(entries)}
+        for name, body in rendered.items():
+            await sitemap_cache.set(_cache_key(f"{shard}.{name}"), body)
+        return rendered[format]
+
+    @staticmethod
+    def metadata_values(*, title: str, slug: str, body: str | None) -> dict[str, str | None]:
+        return {
+            "meta_title": title[:255],
+            "meta_description": body[:255] if body is not None else None,
+            "canonical_url": f"/content/{slug}",
+        }
 
     async def recalculate_for_content(self, content: ContentItem) -> SEOMetadata:
         metadata = await self.get_metadata(content.id)
         if not metadata:
             metadata = SEOMetadata(content=content)
-        metadata.meta_title = content.title[:255]
-        metadata.meta_description = (content.versions[-1].body[:255] if content.versions else None)
-        metadata.canonical_url = f"/content/{content.slug}"
+        values = self.metadata_values(
+            title=content.title,
+            slug=content.slug,
+            body=content.latest_version.body if content.latest_version else None,
+        )
+        for field, value in values.items():
+            setattr(metadata, field, value)
         self.session.add(metadata)
         await self.session.flush()
         return metadata
 
+    async def recalculate_batch(self, *, after_id: int, limit: int) -> tuple[int, int | None]:
+        """Recompute metadata for the next ``limit`` items after ``after_id`` with one bulk upsert.
+
+        Returns ``(processed, last_id)``; ``last_id`` is ``None`` once the catalogue is exhausted.
+        """
+
+        from app.services.content import ContentService
+
+        stmt = (
+            select(ContentItem.id, ContentItem.title, ContentItem.slug)
+            .where(ContentItem.id > after_id)
+            .order_by(ContentItem.id)
+            .limit(limit)
+        )
+        items = (await self.session.execute(stmt)).all()
+        if not items:
+            return 0, None
+        bodies = await ContentService(self.session).latest_bodies([item.id for item in items])
+        rows = [
+            {"content_id": item.id, **self.metadata_values(title=item.title, slug=item.slug, body=bodies.get(item.id))}
+            for item in items
+        ]
+        dialect = postgresql if self.session.bind.dialect.name == "postgresql" else sqlite
+        for start in range(0, len(rows), _UPSERT_CHUNK):
+            insert_stmt = dialect.insert(SEOMetadata).values(rows[start : start + _UPSERT_CHUNK])
+            insert_stmt = insert_stmt.on_conflict_do_update(
+                index_elements=[SEOMetadata.content_id],
+                set_={field: insert_stmt.excluded[field] for field in _RECALCULATED_FIELDS},
+            )
+            await self.session.execute(insert_stmt)
+        return len(items), items[-1].id
+
 
 async def get_seo_service(session: AsyncSession = Depends(get_session)) -> SEOService:
     return SEOService(session)
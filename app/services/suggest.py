@@ -0,0 +1,210 @@
+"""Search-as-you-type over published titles and category names.
+
+Every label is indexed once per word position (``"election municipale"``,
+``"municipale"``) in one sorted list of ``(folded key, kind, id)`` tuples, so
+a lookup is a ``bisect`` plus a short forward scan and never touches the
+database. The list is loaded at startup, patched in place when content is
+published, renamed or unpublished in this process, and caught up periodically
+from ``updated_at`` so other workers converge too.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import bisect
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Iterable
+
+from sqlalchemy import select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal
+from app.models.content import ContentCategory, ContentItem
+from app.services.local_search import SYNC_OVERLAP, prune_recent, tokenize
+
+logger = logging.getLogger("app.search.suggest")
+
+# Keys inspected per lookup: bounds latency for very common prefixes.
+MAX_SCAN = 256
+
+
+@dataclass(frozen=True, slots=True)
+class Suggestion:
+    type: str
+    id: int
+    label: str
+    slug: str
+
+
+class SuggestIndex:
+    def __init__(self) -> None:
+        self._keys: list[tuple[str, str, int]] = []
+        self._entries: dict[tuple[str, int], tuple[Suggestion, tuple[str, ...]]] = {}
+        self.watermark: datetime | None = None
+        self.recent: dict[int, datetime] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def _suffixes(label: str) -> tuple[str, ...]:
+        words = tokenize(label)
+        return tuple(dict.fromkeys(" ".join(words[position:]) for position in range(len(words))))
+
+    def put(self, kind: str, ref: int, label: str, slug: str) -> None:
+        self.discard(kind, ref)
+        keys = self._suffixes(label)
+        self._entries[(kind, ref)] = (Suggestion(kind, ref, label, slug), keys)
+        for key in keys:
+            bisect.insort(self._keys, (key, kind, ref))
+
+    def put_many(self, entries: Iterable[tuple[str, int, str, str]]) -> None:
+        """Bulk :meth:`put`: one sort instead of an insertion per key (startup and catch-up)."""
+
+        latest = {(kind, ref): (label, slug) for kind, ref, label, slug in entries}
+        pending: list[tuple[str, str, int]] = []
+        for (kind, ref), (label, slug) in latest.items():
+            self.discard(kind, ref)
+            keys = self._suffixes(label)
+            self._entries[(kind, ref)] = (Suggestion(kind, ref, label, slug), keys)
+            pending.extend((key, kind, ref) for key in keys)
+        if pending:
+            self._keys.extend(pending)
+            self._keys.sort()
+
+    def discard(self, kind: str, ref: int) -> None:
+        entry = self._entries.pop((kind, ref), None)
+        if entry is None:
+            return
+        for key in entry[1]:
+            position = bisect.bisect_left(self._keys, (key, kind, ref))
+            if position < len(self._keys) and self._keys[position] == (key, kind, ref):
+                del self._keys[position]
+
+    def put_content(self, item: ContentItem) -> None:
+        if item.status == "published":
+            self.put("content", item.id, item.title, item.slug)
+        else:
+            self.discard("content", item.id)
+
+    def put_category(self, category: ContentCategory) -> None:
+        self.put("category", category.id, category.name, category.slug)
+
+    def suggest(self, query: str, *, limit: int = 8) -> list[Suggestion]:
+        """Labels with a word starting with ``query``; labels that start with it come first."""
+
+        prefix = " ".join(tokenize(query))
+        if not prefix:
+            return []
+        start = bisect.bisect_left(self._keys, (prefix,))
+        leading: list[Suggestion] = []
+        inner: list[Suggestion] = []
+        seen: set[tuple[str, int]] = set()
+        for key, kind, ref in self._keys[start : start + MAX_SCAN]:
+            if not key.startswith(prefix):
+                break
+            if (kind, ref) in seen:
+                continue
+            seen.add((kind, ref))
+            suggestion, keys = self._entries[(kind, ref)]
+            (leading if keys[0] == key else inner).append(suggestion)
+        leading.sort(key=lambda item: len(item.label))
+        inner.sort(key=lambda item: len(item.label))
+        return (leading + inner)[:limit]
+
+    async def refresh(self, session: AsyncSession) -> int:
+        """Apply content changed since :attr:`watermark` (minus :data:`SYNC_OVERLAP`) and reload category names."""
+
+        stmt = select(
+            ContentItem.id, ContentItem.title, ContentItem.slug, ContentItem.status, ContentItem.updated_at
+        )
+        if self.watermark is not None:
+            stmt = stmt.where(ContentItem.updated_at > self.watermark - SYNC_OVERLAP)
+        touched = 0
+        last: tuple[datetime, int] | None = None
+        while True:
+            page = stmt
+            if last is not None:
+                page = page.where(tuple_(ContentItem.updated_at, ContentItem.id) > tuple_(*last))
+            rows = (await session.execute(page.order_by(ContentItem.updated_at, ContentItem.id).limit(1000))).all()
+            if not rows:
+                break
+            last = (rows[-1].updated_at, rows[-1].id)
+            rows = [row for row in rows if self.recent.get(row.id) != row.updated_at]
+            for row in rows:
+                self.recent[row.id] = row.updated_at
+                if row.status != "published":
+                    self.discard("content", row.id)
+            self.put_many(("content", row.id, row.title, row.slug) for row in rows if row.status == "published")
+            touched += len(rows)
+        if last is not None:
+            self.watermark = max(last[0], self.watermark or last[0])
+            self.recent = prune_recent(self.recent, self.watermark)
+
+        categories = (
+            await session.execute(select(ContentCategory.id, ContentCategory.name, ContentCategory.slug))
+        ).all()
+        current = {(row.id, row.name, row.slug) for row in categories}
+        for kind, ref in [key for key in self._entries if key[0] == "category"]:
+            suggestion = self._entries[(kind, ref)][0]
+            if (ref, suggestion.label, suggestion.slug) not in current:
+                self.discard(kind, ref)
+        self.put_many(
+            ("category", row.id, row.name, row.slug)
+            for row in categories
+            if ("category", row.id) not in self._entries
+        )
+        return touched
+
+
+class SuggestRefresher:
+    """Background task keeping :data:`suggest_index` in step with other workers."""
+
+    def __init__(
+        self,
+        index: SuggestIndex,
+        *,
+        interval: float = settings.search_suggest_refresh_seconds,
+        session_factory: async_sessionmaker[AsyncSession] = AsyncSessionLocal,
+    ) -> None:
+        self.index = index
+        self.interval = interval
+        self.session_factory = session_factory
+        self._task: asyncio.Task | None = None
+
+    async def start(self) -> None:
+        if self._task is not None:
+            return
+        await self.refresh()
+        self._task = asyncio.create_task(self._run(), name="search-suggest")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def refresh(self) -> None:
+        async with self.session_factory() as session:
+            touched = await self.index.refresh(session)
+        if touched:
+            logger.info("search.suggest_refreshed", extra={"content": touched, "entries": len(self.index)})
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.refresh()
+            except Exception:  # pragma: no cover - depends on database failures
+                logger.exception("search.suggest_refresh_failed")
+
+
+suggest_index = SuggestIndex()
+suggest_refresher = SuggestRefresher(suggest_index)
@@ -0,0 +1,133 @@
+"""Encoding of ``ContentVersion`` bodies as snapshots and forward deltas.
+
+A version body is stored with one of three encodings:
+
+``plain``
+    The legacy layout: the full text lives in the ``body`` column.
+``zlib``
+    A compressed full snapshot stored in ``body_data``.
+``delta``
+    A compressed list of line operations in ``body_data`` that turns the
+    previous version's body into this one.
+
+Any non-delta row is a valid base, so a version is rebuilt by taking the
+closest base at or below it and replaying the deltas that follow.
+"""
+
+from __future__ import annotations
+
+import json
+import zlib
+from dataclasses import dataclass
+from difflib import SequenceMatcher
+from typing import Iterable, Sequence
+
+PLAIN = "plain"
+SNAPSHOT = "zlib"
+DELTA = "delta"
+
+_COMPRESSION_LEVEL = 6
+
+
+@dataclass(frozen=True)
+class EncodedBody:
+    body: str | None
+    body_encoding: str
+    body_data: bytes | None
+
+
+def encode_plain(text: str) -> EncodedBody:
+    return EncodedBody(body=text, body_encoding=PLAIN, body_data=None)
+
+
+def encode_snapshot(text: str) -> EncodedBody:
+    return EncodedBody(
+        body=None,
+        body_encoding=SNAPSHOT,
+        body_data=zlib.compress(text.encode("utf-8"), _COMPRESSION_LEVEL),
+    )
+
+
+def make_delta(base: str, target: str) -> list[list[int] | str]:
+    """Return line operations rebuilding ``target`` from ``base``.
+
+    ``[start, end]`` copies ``base`` lines ``start:end``; a string is inserted
+    verbatim.
+    """
+
+    base_lines = base.splitlines(keepends=True)
+    target_lines = target.splitlines(keepends=True)
+    ops: list[list[int] | str] = []
+    matcher = SequenceMatcher(None, base_lines, target_lines, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            ops.append([i1, i2])
+        elif tag in ("replace", "insert"):
+            ops.append("".join(target_lines[j1:j2]))
+    return ops
+
+
+def apply_delta(base: str, ops: Iterable[list[int] | str]) -> str:
+    base_lines = base.splitlines(keepends=True)
+    parts: list[str] = []
+    for op in ops:
+        if isinstance(op, str):
+            parts.append(op)
+        else:
+            start, end = op
+            parts.extend(base_lines[start:end])
+    return "".join(parts)
+
+
+def encode_delta(base: str, target: str) -> EncodedBody:
+    raw = json.dumps(make_delta(base, target), separators=(",", ":"), ensure_ascii=False)
+    return EncodedBody(
+        body=None,
+        body_encoding=DELTA,
+        body_data=zlib.compress(raw.encode("utf-8"), _COMPRESSION_LEVEL),
+    )
+
+
+def decode_body(encoding: str, body: str | None, data: bytes | None, previous: str | None) -> str:
+    """Decode one stored body; ``previous`` is required for deltas."""
+
+    if encoding == PLAIN:
+        return body or ""
+    if encoding == SNAPSHOT:
+        return zlib.decompress(data or b"").decode("utf-8")
+    if encoding == DELTA:
+        if previous is None:
+            raise ValueError("Delta encoded version without a base snapshot")
+        ops = json.loads(zlib.decompress(data or b"").decode("utf-8"))
+        return apply_delta(previous, ops)
+    raise ValueError(f"Unknown body encoding: {encoding}")
+
+
+def rebuild(rows: Sequence[tuple[str, str | None, bytes | None]]) -> str:
+    """Fold ``(encoding, body, data)`` rows, oldest first, starting from a base."""
+
+    text: str | None = None
+    for encoding, body, data in rows:
+        text = decode_body(encoding, body, data, text)
+    if text is None:
+        raise ValueError("No version rows to rebuild from")
+    return text
+
+
+def encode_next(
+    body: str,
+    *,
+    previous: str | None,
+    chain_length: int,
+    snapshot_interval: int,
+) -> EncodedBody:
+    """Choose the encoding of a new version in delta mode.
+
+    ``chain_length`` is the distance between the previous version and its base;
+    a fresh snapshot is taken once the delta chain would reach
+    ``snapshot_interval``.
+    """
+
+    if previous is None or chain_length + 1 >= snapshot_interval:
+        return encode_snapshot(body)
+    return encode_delta(previous, body)
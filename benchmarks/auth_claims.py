@@ -0,0 +1,86 @@
+"""Throughput of resolving the authorization principal of a request.
+
+Compares the database lookup (user + roles + permissions), the principal
+cache and stateless token claims (with and without the cached roles-version
+check) on an in-memory SQLite database, calling the ``get_current_principal``
+dependency directly with a fresh session per "request".
+
+    python -m benchmarks.auth_claims --requests 5000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from app.api.deps.auth import get_current_principal
+from app.core.security import create_access_token
+from app.db.session import Base
+from app.models.user import Permission, Role, User
+from app.services.cache import MemoryCache
+from app.services.principal import Principal, principal_cache, roles_version_cache
+
+
+async def setup(roles: int, permissions: int) -> tuple[async_sessionmaker[AsyncSession], Principal]:
+    engine = create_async_engine(
+        "sqlite+aiosqlite:///:memory:", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_factory = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+    async with session_factory() as session:
+        user = User(email="bench@example.com", hashed_password="-")
+        user.roles = [
+            Role(
+                name=f"role-{role}",
+                permissions=[Permission(code=f"perm-{role}-{code}") for code in range(permissions)],
+            )
+            for role in range(roles)
+        ]
+        session.add(user)
+        await session.commit()
+        principal = Principal.from_user(user)
+    return session_factory, principal
+
+
+async def measure(session_factory: async_sessionmaker[AsyncSession], token: str, requests: int) -> float:
+    start = time.perf_counter()
+    for _ in range(requests):
+        async with session_factory() as session:
+            await get_current_principal(token=token, session=session)
+    return requests / (time.perf_counter() - start)
+
+
+async def run(requests: int, roles: int, permissions: int) -> None:
+    session_factory, principal = await setup(roles, permissions)
+    plain = create_access_token(str(principal.id))
+    stateless = create_access_token(str(principal.id), claims=principal.claims())
+    cases = (
+        ("db lookup", plain, None, None),
+        ("principal cache", plain, MemoryCache(max_entries=512, max_bytes=1 << 20), None),
+        ("claims, version per request", stateless, None, None),
+        ("claims, cached version", stateless, None, MemoryCache(max_entries=512, max_bytes=1 << 20)),
+    )
+    for label, token, principals, versions in cases:
+        principal_cache.backend = principals
+        roles_version_cache.backend = versions
+        await measure(session_factory, token, 100)
+        rate = await measure(session_factory, token, requests)
+        print(f"{label:<30} {rate:10.0f} req/s  token={len(token)} bytes")
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--roles", type=int, default=3)
+    parser.add_argument("--permissions", type=int, default=10, help="permissions per role")
+    args = parser.parse_args(argv)
+    asyncio.run(run(args.requests, args.roles, args.permissions))
+
+
+if __name__ == "__main__":
+    main()
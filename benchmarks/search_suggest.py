@@ -0,0 +1,61 @@
+"""Latency of ``SuggestIndex.suggest`` over a synthetic catalogue.
+
+Titles are built from a small French vocabulary so that short prefixes hit
+thousands of keys, which is the worst case for the bounded forward scan.
+
+    python -m benchmarks.search_suggest --titles 50000
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+
+from app.services.suggest import SuggestIndex
+
+WORDS = (
+    "élection municipale conseil régional budget école santé hôpital transport tramway vélo "
+    "festival musique théâtre cinéma football rugby météo orage canicule économie emploi "
+    "agriculture vendanges tourisme montagne littoral justice procès police sécurité culture"
+).split()
+
+
+def build(count: int, rng: random.Random) -> tuple[SuggestIndex, float]:
+    titles = [" ".join(rng.choice(WORDS) for _ in range(rng.randint(3, 8))).capitalize() for _ in range(count)]
+    index = SuggestIndex()
+    start = time.perf_counter()
+    index.put_many(("content", content_id, title, f"article-{content_id}") for content_id, title in enumerate(titles))
+    return index, time.perf_counter() - start
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--titles", type=int, nargs="+", default=[10000, 50000])
+    parser.add_argument("--queries", type=int, default=5000)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(42)
+    for count in args.titles:
+        index, build_seconds = build(count, rng)
+        start = time.perf_counter()
+        for content_id in range(100):
+            index.put("content", content_id, f"Mise à jour {content_id}", f"article-{content_id}")
+        publish_ms = (time.perf_counter() - start) * 10
+        prefixes = [rng.choice(WORDS)[: rng.randint(1, 6)] for _ in range(args.queries)]
+        timings = []
+        for prefix in prefixes:
+            start = time.perf_counter()
+            index.suggest(prefix)
+            timings.append((time.perf_counter() - start) * 1000)
+        timings.sort()
+        p50 = timings[len(timings) // 2]
+        p99 = timings[int(len(timings) * 0.99)]
+        print(
+            f"titles={count:<7} build={build_seconds:6.2f} s  publish={publish_ms:6.3f} ms  "
+            f"p50={p50:6.3f} ms  p99={p99:6.3f} ms  max={timings[-1]:6.3f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""Compare the legacy response path with the single-pass JSON path.
+
+The legacy path mirrors what the routes used to do: ``model_validate`` each
+ORM object, then let FastAPI dump, re-validate and encode against
+``response_model``. The fast path validates once through a cached
+``TypeAdapter`` and encodes straight to bytes.
+
+    python -m benchmarks.serialization --sizes 1000 10000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+from app.core.serialization import dump_json, type_adapter
+from app.schemas.analytics import AnalyticsEventRead
+from app.schemas.content import ContentSummary
+
+
+def content_rows(count: int) -> list[SimpleNamespace]:
+    now = datetime(2026, 1, 1)
+    return [
+        SimpleNamespace(
+            id=index,
+            type="article",
+            title=f"Article {index}",
+            slug=f"article-{index}",
+            status="published",
+            workflow_state="published",
+            published_at=now,
+            created_at=now - timedelta(days=1),
+            updated_at=now,
+            created_by=1,
+            updated_by=1,
+            latest_version_id=index,
+            latest_version_number=3,
+        )
+        for index in range(count)
+    ]
+
+
+def event_rows(count: int) -> list[dict]:
+    now = datetime(2026, 1, 1)
+    return [
+        {
+            "id": index,
+            "user_id": None,
+            "session_id": f"s-{index % 97}",
+            "event_type": "page_view",
+            "payload": {"content_id": index % 500, "referrer": "https://example.com"},
+            "occurred_at": now,
+        }
+        for index in range(count)
+    ]
+
+
+def legacy(schema, rows) -> bytes:
+    models = [schema.model_validate(row, from_attributes=True) for row in rows]
+    adapter = type_adapter(list[schema])
+    # FastAPI: dump the returned models, validate against response_model, then encode.
+    validated = adapter.validate_python([model.model_dump(by_alias=True) for model in models])
+    return json.dumps(adapter.dump_python(validated, mode="json", by_alias=True)).encode()
+
+
+def fast(schema, rows) -> bytes:
+    return dump_json(list[schema], rows)
+
+
+def timed(func, *args, repeat: int) -> float:
+    func(*args)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func(*args)
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    for label, schema, factory in (
+        ("content summaries (ORM attributes)", ContentSummary, content_rows),
+        ("analytics events (row mappings)", AnalyticsEventRead, event_rows),
+    ):
+        for size in args.sizes:
+            rows = factory(size)
+            legacy_ms = timed(legacy, schema, rows, repeat=args.repeat)
+            fast_ms = timed(fast, schema, rows, repeat=args.repeat)
+            print(
+                f"{label:<36} n={size:<6} legacy={legacy_ms:8.1f} ms  fast={fast_ms:8.1f} ms  "
+                f"speedup={legacy_ms / fast_ms:4.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""Compare plain and snapshot/delta storage of content version bodies.
+
+Simulates a long article edited through many autosaves and reports the bytes
+stored by each layout and the cost of reconstructing the latest version.
+
+    python -m benchmarks.version_storage --versions 500 --paragraphs 200
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+
+from app.services import version_storage
+
+
+def autosave_history(versions: int, paragraphs: int, seed: int = 7) -> list[str]:
+    rng = random.Random(seed)
+    words = "enquête rédaction source témoin document ministère budget contrat preuve article".split()
+
+    def paragraph() -> str:
+        return " ".join(rng.choice(words) for _ in range(rng.randint(40, 90))) + "\n"
+
+    lines = [paragraph() for _ in range(paragraphs)]
+    history = ["".join(lines)]
+    for _ in range(versions - 1):
+        position = rng.randrange(len(lines))
+        if rng.random() < 0.2:
+            lines.insert(position, paragraph())
+        else:
+            lines[position] = paragraph()
+        history.append("".join(lines))
+    return history
+
+
+def encode_history(history: list[str], interval: int) -> list[version_storage.EncodedBody]:
+    encoded: list[version_storage.EncodedBody] = []
+    previous = None
+    chain_length = 0
+    for body in history:
+        item = version_storage.encode_next(
+            body, previous=previous, chain_length=chain_length, snapshot_interval=interval
+        )
+        chain_length = chain_length + 1 if item.body_encoding == version_storage.DELTA else 0
+        encoded.append(item)
+        previous = body
+    return encoded
+
+
+def stored_bytes(encoded: list[version_storage.EncodedBody]) -> int:
+    return sum(
+        len(item.body.encode("utf-8")) if item.body is not None else len(item.body_data or b"")
+        for item in encoded
+    )
+
+
+def latest_chain(encoded: list[version_storage.EncodedBody]) -> list[tuple[str, str | None, bytes | None]]:
+    start = max(i for i, item in enumerate(encoded) if item.body_encoding != version_storage.DELTA)
+    return [(item.body_encoding, item.body, item.body_data) for item in encoded[start:]]
+
+
+def timed(func, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--versions", type=int, default=500)
+    parser.add_argument("--paragraphs", type=int, default=200)
+    parser.add_argument("--interval", type=int, default=25)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args(argv)
+
+    history = autosave_history(args.versions, args.paragraphs)
+    plain = [version_storage.encode_plain(body) for body in history]
+    delta = encode_history(history, args.interval)
+
+    chain = latest_chain(delta)
+    assert version_storage.rebuild(chain) == history[-1]
+    latest_plain = [(plain[-1].body_encoding, plain[-1].body, None)]
+
+    plain_bytes = stored_bytes(plain)
+    delta_bytes = stored_bytes(delta)
+    print(f"versions={args.versions} paragraphs={args.paragraphs} interval={args.interval}")
+    print(f"plain : {plain_bytes / 1024:10.1f} KiB")
+    print(f"delta : {delta_bytes / 1024:10.1f} KiB  ({delta_bytes / plain_bytes:.1%} of plain)")
+    plain_ms = timed(lambda: version_storage.rebuild(latest_plain), args.repeat)
+    delta_ms = timed(lambda: version_storage.rebuild(chain), args.repeat)
+    print(f"{'rebuild latest, plain (1 row)':<34}: {plain_ms:.3f} ms")
+    print(f"{f'rebuild latest, delta ({len(chain)} rows)':<34}: {delta_ms:.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,14 +2,19 @@ from __future__ import annotations
 
 import asyncio
 from collections.abc import Generator
+from uuid import uuid4
 
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.pool import StaticPool
 
-from app.db.session import Base, get_session
+from app.db.session import AppSession, Base, get_session
 from app.main import app
+from app.models.user import User
+from app.services.analytics_buffer import event_buffer
+from app.services.refresh_tokens import revocation_refresher
+from app.services.suggest import suggest_refresher
 
 
 @pytest.fixture(scope="session")
@@ -39,7 +44,7 @@ def async_engine(event_loop: asyncio.AbstractEventLoop):
 
 @pytest.fixture(scope="session")
 def session_factory(async_engine) -> async_sessionmaker[AsyncSession]:
-    return async_sessionmaker(async_engine, expire_on_commit=False, class_=AsyncSession)
+    return async_sessionmaker(async_engine, expire_on_commit=False, class_=AppSession)
 
 
 @pytest.fixture
@@ -49,6 +54,30 @@ def client(session_factory: async_sessionmaker[AsyncSession]):
             yield session
 
     app.dependency_overrides[get_session] = override_get_session
-    with TestClient(app) as test_client:
+    event_buffer.session_factory = session_factory
+    suggest_refresher.session_factory = session_factory
+    revocation_refresher.session_factory = session_factory
+    # A distinct client address per test keeps the per-IP rate limit from leaking across tests.
+    with TestClient(app, client=(f"test-{uuid4().hex[:8]}", 50000)) as test_client:
         yield test_client
     app.dependency_overrides.pop(get_session, None)
+
+
+@pytest.fixture
+def admin_headers(client: TestClient, session_factory: async_sessionmaker[AsyncSession], event_loop) -> dict[str, str]:
+    email = f"admin-{uuid4().hex[:8]}@example.com"
+    password = "password123"
+    response = client.post("/api/auth/signup", json={"email": email, "password": password})
+    assert response.status_code == 201
+    user_id = response.json()["user_id"]
+
+    async def promote() -> None:
+        async with session_factory() as session:
+            user = await session.get(User, user_id)
+            user.is_superuser = True
+            await session.commit()
+
+    event_loop.run_until_complete(promote())
+    response = client.post("/api/auth/login", json={"email": email, "password": password})
+    assert response.status_code == 200
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime
+
+import pytest
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+from sqlalchemy import func, select
+
+from app.models.analytics import AnalyticsEvent
+from app.services.analytics_buffer import BufferFull, EventBuffer, event_buffer
+
+
+async def _count(session_factory, event_type: str) -> int:
+    async with session_factory() as session:
+        return await session.scalar(
+            select(func.count()).select_from(AnalyticsEvent).where(AnalyticsEvent.event_type == event_type)
+        )
+
+
+def test_buffer_flushes_by_size_and_drains_on_stop(session_factory, event_loop) -> None:
+    buffer = EventBuffer(max_size=10, batch_size=3, flush_interval=60, session_factory=session_factory)
+    rows = [
+        {
+            "event_type": "buffer_size",
+            "user_id": None,
+            "session_id": None,
+            "payload": None,
+            "occurred_at": datetime(2026, 1, 1),
+        }
+    ]
+
+    async def scenario() -> tuple[int, int, int, bool]:
+        await buffer.start()
+        buffer.submit(rows * 2)
+        await asyncio.sleep(0.05)
+        below_batch = await _count(session_factory, "buffer_size")
+        buffer.submit(rows)
+        await asyncio.sleep(0.05)
+        after_batch = await _count(session_factory, "buffer_size")
+        buffer.submit(rows)
+        with pytest.raises(BufferFull):
+            buffer.submit(rows * 10)
+        await buffer.stop()
+        after_stop = await _count(session_factory, "buffer_size")
+        with pytest.raises(BufferFull):
+            buffer.submit(rows)
+        return below_batch, after_batch, after_stop, buffer.running
+
+    below_batch, after_batch, after_stop, running = event_loop.run_until_complete(scenario())
+    assert below_batch == 0
+    assert after_batch == 3
+    assert after_stop == 4
+    assert running is False
+
+
+
+def test_failed_inserts_are_retried_then_dropped(session_factory, event_loop) -> None:
+    failures = {"left": 0}
+
+    def flaky_factory():
+        if failures["left"]:
+            failures["left"] -= 1
+            raise ConnectionError("database unavailable")
+        return session_factory()
+
+    buffer = EventBuffer(
+        max_size=10, batch_size=10, flush_interval=60, retries=2, retry_backoff=0, session_factory=flaky_factory
+    )
+    row = {"event_type": "buffer_retry", "user_id": None, "session_id": None, "payload": None}
+
+    def dropped() -> float:
+        return REGISTRY.get_sample_value("analytics_events_total", {"outcome": "dropped"}) or 0.0
+
+    async def scenario() -> None:
+        await buffer.start()
+        failures["left"] = 2
+        buffer.submit([{**row, "occurred_at": datetime(2026, 1, 1)}])
+        await buffer.flush()
+        assert await _count(session_factory, "buffer_retry") == 1
+
+        before = dropped()
+        failures["left"] = 3
+        buffer.submit([{**row, "occurred_at": datetime(2026, 1, 2)}] * 2)
+        await buffer.flush()
+        assert await _count(session_factory, "buffer_retry") == 1
+        assert dropped() == before + 2
+        await buffer.stop()
+
+    event_loop.run_until_complete(scenario())
+
+
+def test_poisoned_batch_only_drops_offending_rows(session_factory, event_loop) -> None:
+    buffer = EventBuffer(max_size=10, batch_size=10, flush_interval=60, retries=0, session_factory=session_factory)
+
+    def dropped() -> float:
+        return REGISTRY.get_sample_value("analytics_events_total", {"outcome": "dropped"}) or 0.0
+
+    async def scenario() -> None:
+        async with session_factory() as session:
+            existing = AnalyticsEvent(event_type="buffer_seed", occurred_at=datetime(2026, 1, 1))
+            session.add(existing)
+            await session.commit()
+            taken = existing.id
+        # SQLite does not enforce foreign keys: a duplicate primary key stands in for the unknown
+        # user_id PostgreSQL would reject, failing the whole multi-row INSERT the same way.
+        ids = [taken + 100 + index for index in range(5)]
+        ids[3] = taken
+        row = {"event_type": "buffer_poisoned", "user_id": None, "session_id": None, "payload": None}
+        before = dropped()
+        await buffer.start()
+        buffer.submit([{**row, "id": event_id, "occurred_at": datetime(2026, 1, 1)} for event_id in ids])
+        await buffer.flush()
+        assert await _count(session_factory, "buffer_poisoned") == 4
+        assert dropped() == before + 1
+        await buffer.stop()
+
+    event_loop.run_until_complete(scenario())
+
+def test_batch_endpoint_and_backpressure(client: TestClient, session_factory, event_loop) -> None:
+    events = [{"event_type": "batch_view", "payload": {"index": index}} for index in range(5)]
+    response = client.post("/api/analytics/events:batch", json={"events": events})
+    assert response.status_code == 202
+    assert response.json() == {"accepted": 5}
+
+    client.portal.call(event_buffer.flush)
+    assert event_loop.run_until_complete(_count(session_factory, "batch_view")) == 5
+
+    assert client.post("/api/analytics/events:batch", json={"events": []}).status_code == 422
+
+    max_size = event_buffer.max_size
+    event_buffer.max_size = 0
+    try:
+        response = client.post("/api/analytics/events", json={"event_type": "dropped"})
+    finally:
+        event_buffer.max_size = max_size
+    assert response.status_code == 503
+    assert response.headers["retry-after"]
@@ -34,7 +34,7 @@ def test_analytics_and_newsletter(client: TestClient) -> None:
         "/api/analytics/events",
         json={"article_id": None, "event_type": "page_view"},
     )
-    assert response.status_code == 201
+    assert response.status_code == 202
 
     response = client.get(
         "/api/analytics/summary",
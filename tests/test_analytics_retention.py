@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+from sqlalchemy import delete, func, select, text, update
+
+from app.commands.analytics_partitions import check_revision
+
+from app.models.analytics import AnalyticsEvent, AnalyticsEventArchive, AnalyticsRollupWatermark
+from app.services.analytics_archive import ArchiveWriter, read_archive
+from app.services.analytics_retention import (
+    ExpiredMonth,
+    RetentionManager,
+    add_months,
+    month_start,
+    partition_month,
+    partition_name,
+)
+
+
+def test_month_helpers() -> None:
+    month = month_start(datetime(2026, 12, 31, 23, 59))
+    assert month == datetime(2026, 12, 1, tzinfo=timezone.utc)
+    assert add_months(month, 1) == datetime(2027, 1, 1, tzinfo=timezone.utc)
+    assert add_months(month, -12) == datetime(2025, 12, 1, tzinfo=timezone.utc)
+    assert partition_name(month) == "analytics_events_p202612"
+    assert partition_month("analytics_events_p202612") == month
+    assert partition_month("analytics_events_default") is None
+
+
+def test_archive_round_trip(tmp_path) -> None:
+    base = {"user_id": None, "session_id": None, "payload": None}
+    rows = [
+        {**base, "id": 1, "event_type": "view", "payload": {"a": 1}, "occurred_at": datetime(2026, 1, 2, 3, 4)},
+        {**base, "id": 2, "event_type": "click", "occurred_at": datetime(2026, 1, 3)},
+    ]
+    with ArchiveWriter(tmp_path, "events", use_parquet=False) as writer:
+        writer.write_group(rows[:1])
+        writer.write_group(rows[1:])
+    assert writer.rows == 2
+    restored = list(read_archive(writer.path))
+    assert [row["id"] for row in restored] == [1, 2]
+    assert restored[0]["payload"] == {"a": 1}
+    assert restored[0]["occurred_at"] == "2026-01-02T03:04:00"
+
+
+def test_sqlite_retention_moves_then_archives(session_factory, event_loop, tmp_path) -> None:
+    now = datetime(2001, 6, 15)
+    occurred = [datetime(2001, 1, 5), datetime(2001, 1, 20), datetime(2001, 2, 10), datetime(2001, 4, 1)]
+
+    async def set_floor(session, last_event_id: int) -> None:
+        await session.execute(update(AnalyticsRollupWatermark).values(last_event_id=last_event_id))
+        await session.flush()
+
+    async def scenario():
+        async with session_factory() as session:
+            session.add_all(AnalyticsEvent(event_type="retention", occurred_at=at) for at in occurred)
+            session.add(AnalyticsRollupWatermark(name="retention-test", last_event_id=0))
+            await session.commit()
+            newest = await session.scalar(select(func.max(AnalyticsEvent.id)))
+
+            manager = RetentionManager(
+                session, retention_months=3, mode="archive", archive_dir=tmp_path, hot_months=2
+            )
+            # Rows the rollups have not reached stay in the hot table.
+            unrolled = await manager.move_cold_rows(now=now)
+            await set_floor(session, newest)
+            moved = await manager.move_cold_rows(now=now)
+
+            await set_floor(session, 0)
+            skipped = await manager.expire(now=now)
+            await set_floor(session, newest)
+            expired = await manager.expire(now=now)
+            await session.execute(
+                delete(AnalyticsRollupWatermark).where(AnalyticsRollupWatermark.name == "retention-test")
+            )
+            await session.commit()
+
+            hot = await session.scalar(
+                select(func.count()).select_from(AnalyticsEvent).where(AnalyticsEvent.event_type == "retention")
+            )
+            cold = list(
+                (await session.scalars(
+                    select(AnalyticsEventArchive.occurred_at).where(AnalyticsEventArchive.event_type == "retention")
+                )).all()
+            )
+            return unrolled, moved, skipped, expired, hot, cold
+
+    unrolled, moved, skipped, expired, hot, cold = event_loop.run_until_complete(scenario())
+    assert unrolled == 0
+    assert moved >= 4
+    assert all(item.skipped for item in skipped if item.month.year == 2001)
+    assert hot == 0
+    assert [item.replace(tzinfo=None) for item in cold] == [datetime(2001, 4, 1)]
+    by_month = {item.month.month: item for item in expired if item.month.year == 2001 and item.rows}
+    assert {month: item.rows for month, item in by_month.items()} == {1: 2, 2: 1}
+    archived = list(read_archive(by_month[1].archive_path))
+    assert {row["event_type"] for row in archived} == {"retention"}
+
+
+def test_retention_requires_a_rollup_watermark(session_factory, event_loop) -> None:
+    async def scenario() -> tuple[list[ExpiredMonth], int]:
+        async with session_factory() as session:
+            await session.execute(delete(AnalyticsRollupWatermark))
+            session.add(
+                AnalyticsEventArchive(id=900_001, event_type="retention_unrolled", occurred_at=datetime(2000, 1, 3))
+            )
+            await session.flush()
+            manager = RetentionManager(session, retention_months=3, mode="drop", hot_months=2)
+            moved = await manager.move_cold_rows(now=datetime(2000, 6, 15))
+            expired = await manager.expire(now=datetime(2000, 6, 15))
+            await session.rollback()
+            return expired, moved
+
+    expired, moved = event_loop.run_until_complete(scenario())
+    assert moved == 0
+    assert [item.skipped for item in expired if item.month == datetime(2000, 1, 1, tzinfo=timezone.utc)] == [True]
+
+
+def test_check_revision_compares_numbers(session_factory, event_loop) -> None:
+    async def check(*revisions: str) -> list[bool]:
+        results = []
+        async with session_factory() as session:
+            await session.execute(text("CREATE TABLE alembic_version (version_num VARCHAR(32) NOT NULL)"))
+            for revision in revisions:
+                await session.execute(text("DELETE FROM alembic_version"))
+                await session.execute(text("INSERT INTO alembic_version VALUES (:revision)"), {"revision": revision})
+                try:
+                    await check_revision(session)
+                    results.append(True)
+                except SystemExit:
+                    results.append(False)
+            await session.execute(text("DROP TABLE alembic_version"))
+            await session.commit()
+        return results
+
+    # "00010" sorts before "0006" as a string.
+    assert event_loop.run_until_complete(check("0015", "0005", "00010", "head")) == [True, False, True, False]
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+from fastapi.testclient import TestClient
+
+from sqlalchemy import func, select
+
+from app.models.analytics import AnalyticsEvent, AnalyticsRollupWatermark, Dashboard
+from app.services.analytics_rollup import RollupService, dimension_value, truncate
+
+
+def test_truncate_and_dimension_value() -> None:
+    moment = datetime(2026, 3, 4, 15, 42, 17, 500)
+    assert truncate(moment, "minute").replace(tzinfo=None) == datetime(2026, 3, 4, 15, 42)
+    assert truncate(moment, "hour").replace(tzinfo=None) == datetime(2026, 3, 4, 15)
+    assert truncate(moment, "day").replace(tzinfo=None) == datetime(2026, 3, 4)
+    assert dimension_value({"content_id": 7}, "content_id") == "7"
+    assert dimension_value(None, "content_id") == ""
+    assert dimension_value({"content_id": 7}, "") == ""
+
+
+def test_rollups_are_incremental_and_feed_dashboards(
+    client: TestClient, admin_headers: dict[str, str], session_factory, event_loop
+) -> None:
+    def add_events(*events: tuple[int, datetime]) -> None:
+        async def insert() -> None:
+            async with session_factory() as session:
+                session.add_all(
+                    AnalyticsEvent(event_type="rollup_view", payload={"content_id": content_id}, occurred_at=at)
+                    for content_id, at in events
+                )
+                await session.commit()
+
+        event_loop.run_until_complete(insert())
+
+    async def roll_up() -> int:
+        async with session_factory() as session:
+            processed = await RollupService(session, dimension="content_id", safety_lag=0).catch_up(batch_size=2)
+            await session.commit()
+            return processed
+
+    add_events((1, datetime(2026, 5, 1, 10, 5)), (1, datetime(2026, 5, 1, 10, 40)), (2, datetime(2026, 5, 1, 11, 1)))
+    assert event_loop.run_until_complete(roll_up()) >= 3
+    add_events((1, datetime(2026, 5, 1, 10, 59)))
+    assert event_loop.run_until_complete(roll_up()) == 1
+    assert event_loop.run_until_complete(roll_up()) == 0
+
+    params = {"event_type": "rollup_view", "granularity": "hour", "start": "2026-05-01T00:00:00"}
+    response = client.get("/api/analytics/rollups", params=params, headers=admin_headers)
+    assert response.status_code == 200
+    assert [point["count"] for point in response.json()] == [3, 1]
+
+    response = client.get(
+        "/api/analytics/rollups", params={**params, "by_dimension": "true"}, headers=admin_headers
+    )
+    assert [(point["dimension_value"], point["count"]) for point in response.json()] == [("1", 3), ("2", 1)]
+
+    response = client.get(
+        "/api/analytics/rollups",
+        params={"event_type": "rollup_view", "granularity": "day", "dimension_value": "1"},
+        headers=admin_headers,
+    )
+    assert [point["count"] for point in response.json()] == [3]
+
+    async def create_dashboard() -> int:
+        async with session_factory() as session:
+            dashboard = Dashboard(
+                name="rollup-dashboard",
+                definition={"series": [{"event_type": "rollup_view", "granularity": "day", "label": "Views"}]},
+            )
+            session.add(dashboard)
+            await session.commit()
+            return dashboard.id
+
+    dashboard_id = event_loop.run_until_complete(create_dashboard())
+    response = client.get(f"/api/analytics/dashboards/{dashboard_id}/data", headers=admin_headers)
+    assert response.status_code == 200
+    series = response.json()["series"]
+    assert series[0]["label"] == "Views"
+    assert series[0]["points"][0]["count"] == 4
+
+
+def test_rollups_wait_for_late_commits_below_the_horizon(session_factory, event_loop) -> None:
+    async def scenario() -> None:
+        async with session_factory() as session:
+            newest = await session.scalar(select(func.max(AnalyticsEvent.id))) or 0
+            session.add(AnalyticsEvent(id=newest + 10, event_type="late_view", occurred_at=datetime(2026, 5, 2, 9)))
+            await session.commit()
+
+        async with session_factory() as session:
+            service = RollupService(session, dimension="late_commit", safety_lag=60)
+            assert await service.catch_up() == 0
+            await session.commit()
+
+        # A transaction that allocated a lower id commits after the horizon was read.
+        async with session_factory() as session:
+            session.add(AnalyticsEvent(id=newest + 5, event_type="late_view", occurred_at=datetime(2026, 5, 2, 9)))
+            await session.commit()
+
+        async with session_factory() as session:
+            watermark = await session.get(AnalyticsRollupWatermark, "late_commit")
+            assert watermark.horizon_event_id == newest + 10
+            watermark.horizon_at -= timedelta(minutes=2)
+            await session.commit()
+
+        async with session_factory() as session:
+            service = RollupService(session, dimension="late_commit", safety_lag=60)
+            assert await service.catch_up() >= 2
+            await session.commit()
+            points = await service.series(event_type="late_view", granularity="day")
+            assert [point["count"] for point in points] == [2]
+
+    event_loop.run_until_complete(scenario())
@@ -1,19 +1,43 @@
 from __future__ import annotations
 
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+from sqlalchemy import update
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 from sqlalchemy.future import select
 
-from app.models.user import User
+from app.core.config import settings
+from app.core.security import hash_token
+from app.models.user import PasswordResetToken
+from app.services.auth import AuthService
+
+
+def _request_reset(client, monkeypatch, email: str) -> str:
+    issued: list[str] = []
+    create_reset_token = AuthService.create_reset_token
+
+    async def capture(self, user):
+        token = await create_reset_token(self, user)
+        issued.append(token)
+        return token
+
+    with monkeypatch.context() as patch:
+        patch.setattr(AuthService, "create_reset_token", capture)
+        response = client.post("/api/auth/recover", json={"email": email})
+    assert response.status_code == 202
+    return issued[-1]
 
 
 def test_signup_login_password_reset(
     client,
     session_factory: async_sessionmaker[AsyncSession],
     event_loop,
+    monkeypatch,
 ) -> None:
     response = client.post(
         "/api/auth/signup",
-        json={"email": "user@example.com", "password": "password123", "full_name": "Test User", "role": "author"},
+        json={"email": "user@example.com", "password": "password123", "full_name": "Test User"},
     )
     assert response.status_code == 201
     user_id = response.json()["user_id"]
@@ -25,20 +49,18 @@ def test_signup_login_password_reset(
     assert response.status_code == 200
     token = response.json()["access_token"]
 
-    response = client.post("/api/auth/recover", json={"email": "user@example.com"})
-    assert response.status_code == 202
+    reset_token = _request_reset(client, monkeypatch, "user@example.com")
 
-    async def fetch_user() -> User:
+    async def fetch_tokens() -> list[PasswordResetToken]:
         async with session_factory() as session:
-            result = await session.execute(select(User).where(User.id == user_id))
-            return result.scalar_one()
+            result = await session.execute(select(PasswordResetToken).where(PasswordResetToken.user_id == user_id))
+            return list(result.scalars())
 
-    user = event_loop.run_until_complete(fetch_user())
-    assert user.reset_token is not None
+    assert [row.token_hash for row in event_loop.run_until_complete(fetch_tokens())] == [hash_token(reset_token)]
 
     response = client.post(
         "/api/auth/reset",
-        json={"token": user.reset_token, "new_password": "newpassword456"},
+        json={"token": reset_token, "new_password": "newpassword456"},
     )
     assert response.status_code == 200
 
@@ -48,3 +70,61 @@ def test_signup_login_password_reset(
     )
     assert response.status_code == 200
     assert response.json()["access_token"] != token
+
+
+def test_reset_tokens_are_single_use_and_purged(
+    client,
+    session_factory: async_sessionmaker[AsyncSession],
+    event_loop,
+    monkeypatch,
+) -> None:
+    email = f"reset-{uuid4().hex[:8]}@example.com"
+    response = client.post("/api/auth/signup", json={"email": email, "password": "password123"})
+    assert response.status_code == 201
+    user_id = response.json()["user_id"]
+
+    stale = _request_reset(client, monkeypatch, email)
+    token = _request_reset(client, monkeypatch, email)
+    # A new request replaces the pending token.
+    response = client.post("/api/auth/reset", json={"token": stale, "new_password": "newpassword456"})
+    assert response.status_code == 400
+    response = client.post("/api/auth/reset", json={"token": token, "new_password": "newpassword456"})
+    assert response.status_code == 200
+    response = client.post("/api/auth/reset", json={"token": token, "new_password": "other-password"})
+    assert response.status_code == 400
+    assert client.post("/api/auth/login", json={"email": email, "password": "newpassword456"}).status_code == 200
+
+    expired = _request_reset(client, monkeypatch, email)
+
+    async def expire_and_purge() -> int:
+        async with session_factory() as session:
+            await session.execute(
+                update(PasswordResetToken)
+                .where(PasswordResetToken.user_id == user_id)
+                .values(expires_at=datetime.utcnow() - timedelta(seconds=1))
+            )
+            purged = await AuthService(session).purge_reset_tokens()
+            await session.commit()
+            return purged
+
+    assert event_loop.run_until_complete(expire_and_purge()) >= 1
+    response = client.post("/api/auth/reset", json={"token": expired, "new_password": "other-password"})
+    assert response.status_code == 400
+
+
+def test_password_reset_ends_existing_sessions(client, monkeypatch) -> None:
+    monkeypatch.setattr(settings, "auth_token_claims", True)
+    email = f"reset-sessions-{uuid4().hex[:8]}@example.com"
+    assert client.post("/api/auth/signup", json={"email": email, "password": "password123"}).status_code == 201
+    credentials = {"email": email, "password": "password123"}
+    sessions = [client.post("/api/auth/login", json=credentials).json() for _ in range(2)]
+
+    token = _request_reset(client, monkeypatch, email)
+    assert client.post("/api/auth/reset", json={"token": token, "new_password": "newpassword456"}).status_code == 200
+
+    for tokens in sessions:
+        headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+        assert client.get("/api/auth/me", headers=headers).status_code == 401
+        assert client.post("/api/auth/refresh", json={"refresh_token": tokens["refresh_token"]}).status_code == 401
+    login = client.post("/api/auth/login", json={"email": email, "password": "newpassword456"}).json()
+    assert client.get("/api/auth/me", headers={"Authorization": f"Bearer {login['access_token']}"}).status_code == 200
@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+from fastapi.testclient import TestClient
+
+
+def test_content_and_sitemap_answer_304(client: TestClient, admin_headers: dict[str, str]) -> None:
+    response = client.post(
+        "/api/content",
+        headers=admin_headers,
+        json={"type": "article", "title": "ETag", "slug": "etag-article", "body": "v1"},
+    )
+    content_id = response.json()["id"]
+    client.post(f"/api/content/{content_id}/publish", headers=admin_headers)
+
+    etags = {}
+    for path in ("/api/content/etag-article", "/api/seo/sitemaps", "/api/content?status=published"):
+        response = client.get(path)
+        assert response.status_code == 200
+        etag = etags[path] = response.headers["etag"]
+        last_modified = response.headers["last-modified"]
+
+        response = client.get(path, headers={"If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.content == b""
+        response = client.get(path, headers={"If-Modified-Since": last_modified})
+        assert response.status_code == 304
+
+    response = client.patch(f"/api/content/{content_id}", headers=admin_headers, json={"body": "v2"})
+    assert response.status_code == 200
+    for path in ("/api/content/etag-article", "/api/content?status=published"):
+        response = client.get(path, headers={"If-None-Match": etags[path]})
+        assert response.status_code == 200
+        assert response.headers["etag"] != etags[path]
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import asyncio
+
+from fastapi.testclient import TestClient
+
+from app.services.cache import MemoryCache, content_cache
+from app.services.content import ContentService
+
+
+def test_memory_cache_bounds_and_ttl() -> None:
+    async def scenario() -> None:
+        cache = MemoryCache(max_entries=2, max_bytes=10)
+        await cache.set("a", b"1234", ttl=60)
+        await cache.set("b", b"1234", ttl=60)
+        assert await cache.get("a") == b"1234"
+        await cache.set("c", b"1234", ttl=60)
+        assert await cache.get("b") is None
+        assert await cache.get("a") == b"1234"
+        await cache.set("d", b"123456", ttl=60)
+        assert await cache.get("c") is None
+        assert await cache.get("a") == b"1234"
+        await cache.set("e", b"1", ttl=0)
+        assert await cache.get("e") is None
+
+    asyncio.run(scenario())
+
+
+def test_published_content_is_cached_and_invalidated(client: TestClient, admin_headers: dict[str, str]) -> None:
+    response = client.post(
+        "/api/content",
+        headers=admin_headers,
+        json={"type": "article", "title": "Cache", "slug": "cached-article", "body": "v1"},
+    )
+    content_id = response.json()["id"]
+    response = client.post(f"/api/content/{content_id}/publish", headers=admin_headers)
+    assert response.status_code == 200
+
+    response = client.get("/api/content/cached-article")
+    assert response.status_code == 200
+    assert asyncio.run(content_cache.get("cached-article")).endswith(response.content)
+
+    response = client.patch(f"/api/content/{content_id}", headers=admin_headers, json={"body": "v2"})
+    assert response.status_code == 200
+    assert asyncio.run(content_cache.get("cached-article")) is None
+
+    response = client.get("/api/content/cached-article")
+    assert response.json()["latest_version"]["body"] == "v2"
+
+
+def test_cache_is_invalidated_only_after_commit(
+    client: TestClient, admin_headers: dict[str, str], session_factory, event_loop
+) -> None:
+    response = client.post(
+        "/api/content",
+        headers=admin_headers,
+        json={"type": "article", "title": "Cache", "slug": "cached-rollback", "body": "v1"},
+    )
+    content_id = response.json()["id"]
+    assert client.post(f"/api/content/{content_id}/publish", headers=admin_headers).status_code == 200
+    assert client.get("/api/content/cached-rollback").status_code == 200
+
+    async def update(*, commit: bool) -> bytes | None:
+        async with session_factory() as session:
+            service = ContentService(session)
+            await service.update_content(await service.get_content(content_id), title="Cache v2")
+            # Readers keep being served the committed version until the commit lands.
+            assert await content_cache.get("cached-rollback") is not None
+            if commit:
+                await session.commit()
+            else:
+                await session.rollback()
+        return await content_cache.get("cached-rollback")
+
+    assert event_loop.run_until_complete(update(commit=False)) is not None
+    assert event_loop.run_until_complete(update(commit=True)) is None
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+from fastapi.testclient import TestClient
+
+
+def test_content_listing_is_keyset_paginated(client: TestClient, admin_headers: dict[str, str]) -> None:
+    response = client.post(
+        "/api/content/categories",
+        headers=admin_headers,
+        json={"name": "Enquêtes", "slug": "enquetes-listing"},
+    )
+    assert response.status_code == 201
+    category_id = response.json()["id"]
+
+    created = []
+    for index in range(5):
+        response = client.post(
+            "/api/content",
+            headers=admin_headers,
+            json={
+                "type": "article",
+                "title": f"Listing {index}",
+                "slug": f"listing-{index}",
+                "body": "Corps",
+                "category_ids": [category_id] if index % 2 == 0 else [],
+            },
+        )
+        assert response.status_code == 201
+        created.append(response.json()["id"])
+
+    seen: list[int] = []
+    cursor = None
+    while True:
+        params = {"limit": 2, "category": "enquetes-listing"}
+        if cursor:
+            params["cursor"] = cursor
+        response = client.get("/api/content", params=params)
+        assert response.status_code == 200
+        page = response.json()
+        assert len(page["items"]) <= 2
+        for item in page["items"]:
+            assert "versions" not in item
+            assert item["latest_version_number"] == 1
+            assert item["latest_version_id"] is not None
+        seen.extend(item["id"] for item in page["items"])
+        cursor = page["next_cursor"]
+        if not cursor:
+            break
+
+    assert seen == sorted((created[0], created[2], created[4]), reverse=True)
+
+    assert client.post(f"/api/content/{created[3]}/publish", headers=admin_headers).status_code == 200
+    response = client.get("/api/search", params={"query": "Listing 3"})
+    assert response.status_code == 200
+    assert [item["id"] for item in response.json()] == [created[3]]
+
+    response = client.get("/api/content", params={"cursor": "not-a-cursor"})
+    assert response.status_code == 400
@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+from fastapi.testclient import TestClient
+from sqlalchemy import Select
+from sqlalchemy.dialects import postgresql
+
+from app.core.config import settings
+from app.services import version_storage
+from app.services.content import ContentService
+
+
+def test_version_history_is_paginated(client: TestClient, admin_headers: dict[str, str]) -> None:
+    response = client.post(
+        "/api/content",
+        headers=admin_headers,
+        json={"type": "article", "title": "Versions", "slug": "versions-history", "body": "v1"},
+    )
+    assert response.status_code == 201
+    content_id = response.json()["id"]
+    assert response.json()["latest_version"]["version_number"] == 1
+
+    for number in range(2, 6):
+        response = client.patch(
+            f"/api/content/{content_id}",
+            headers=admin_headers,
+            json={"body": f"v{number}"},
+        )
+        assert response.status_code == 200
+        assert response.json()["latest_version"]["version_number"] == number
+        assert response.json()["latest_version"]["body"] == f"v{number}"
+
+    numbers: list[int] = []
+    cursor = None
+    while True:
+        params = {"limit": 2}
+        if cursor:
+            params["cursor"] = cursor
+        response = client.get(f"/api/content/{content_id}/versions", headers=admin_headers, params=params)
+        assert response.status_code == 200
+        page = response.json()
+        assert all("body" not in item for item in page["items"])
+        numbers.extend(item["version_number"] for item in page["items"])
+        cursor = page["next_cursor"]
+        if not cursor:
+            break
+    assert numbers == [5, 4, 3, 2, 1]
+
+    response = client.get(f"/api/content/{content_id}/versions/3", headers=admin_headers)
+    assert response.status_code == 200
+    assert response.json()["body"] == "v3"
+
+    response = client.get(f"/api/content/{content_id}/versions/42", headers=admin_headers)
+    assert response.status_code == 404
+
+
+def test_delta_storage_round_trips(client: TestClient, admin_headers: dict[str, str], monkeypatch) -> None:
+    monkeypatch.setattr(settings, "content_version_storage", "delta")
+    monkeypatch.setattr(settings, "content_snapshot_interval", 3)
+
+    bodies = [f"Intro\nParagraphe {number}\nConclusion" for number in range(1, 8)]
+    response = client.post(
+        "/api/content",
+        headers=admin_headers,
+        json={"type": "article", "title": "Delta", "slug": "versions-delta", "body": bodies[0]},
+    )
+    assert response.status_code == 201
+    content_id = response.json()["id"]
+    for body in bodies[1:]:
+        response = client.patch(f"/api/content/{content_id}", headers=admin_headers, json={"body": body})
+        assert response.status_code == 200
+        assert response.json()["latest_version"]["body"] == body
+
+    for number, body in enumerate(bodies, start=1):
+        response = client.get(f"/api/content/{content_id}/versions/{number}", headers=admin_headers)
+        assert response.json()["body"] == body
+
+
+def test_delta_codec() -> None:
+    base = "a\nb\nc\n"
+    target = "a\nB\nc\nd"
+    encoded = version_storage.encode_delta(base, target)
+    assert encoded.body is None
+    assert version_storage.decode_body(encoded.body_encoding, None, encoded.body_data, base) == target
+
+
+def test_new_versions_lock_the_content_row(session_factory, event_loop, monkeypatch) -> None:
+    async def scenario() -> tuple[list[str], int]:
+        async with session_factory() as session:
+            service = ContentService(session)
+            item = await service.create_content(
+                type="article", title="Verrou", slug="versions-verrou", body="v1", created_by=None
+            )
+            await session.commit()
+            item = await service.reload(item)
+            content_id = item.id
+
+            selects: list[str] = []
+            execute = session.execute
+
+            async def recording_execute(statement, *args, **kwargs):
+                if isinstance(statement, Select):
+                    selects.append(str(statement.compile(dialect=postgresql.dialect())))
+                return await execute(statement, *args, **kwargs)
+
+            monkeypatch.setattr(session, "execute", recording_execute)
+            await service.update_content(item, new_body="v2")
+            await session.commit()
+            return selects, await service.next_version_number(content_id)
+
+    selects, next_number = event_loop.run_until_complete(scenario())
+    # SQLite ignores FOR UPDATE; PostgreSQL serialises concurrent edits on this lock.
+    assert any(statement.endswith("FOR UPDATE") and "content_items" in statement for statement in selects)
+    assert next_number == 3
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import csv
+import io
+import json
+
+from fastapi.testclient import TestClient
+
+from app.services.analytics_buffer import event_buffer
+
+
+def test_subscriber_export_streams_ndjson_and_csv(client: TestClient, admin_headers: dict[str, str]) -> None:
+    emails = {f"export-{index}@example.com" for index in range(5)}
+    for email in emails:
+        client.post("/api/newsletter/subscribe", json={"email": email, "source": "export"})
+
+    response = client.get("/api/newsletter/subscribers/export", headers=admin_headers)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert emails <= {row["email"] for row in rows}
+    assert [row["id"] for row in rows] == sorted(row["id"] for row in rows)
+
+    response = client.get("/api/newsletter/subscribers/export?format=csv", headers=admin_headers)
+    assert response.status_code == 200
+    assert 'filename="subscribers.csv"' in response.headers["content-disposition"]
+    reader = csv.DictReader(io.StringIO(response.text))
+    assert reader.fieldnames == ["email", "source", "id", "is_active", "created_at"]
+    assert emails <= {row["email"] for row in reader}
+
+
+def test_orm_exports_include_relationships(client: TestClient, admin_headers: dict[str, str]) -> None:
+    client.post(
+        "/api/media/upload",
+        headers=admin_headers,
+        json={
+            "type": "image",
+            "filename": "export.png",
+            "storage_url": "https://cdn.example.com/export.png",
+            "metadata": {"alt": "Export"},
+            "variants": [{"format": "webp", "url": "https://cdn.example.com/export.webp"}],
+        },
+    )
+
+    response = client.get("/api/media/export", headers=admin_headers)
+    assert response.status_code == 200
+    asset = next(
+        row for row in map(json.loads, response.text.splitlines()) if row["filename"] == "export.png"
+    )
+    assert asset["metadata"] == {"alt": "Export"}
+    assert asset["variants"][0]["format"] == "webp"
+
+    response = client.get("/api/media/export?format=csv", headers=admin_headers)
+    row = next(row for row in csv.DictReader(io.StringIO(response.text)) if row["filename"] == "export.png")
+    assert json.loads(row["variants"])[0]["format"] == "webp"
+
+    response = client.get("/api/users/export", headers=admin_headers)
+    assert response.status_code == 200
+    users = [json.loads(line) for line in response.text.splitlines()]
+    assert any(user["is_superuser"] for user in users)
+
+    client.post("/api/analytics/events", json={"event_type": "export_check", "payload": {"n": 1}})
+    client.portal.call(event_buffer.flush)
+    response = client.get("/api/analytics/events/export?format=csv", headers=admin_headers)
+    assert response.status_code == 200
+    assert "export_check" in response.text
+
+
+def test_export_rejects_unknown_format(client: TestClient, admin_headers: dict[str, str]) -> None:
+    response = client.get("/api/media/export?format=xml", headers=admin_headers)
+    assert response.status_code == 422
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event, select, text
+
+from app.models.content import ContentItem
+from app.services.content import ContentService
+from app.services.fulltext import FTS_TABLE, fts5_query
+
+
+def _create(client: TestClient, headers: dict[str, str], slug: str, title: str, body: str) -> int:
+    response = client.post(
+        "/api/content",
+        headers=headers,
+        json={"type": "article", "title": title, "slug": slug, "body": body},
+    )
+    assert response.status_code == 201
+    return response.json()["id"]
+
+
+def test_fts5_query_quotes_words_as_prefixes() -> None:
+    assert fts5_query('Crue "du" Rhône -OR') == '"Crue"* "du"* "Rhône"* "OR"*'
+    assert fts5_query(" ;-) ") is None
+
+
+def test_search_ranks_title_over_body_and_paginates(client: TestClient, admin_headers: dict[str, str]) -> None:
+    in_body = _create(client, admin_headers, "fts-body", "Météo du jour", "Alerte volcanique sur l'île")
+    in_title = _create(client, admin_headers, "fts-title", "Éruption volcanique", "Les coulées progressent")
+    draft = _create(client, admin_headers, "fts-draft", "Volcanique brouillon", "Pas encore publié")
+    for content_id in (in_body, in_title):
+        assert client.post(f"/api/content/{content_id}/publish", headers=admin_headers).status_code == 200
+
+    response = client.get("/api/search", params={"query": "volcaniq"})
+    assert response.status_code == 200
+    assert [item["id"] for item in response.json()] == [in_title, in_body]
+    assert draft not in [item["id"] for item in response.json()]
+
+    # Accents are folded on both sides.
+    response = client.get("/api/search", params={"query": "eruption"})
+    assert [item["id"] for item in response.json()] == [in_title]
+
+    response = client.get("/api/search", params={"query": "volcanique", "limit": 1, "offset": 1})
+    assert [item["id"] for item in response.json()] == [in_body]
+
+    assert client.get("/api/search", params={"query": "volcanique", "limit": 0}).status_code == 422
+    assert client.get("/api/search", params={"query": "!!"}).json() == []
+
+
+def test_search_follows_updates(client: TestClient, admin_headers: dict[str, str]) -> None:
+    content_id = _create(client, admin_headers, "fts-update", "Conseil municipal", "Ordre du jour chargé")
+    assert client.post(f"/api/content/{content_id}/publish", headers=admin_headers).status_code == 200
+    assert [item["id"] for item in client.get("/api/search", params={"query": "chargé"}).json()] == [content_id]
+
+    response = client.patch(
+        f"/api/content/{content_id}",
+        headers=admin_headers,
+        json={"title": "Séance extraordinaire", "body": "Budget adopté"},
+    )
+    assert response.status_code == 200
+    assert client.get("/api/search", params={"query": "chargé"}).json() == []
+    assert client.get("/api/search", params={"query": "conseil municipal"}).json() == []
+    ids = [item["id"] for item in client.get("/api/search", params={"query": "budget extraordinaire"}).json()]
+    assert ids == [content_id]
+
+    # A title-only edit keeps the latest body searchable.
+    response = client.patch(f"/api/content/{content_id}", headers=admin_headers, json={"title": "Séance close"})
+    assert response.status_code == 200
+    ids = [item["id"] for item in client.get("/api/search", params={"query": "close budget"}).json()]
+    assert ids == [content_id]
+
+
+def test_batch_rebuild_reads_bodies_once(
+    client: TestClient, admin_headers: dict[str, str], async_engine, session_factory, event_loop
+) -> None:
+    ids = [
+        _create(client, admin_headers, f"fts-rebuild-{index}", f"Rebâtir {index}", f"Reconstruction {index}")
+        for index in range(3)
+    ]
+    for content_id in ids:
+        assert client.post(f"/api/content/{content_id}/publish", headers=admin_headers).status_code == 200
+
+    statements: list[str] = []
+
+    def listener(conn, cursor, statement, parameters, context, executemany):
+        if "FROM content_versions" in statement:
+            statements.append(statement)
+
+    async def rebuild() -> None:
+        async with session_factory() as session:
+            await session.execute(text(f"DELETE FROM {FTS_TABLE} WHERE rowid = :id"), [{"id": i} for i in ids])
+            items = list((await session.scalars(select(ContentItem).where(ContentItem.id.in_(ids)))).all())
+            event.listen(async_engine.sync_engine, "before_cursor_execute", listener)
+            try:
+                await ContentService(session).sync_fulltext_many(items)
+            finally:
+                event.remove(async_engine.sync_engine, "before_cursor_execute", listener)
+            await session.commit()
+
+    event_loop.run_until_complete(rebuild())
+    assert len(statements) == 1
+    found = [item["id"] for item in client.get("/api/search", params={"query": "reconstruction"}).json()]
+    assert sorted(found) == ids
@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+from array import array
+
+from fastapi.testclient import TestClient
+
+from app.services import local_search
+from app.services.local_search import LocalIndexRefresher, LocalSearchIndex, fold, local_index, sync_from_db
+from app.services.search import SearchService, search_service
+
+
+def _index() -> LocalSearchIndex:
+    index = LocalSearchIndex()
+    index.add(1, "Élection municipale à Lyon", "Le maire sortant est réélu au second tour.")
+    index.add(2, "Météo du week-end", "Pas d'élection, mais beaucoup de pluie.")
+    index.add(3, "Sport", "Victoire de l'Olympique lyonnais.")
+    return index
+
+
+def test_fold_strips_accents_and_case() -> None:
+    assert fold("Élection à Noël, ÇA") == "election a noel, ca"
+
+
+def test_bm25_prefix_and_accent_folding() -> None:
+    index = _index()
+    assert [hit["id"] for hit in index.search("election")] == [1, 2]
+    assert [hit["id"] for hit in index.search("ELECT")] == [1, 2]
+    # Every word must match; "lyon" also prefixes "lyonnais".
+    assert [hit["id"] for hit in index.search("lyon")] == [1, 3]
+    assert [hit["id"] for hit in index.search("lyon maire")] == [1]
+    assert index.search("inconnu") == []
+    assert [hit["id"] for hit in index.search("election", limit=1, offset=1)] == [2]
+
+
+def test_updates_tombstone_and_compact() -> None:
+    index = _index()
+    index.add(1, "Conseil", "Budget voté")
+    index.remove(3)
+    assert [hit["id"] for hit in index.search("election")] == [2]
+    assert [hit["id"] for hit in index.search("budget")] == [1]
+    assert len(index) == 2
+
+    index.compact()
+    assert [hit["id"] for hit in index.search("budget")] == [1]
+    assert all(isinstance(docs, array) for docs, _ in index._terms.values())
+
+
+def test_snapshot_round_trip_is_memory_mapped(tmp_path) -> None:
+    index = _index()
+    index.remove(3)
+    index.save(tmp_path / "snapshot")
+
+    restored = LocalSearchIndex().load(tmp_path / "snapshot")
+    assert len(restored) == 2
+    assert restored._maps
+    assert isinstance(restored._terms["election"][0], memoryview)
+    assert restored.search("election") == index.search("election")
+
+    restored.add(4, "Élection présidentielle")
+    assert isinstance(restored._terms["election"][0], array)
+    assert [hit["id"] for hit in restored.search("presid")] == [4]
+
+    # Overwriting a snapshot that is currently mapped is safe.
+    restored.save(tmp_path / "snapshot")
+    assert len(LocalSearchIndex().load(tmp_path / "snapshot")) == 3
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["snapshot"]
+
+    # Reloading closes the maps of the snapshot loaded before.
+    maps = list(restored.load(tmp_path / "snapshot")._maps)
+    restored.load(tmp_path / "snapshot")
+    assert maps and all(mapped.closed for mapped in maps)
+    assert len(restored) == 3
+
+
+def test_prefix_expansion_keeps_the_most_common_terms(monkeypatch) -> None:
+    monkeypatch.setattr(local_search, "MAX_PREFIX_EXPANSIONS", 2)
+    index = LocalSearchIndex()
+    index.add(1, "Para", "parapluie")
+    index.add(2, "Parc", "parapluie")
+    index.add(3, "Parcours", "paragraphe parapluie")
+    index.add(4, "Parcours", "pare-brise")
+    # "par" prefixes six terms; only the most frequent completions are searched.
+    assert sorted(index._expand("par")) == ["parapluie", "parcours"]
+    assert sorted(hit["id"] for hit in index.search("par")) == [1, 2, 3, 4]
+    # The exact word is always kept.
+    assert index._expand("para")[0] == "para"
+
+
+def test_local_provider_syncs_published_content(
+    client: TestClient, admin_headers: dict[str, str], session_factory, event_loop, monkeypatch
+) -> None:
+    ids = []
+    for slug, title in (("local-published", "Festival de jazz"), ("local-draft", "Jazz en brouillon")):
+        response = client.post(
+            "/api/content",
+            headers=admin_headers,
+            json={"type": "article", "title": title, "slug": slug, "body": "Programmation estivale"},
+        )
+        assert response.status_code == 201
+        ids.append(response.json()["id"])
+    assert client.post(f"/api/content/{ids[0]}/publish", headers=admin_headers).status_code == 200
+
+    async def sync() -> int:
+        async with session_factory() as session:
+            return await sync_from_db(local_index, session)
+
+    assert event_loop.run_until_complete(sync()) >= 2
+    assert ids[0] in local_index and ids[1] not in local_index
+    # Nothing changed since the watermark: the periodic refresh has nothing to do.
+    refresher = LocalIndexRefresher(local_index, session_factory=session_factory)
+    assert event_loop.run_until_complete(refresher.refresh()) == 0
+
+    monkeypatch.setattr(search_service, "provider", "local")
+    monkeypatch.setattr(search_service, "client", local_index)
+    response = client.get("/api/search", params={"query": "estivale jazz"})
+    assert response.status_code == 200
+    assert [item["id"] for item in response.json()] == [ids[0]]
+
+
+def test_local_provider_indexes_into_empty_index(event_loop, monkeypatch) -> None:
+    index = LocalSearchIndex()
+    service = SearchService()
+    monkeypatch.setattr(service, "provider", "local")
+    monkeypatch.setattr(service, "client", index)
+    assert len(index) == 0
+
+    async def scenario() -> None:
+        await service.index_articles([{"id": 901, "title": "Marché de Noël", "body": "Chalets et vin chaud"}])
+        assert [hit["id"] for hit in await service.search_articles("chalets")] == [901]
+        await service.remove_articles([901])
+        assert 901 not in index
+
+    event_loop.run_until_complete(scenario())
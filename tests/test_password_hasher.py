@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import asyncio
+from uuid import uuid4
+
+from fastapi.testclient import TestClient
+from passlib.context import CryptContext
+
+from app.core.security import pwd_context
+from app.models.user import User
+from app.services.passwords import HasherBusy, PasswordHasher, password_hasher
+
+
+def test_hasher_rejects_when_saturated(event_loop) -> None:
+    hasher = PasswordHasher(max_workers=1, max_pending=1)
+
+    async def burst():
+        return await asyncio.gather(hasher.hash("secret-1"), hasher.hash("secret-2"), return_exceptions=True)
+
+    first, second = event_loop.run_until_complete(burst())
+    hasher.close()
+    assert pwd_context.verify("secret-1", first)
+    assert isinstance(second, HasherBusy)
+    assert hasher.pending == 0
+
+
+def test_login_returns_503_when_hashing_is_saturated(client: TestClient, monkeypatch) -> None:
+    email = f"busy-{uuid4().hex[:8]}@example.com"
+    assert client.post("/api/auth/signup", json={"email": email, "password": "password123"}).status_code == 201
+    monkeypatch.setattr(password_hasher, "max_pending", 0)
+    response = client.post("/api/auth/login", json={"email": email, "password": "password123"})
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+
+
+def test_login_rehashes_outdated_hashes(client: TestClient, session_factory, event_loop, monkeypatch) -> None:
+    rounds = 1000
+    email = f"rehash-{uuid4().hex[:8]}@example.com"
+    response = client.post("/api/auth/signup", json={"email": email, "password": "password123"})
+    user_id = response.json()["user_id"]
+    context = CryptContext(
+        schemes=["pbkdf2_sha256"],
+        pbkdf2_sha256__default_rounds=rounds,
+        pbkdf2_sha256__min_rounds=rounds,
+        pbkdf2_sha256__max_rounds=rounds,
+    )
+    monkeypatch.setattr(password_hasher, "context", context)
+
+    async def stored_hash() -> str:
+        async with session_factory() as session:
+            return (await session.get(User, user_id)).hashed_password
+
+    assert not event_loop.run_until_complete(stored_hash()).startswith(f"$pbkdf2-sha256${rounds}$")
+    assert client.post("/api/auth/login", json={"email": email, "password": "password123"}).status_code == 200
+    rehashed = event_loop.run_until_complete(stored_hash())
+    assert rehashed.startswith(f"$pbkdf2-sha256${rounds}$")
+    assert client.post("/api/auth/login", json={"email": email, "password": "password123"}).status_code == 200
+    assert event_loop.run_until_complete(stored_hash()) == rehashed
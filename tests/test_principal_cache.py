@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
+from uuid import uuid4
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from app.core.config import settings
+from app.services.auth import AuthService
+from app.services.cache import content_cache
+from app.services.principal import principal_cache
+
+
+@contextmanager
+def count_user_queries(engine):
+    statements: list[str] = []
+
+    def listener(conn, cursor, statement, parameters, context, executemany):
+        if "FROM users" in statement:
+            statements.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", listener)
+    try:
+        yield statements
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", listener)
+
+
+def _role_id(session_factory, event_loop, name: str) -> int:
+    async def get_or_create() -> int:
+        async with session_factory() as session:
+            role = await AuthService(session).get_or_create_role(name)
+            await session.commit()
+            return role.id
+
+    return event_loop.run_until_complete(get_or_create())
+
+
+def _member(client: TestClient) -> tuple[int, dict[str, str]]:
+    email = f"member-{uuid4().hex[:8]}@example.com"
+    response = client.post("/api/auth/signup", json={"email": email, "password": "password123"})
+    assert response.status_code == 201
+    user_id = response.json()["user_id"]
+    response = client.post("/api/auth/login", json={"email": email, "password": "password123"})
+    return user_id, {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+def test_principal_is_cached_and_invalidated(
+    client: TestClient, admin_headers: dict[str, str], async_engine, session_factory, event_loop
+) -> None:
+    editor = _role_id(session_factory, event_loop, "editor")
+    user_id, headers = _member(client)
+    assert client.get("/api/media", headers=headers).status_code == 403
+
+    assert client.patch(f"/api/users/{user_id}", headers=admin_headers, json={"role_ids": [editor]}).status_code == 200
+    with count_user_queries(async_engine) as queries:
+        assert client.get("/api/media", headers=headers).status_code == 200
+        cold = len(queries)
+        assert cold
+        assert client.get("/api/media", headers=headers).status_code == 200
+        # Warm requests resolve roles without touching the database.
+        assert len(queries) == cold
+
+    # Changing a role's permissions drops the cached principal of every holder.
+    async def update_role() -> None:
+        async with session_factory() as session:
+            service = AuthService(session)
+            await service.update_role(await service.get_role_by_name("editor"), permission_codes=[])
+            await session.commit()
+
+    event_loop.run_until_complete(update_role())
+    with count_user_queries(async_engine) as queries:
+        assert client.get("/api/media", headers=headers).status_code == 200
+        assert len(queries) == cold
+
+    assert client.patch(f"/api/users/{user_id}", headers=admin_headers, json={"role_ids": []}).status_code == 200
+    assert client.get("/api/media", headers=headers).status_code == 403
+
+    assert client.patch(f"/api/users/{user_id}", headers=admin_headers, json={"is_active": False}).status_code == 200
+    assert client.get("/api/auth/me", headers=headers).status_code == 403
+
+    assert client.delete(f"/api/users/{user_id}", headers=admin_headers).status_code == 204
+    assert client.get("/api/auth/me", headers=headers).status_code == 401
+
+
+def test_principal_is_invalidated_only_after_commit(
+    client: TestClient, session_factory, event_loop
+) -> None:
+    assert principal_cache.backend is not content_cache.backend
+    assert principal_cache.backend.max_entries == settings.auth_cache_max_entries
+
+    user_id, headers = _member(client)
+    assert client.get("/api/auth/me", headers=headers).status_code == 200
+
+    async def deactivate(*, commit: bool) -> bytes | None:
+        async with session_factory() as session:
+            service = AuthService(session)
+            await service.update_user(await service.get_user(user_id), is_active=False)
+            # Concurrent requests keep the committed principal until the change lands.
+            assert await principal_cache.get(str(user_id)) is not None
+            if commit:
+                await session.commit()
+            else:
+                await session.rollback()
+        return await principal_cache.get(str(user_id))
+
+    assert event_loop.run_until_complete(deactivate(commit=False)) is not None
+    assert event_loop.run_until_complete(deactivate(commit=True)) is None
+    assert client.get("/api/auth/me", headers=headers).status_code == 403
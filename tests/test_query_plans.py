@@ -0,0 +1,70 @@
+"""EXPLAIN QUERY PLAN regression checks for hot queries.
+
+Each case runs the real service call, captures the SELECTs and DELETEs it
+emits and asks SQLite for their plan. A bare ``SCAN <table>`` (no index) or a temporary
+B-tree for ORDER BY fails the test.
+"""
+
+from __future__ import annotations
+
+import re
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import event
+
+from app.services.analytics import AnalyticsService
+from app.services.auth import AuthService
+from app.services.seo import SEOService, _cache_key, sitemap_cache
+
+FULL_SCAN = re.compile(r"^SCAN (\w+)$")
+
+
+@contextmanager
+def capture_selects(engine):
+    statements: list[tuple[str, tuple]] = []
+
+    def listener(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith(("SELECT", "DELETE")):
+            statements.append((statement, tuple(parameters or ())))
+
+    event.listen(engine.sync_engine, "before_cursor_execute", listener)
+    try:
+        yield statements
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", listener)
+
+
+async def _plan(engine, statement: str, parameters: tuple) -> list[str]:
+    async with engine.connect() as conn:
+        result = await conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)
+        return [row[-1] for row in result]
+
+
+async def _sitemap_shards(session):
+    await sitemap_cache.invalidate(_cache_key("shards"))
+    return await SEOService(session).sitemap_shards()
+
+
+HOT_QUERIES = {
+    "sitemap_shard": lambda session: SEOService(session).sitemap_entries(0),
+    "sitemap_shards": _sitemap_shards,
+    "seo_metadata_by_content": lambda session: SEOService(session).get_metadata(1),
+    "recent_events": lambda session: AnalyticsService(session).list_event_rows(),
+    "reset_token_consume": lambda session: AuthService(session).consume_reset_token("token"),
+}
+
+
+@pytest.mark.parametrize("name", sorted(HOT_QUERIES))
+def test_hot_query_avoids_full_scan(name: str, async_engine, session_factory, event_loop) -> None:
+    async def scenario() -> list[tuple[str, list[str]]]:
+        with capture_selects(async_engine) as statements:
+            async with session_factory() as session:
+                await HOT_QUERIES[name](session)
+        assert statements, f"{name} issued no query"
+        return [(statement, await _plan(async_engine, statement, parameters)) for statement, parameters in statements]
+
+    for statement, plan in event_loop.run_until_complete(scenario()):
+        scans = [detail for detail in plan if FULL_SCAN.match(detail)]
+        sorts = [detail for detail in plan if "TEMP B-TREE" in detail]
+        assert not scans and not sorts, f"{name}: {plan}\n{statement}"
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+
+from app.core.security import decode_refresh_token
+from app.models.user import RefreshToken
+from app.services.refresh_tokens import RefreshTokenStore, RevokedFamilies
+
+
+def _login(client: TestClient) -> tuple[str, dict]:
+    email = f"session-{uuid4().hex[:8]}@example.com"
+    assert client.post("/api/auth/signup", json={"email": email, "password": "password123"}).status_code == 201
+    response = client.post("/api/auth/login", json={"email": email, "password": "password123"})
+    assert response.status_code == 200
+    return email, response.json()
+
+
+def _bearer(tokens: dict) -> dict[str, str]:
+    return {"Authorization": f"Bearer {tokens['access_token']}"}
+
+
+def test_rotation_and_reuse_detection(client: TestClient, session_factory, event_loop) -> None:
+    _, first = _login(client)
+    # Refresh tokens are not bearer credentials.
+    assert client.get("/api/auth/me", headers={"Authorization": f"Bearer {first['refresh_token']}"}).status_code == 401
+
+    response = client.post("/api/auth/refresh", json={"refresh_token": first["refresh_token"]})
+    assert response.status_code == 200
+    second = response.json()
+    family = decode_refresh_token(first["refresh_token"])["jti"]
+    assert decode_refresh_token(second["refresh_token"])["fam"] == family
+    assert client.get("/api/auth/me", headers=_bearer(second)).status_code == 200
+
+    # Replaying the consumed token revokes the whole family, including the live tokens.
+    response = client.post("/api/auth/refresh", json={"refresh_token": first["refresh_token"]})
+    assert response.status_code == 401 and response.json()["detail"] == "Refresh token reuse detected"
+    assert client.post("/api/auth/refresh", json={"refresh_token": second["refresh_token"]}).status_code == 401
+    response = client.get("/api/auth/me", headers=_bearer(second))
+    assert response.status_code == 401 and response.json()["detail"] == "Session revoked"
+
+    # Another worker picks the revocation up from the table.
+    async def reload() -> RevokedFamilies:
+        revoked = RevokedFamilies()
+        async with session_factory() as session:
+            await revoked.refresh(session)
+        return revoked
+
+    assert family in event_loop.run_until_complete(reload())
+
+
+def test_logout_revokes_session(client: TestClient) -> None:
+    _, tokens = _login(client)
+    assert client.post("/api/auth/logout", headers=_bearer(tokens)).status_code == 204
+    assert client.get("/api/auth/me", headers=_bearer(tokens)).status_code == 401
+    assert client.post("/api/auth/refresh", json={"refresh_token": tokens["refresh_token"]}).status_code == 401
+    assert client.post("/api/auth/logout").status_code == 204
+
+
+def test_compaction_drops_expired_tokens(client: TestClient, session_factory, event_loop) -> None:
+    _, tokens = _login(client)
+    jti = decode_refresh_token(tokens["refresh_token"])["jti"]
+
+    async def expire_and_compact() -> list[str]:
+        async with session_factory() as session:
+            row = await session.get(RefreshToken, jti)
+            row.expires_at = datetime.utcnow() - timedelta(seconds=1)
+            store = RefreshTokenStore(session, revoked=RevokedFamilies())
+            await store.revoke_family(jti)
+            assert jti in store.revoked
+            assert await store.compact() >= 1
+            assert jti not in store.revoked
+            await session.commit()
+            return list((await session.scalars(select(RefreshToken.jti).where(RefreshToken.jti == jti))).all())
+
+    assert event_loop.run_until_complete(expire_and_compact()) == []
+    assert client.post("/api/auth/refresh", json={"refresh_token": tokens["refresh_token"]}).status_code == 401
@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.models.search import SearchOutbox
+from app.services.search import search_service
+from app.services.search_indexer import SearchIndexer, reindex
+
+
+@pytest.fixture
+def engine_configured(monkeypatch) -> None:
+    """Pretend an engine client exists so content writes enqueue outbox rows."""
+
+    monkeypatch.setattr(search_service, "client", object())
+
+
+class RecordingSearch:
+    def __init__(self) -> None:
+        self.batches: list[list[dict]] = []
+        self.removed: list[int] = []
+        self.fail = False
+
+    async def index_articles(self, articles: list[dict]) -> None:
+        if self.fail:
+            raise ConnectionError("engine down")
+        if articles:
+            self.batches.append(articles)
+
+    async def remove_articles(self, ids) -> None:
+        if self.fail:
+            raise ConnectionError("engine down")
+        self.removed.extend(ids)
+
+
+def _create(client: TestClient, headers: dict[str, str], slug: str) -> int:
+    response = client.post(
+        "/api/content",
+        headers=headers,
+        json={"type": "article", "title": f"Titre {slug}", "slug": slug, "body": "Premier jet"},
+    )
+    assert response.status_code == 201
+    return response.json()["id"]
+
+
+def _pending(session_factory, event_loop, content_id: int) -> list[SearchOutbox]:
+    async def load():
+        async with session_factory() as session:
+            stmt = select(SearchOutbox).where(SearchOutbox.content_id == content_id)
+            return list((await session.scalars(stmt)).all())
+
+    return event_loop.run_until_complete(load())
+
+
+def test_outbox_coalesces_and_retries(
+    client: TestClient, admin_headers: dict[str, str], session_factory, event_loop, engine_configured
+) -> None:
+    published = _create(client, admin_headers, "outbox-published")
+    draft = _create(client, admin_headers, "outbox-draft")
+    # A draft creation does not touch the engine.
+    assert _pending(session_factory, event_loop, draft) == []
+
+    assert client.post(f"/api/content/{published}/publish", headers=admin_headers).status_code == 200
+    for body in ("Deuxième jet", "Version finale"):
+        response = client.patch(f"/api/content/{published}", headers=admin_headers, json={"body": body})
+        assert response.status_code == 200
+    assert client.patch(f"/api/content/{draft}", headers=admin_headers, json={"title": "Brouillon"}).status_code == 200
+    assert len(_pending(session_factory, event_loop, published)) == 3
+
+    search = RecordingSearch()
+    indexer = SearchIndexer(search=search, batch_size=500, session_factory=session_factory)
+
+    search.fail = True
+    assert event_loop.run_until_complete(indexer.drain()) >= 4
+    rows = _pending(session_factory, event_loop, published)
+    assert [row.attempts for row in rows] == [1, 1, 1]
+    assert all(row.available_at.replace(tzinfo=None) > datetime.utcnow() for row in rows)
+    assert "engine down" in rows[0].last_error
+    # Rows backing off are not picked up again immediately.
+    assert event_loop.run_until_complete(indexer.drain()) == 0
+
+    async def make_due() -> None:
+        async with session_factory() as session:
+            for row in (await session.scalars(select(SearchOutbox))).all():
+                row.available_at = datetime.utcnow()
+            await session.commit()
+
+    event_loop.run_until_complete(make_due())
+    search.fail = False
+    event_loop.run_until_complete(indexer.drain())
+
+    documents = [document for batch in search.batches for document in batch if document["id"] == published]
+    assert len(documents) == 1
+    assert documents[0]["body"] == "Version finale"
+    assert documents[0]["slug"] == "outbox-published"
+    assert draft in search.removed
+    assert _pending(session_factory, event_loop, published) == []
+    assert _pending(session_factory, event_loop, draft) == []
+
+
+def test_reindex_streams_published_items_in_chunks(
+    client: TestClient, admin_headers: dict[str, str], session_factory, event_loop
+) -> None:
+    ids = [_create(client, admin_headers, f"reindex-{index}") for index in range(3)]
+    for content_id in ids:
+        assert client.post(f"/api/content/{content_id}/publish", headers=admin_headers).status_code == 200
+
+    search = RecordingSearch()
+    total = event_loop.run_until_complete(reindex(search=search, chunk_size=2, session_factory=session_factory))
+    assert total == sum(len(batch) for batch in search.batches)
+    assert all(len(batch) <= 2 for batch in search.batches)
+    indexed = [document["id"] for batch in search.batches for document in batch]
+    assert set(ids) <= set(indexed)
+    assert indexed == sorted(indexed)
+
+
+def test_batch_is_claimed_and_committed_before_the_engine_call(
+    client: TestClient, admin_headers: dict[str, str], session_factory, event_loop, monkeypatch, engine_configured
+) -> None:
+    content_id = _create(client, admin_headers, "outbox-claimed")
+    assert client.post(f"/api/content/{content_id}/publish", headers=admin_headers).status_code == 200
+    seen: list[list[SearchOutbox]] = []
+
+    class ObservingSearch(RecordingSearch):
+        async def index_articles(self, articles: list[dict]) -> None:
+            # Another worker sees the claim while the engine request is in flight.
+            async with session_factory() as session:
+                stmt = select(SearchOutbox).where(SearchOutbox.content_id == content_id)
+                seen.append(list((await session.scalars(stmt)).all()))
+            await super().index_articles(articles)
+
+    indexer = SearchIndexer(search=ObservingSearch(), batch_size=500, lease=60, session_factory=session_factory)
+    event_loop.run_until_complete(indexer.drain())
+    assert seen and all(row.available_at.replace(tzinfo=None) > datetime.utcnow() for row in seen[0])
+    assert _pending(session_factory, event_loop, content_id) == []
+
+    # With the in-process provider every worker refreshes its own index instead.
+    monkeypatch.setattr(settings, "search_provider", "local")
+    local = _create(client, admin_headers, "outbox-local")
+    assert client.post(f"/api/content/{local}/publish", headers=admin_headers).status_code == 200
+    assert _pending(session_factory, event_loop, local) == []
+
+
+def test_outbox_stays_empty_without_an_engine(
+    client: TestClient, admin_headers: dict[str, str], session_factory, event_loop
+) -> None:
+    assert search_service.client is None
+    content_id = _create(client, admin_headers, "outbox-no-engine")
+    assert client.post(f"/api/content/{content_id}/publish", headers=admin_headers).status_code == 200
+    response = client.patch(f"/api/content/{content_id}", headers=admin_headers, json={"body": "Encore"})
+    assert response.status_code == 200
+    assert _pending(session_factory, event_loop, content_id) == []
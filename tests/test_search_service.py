@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+import asyncio
+import time
+
+import pytest
+from sqlalchemy import event
+
+from app.services.search import SearchService, get_search_service, search_service
+
+
+class SlowIndex:
+    def __init__(self, delay: float) -> None:
+        self.delay = delay
+
+    def search(self, query: str, params: dict) -> dict:
+        time.sleep(self.delay)
+        return {"hits": [{"id": 7, "_formatted": {"id": "7", "body": f"… du <mark>{query}</mark> …"}}]}
+
+    def add_documents(self, documents: list[dict]) -> None:
+        time.sleep(self.delay)
+
+
+class SlowClient:
+    def __init__(self, delay: float) -> None:
+        self.delay = delay
+
+    def index(self, name: str) -> SlowIndex:
+        return SlowIndex(self.delay)
+
+
+def _service(delay: float, timeout: float) -> SearchService:
+    service = SearchService(timeout=timeout, max_workers=2)
+    service.provider = "meilisearch"
+    service.client = SlowClient(delay)
+    return service
+
+
+def test_search_runs_off_the_event_loop(event_loop) -> None:
+    service = _service(delay=0.2, timeout=1.0)
+    ticks = 0
+
+    async def ticker() -> None:
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    async def scenario():
+        task = asyncio.ensure_future(ticker())
+        try:
+            return await service.search_articles("jazz")
+        finally:
+            task.cancel()
+
+    try:
+        assert event_loop.run_until_complete(scenario()) == [{"id": 7, "snippet": "… du <mark>jazz</mark> …"}]
+    finally:
+        service.close()
+    assert ticks >= 5
+
+
+def test_search_timeout_signals_fallback(event_loop) -> None:
+    service = _service(delay=0.5, timeout=0.05)
+    try:
+        started = time.perf_counter()
+        assert event_loop.run_until_complete(service.search_articles("jazz")) is None
+        assert time.perf_counter() - started < 0.4
+        with pytest.raises(asyncio.TimeoutError):
+            event_loop.run_until_complete(service.index_article({"id": 1, "title": "Jazz"}))
+    finally:
+        service.close()
+
+
+def test_search_service_is_shared() -> None:
+    assert get_search_service() is get_search_service()
+
+
+class RankedIndex:
+    def __init__(self, ids: list[int]) -> None:
+        self.ids = ids
+        self.params: dict = {}
+
+    def search(self, query: str, params: dict) -> dict:
+        self.params = params
+        page = self.ids[params["offset"] : params["offset"] + params["limit"]]
+        hits = [{"id": content_id, "_formatted": {"body": f"<mark>{content_id}</mark>"}} for content_id in page]
+        return {"hits": hits}
+
+
+def test_engine_hits_are_hydrated_in_rank_order(client, admin_headers, async_engine, monkeypatch) -> None:
+    ids = []
+    for index in range(3):
+        response = client.post(
+            "/api/content",
+            headers=admin_headers,
+            json={"type": "article", "title": f"Rang {index}", "slug": f"hydrate-{index}", "body": "Texte"},
+        )
+        ids.append(response.json()["id"])
+    for content_id in ids[:2]:
+        assert client.post(f"/api/content/{content_id}/publish", headers=admin_headers).status_code == 200
+
+    # Engine order: newest first, a stale id that no longer exists, and an unpublished draft.
+    index = RankedIndex([ids[1], 999_999, ids[2], ids[0]])
+    monkeypatch.setattr(search_service, "provider", "meilisearch")
+    monkeypatch.setattr(search_service, "client", type("Client", (), {"index": lambda self, name: index})())
+
+    statements: list[str] = []
+
+    def listener(conn, cursor, statement, parameters, context, executemany):
+        if "FROM content_items" in statement:
+            statements.append(statement)
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", listener)
+    try:
+        response = client.get("/api/search", params={"query": "rang", "limit": 4})
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", listener)
+    assert response.status_code == 200
+    assert [(item["id"], item["snippet"]) for item in response.json()] == [
+        (ids[1], f"<mark>{ids[1]}</mark>"),
+        (ids[0], f"<mark>{ids[0]}</mark>"),
+    ]
+    assert len(statements) == 1
+    assert index.params["limit"] == 4
+
+    response = client.get("/api/search", params={"query": "rang", "limit": 1, "offset": 3})
+    assert [item["id"] for item in response.json()] == [ids[0]]
+    assert index.params["offset"] == 3
+
+
+class RecordedMeiliIndex:
+    """Replays a Meilisearch 1.x response, which only formats attributes that are retrieved."""
+
+    RESPONSE = {
+        "hits": [
+            {
+                "id": 42,
+                "body": "Le conseil municipal a voté le budget du festival de jazz pour l'été prochain.",
+                "_formatted": {
+                    "id": "42",
+                    "body": "…a voté le budget du festival de <mark>jazz</mark> pour l'été…",
+                },
+            }
+        ],
+        "query": "jazz",
+        "processingTimeMs": 1,
+        "limit": 20,
+        "offset": 0,
+        "estimatedTotalHits": 1,
+    }
+
+    def search(self, query: str, params: dict) -> dict:
+        retrieved = set(params["attributesToRetrieve"])
+        return {
+            **self.RESPONSE,
+            "hits": [
+                {
+                    **{key: value for key, value in hit.items() if key in retrieved},
+                    "_formatted": {key: value for key, value in hit["_formatted"].items() if key in retrieved},
+                }
+                for hit in self.RESPONSE["hits"]
+            ],
+        }
+
+
+def test_meilisearch_snippet_comes_from_formatted_body(monkeypatch) -> None:
+    service = SearchService()
+    monkeypatch.setattr(service, "provider", "meilisearch")
+    monkeypatch.setattr(service, "client", type("Client", (), {"index": lambda self, name: RecordedMeiliIndex()})())
+
+    hits = asyncio.run(service.search_articles("jazz"))
+    assert hits == [{"id": 42, "snippet": "…a voté le budget du festival de <mark>jazz</mark> pour l'été…"}]
+    service.close()
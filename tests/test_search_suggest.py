@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+from datetime import timedelta
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event, update
+
+from app.models.content import ContentItem
+from app.services.content import ContentService
+from app.services.suggest import SuggestIndex, suggest_index
+
+
+def test_prefix_index_ranks_leading_matches_first() -> None:
+    index = SuggestIndex()
+    index.put("content", 1, "Élection municipale à Lyon", "election-lyon")
+    index.put("content", 2, "Lyon sous la neige", "lyon-neige")
+    index.put("category", 3, "Élections", "elections")
+
+    assert [item.id for item in index.suggest("lyo")] == [2, 1]
+    assert [item.id for item in index.suggest("ELEC")] == [3, 1]
+    assert [item.id for item in index.suggest("municipale a")] == [1]
+    assert index.suggest("  ") == []
+
+    index.put("content", 2, "Grenoble sous la neige", "grenoble-neige")
+    assert [item.id for item in index.suggest("lyo")] == [1]
+    index.put_content(SimpleNamespace(id=1, status="archived", title="Élection", slug="election-lyon"))
+    assert index.suggest("lyo") == []
+    assert len(index) == 2
+
+
+def test_suggest_endpoint_follows_publish_without_db(
+    client: TestClient, admin_headers: dict[str, str], async_engine
+) -> None:
+    response = client.post(
+        "/api/content/categories", headers=admin_headers, json={"name": "Zoologie", "slug": "zoologie-suggest"}
+    )
+    assert response.status_code == 201
+    response = client.post(
+        "/api/content",
+        headers=admin_headers,
+        json={"type": "article", "title": "Zèbres du zoo", "slug": "zebres-suggest", "body": "Rayures"},
+    )
+    content_id = response.json()["id"]
+    assert client.get("/api/search/suggest", params={"q": "zeb"}).json() == []
+
+    assert client.post(f"/api/content/{content_id}/publish", headers=admin_headers).status_code == 200
+
+    statements: list[str] = []
+
+    def listener(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", listener)
+    try:
+        response = client.get("/api/search/suggest", params={"q": "zeb"})
+        categories = client.get("/api/search/suggest", params={"q": "zoolo"})
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", listener)
+    assert response.status_code == 200
+    assert response.json() == [
+        {"type": "content", "id": content_id, "label": "Zèbres du zoo", "slug": "zebres-suggest"}
+    ]
+    assert [item["slug"] for item in categories.json()] == ["zoologie-suggest"]
+    assert statements == []
+
+    assert client.get("/api/search/suggest", params={"q": "zoo", "limit": 0}).status_code == 422
+
+
+def test_refresh_overlaps_watermark_and_skips_rolled_back_content(
+    client: TestClient, admin_headers: dict[str, str], session_factory, event_loop
+) -> None:
+    async def create_and_roll_back() -> None:
+        async with session_factory() as session:
+            await ContentService(session).create_content(
+                type="article", title="Yacht fantôme", slug="yacht-rollback", body="Brouillard",
+                created_by=None, status="published",
+            )
+            await session.rollback()
+
+    event_loop.run_until_complete(create_and_roll_back())
+    assert suggest_index.suggest("yacht") == []
+
+    index = SuggestIndex()
+
+    async def refresh() -> int:
+        async with session_factory() as session:
+            return await index.refresh(session)
+
+    event_loop.run_until_complete(refresh())
+    watermark = index.watermark
+    response = client.post(
+        "/api/content",
+        headers=admin_headers,
+        json={"type": "article", "title": "Yourte tardive", "slug": "yourte-suggest", "body": "Steppe"},
+    )
+    content_id = response.json()["id"]
+    assert client.post(f"/api/content/{content_id}/publish", headers=admin_headers).status_code == 200
+
+    async def backdate() -> None:
+        # A transaction that committed late, with an updated_at older than the watermark.
+        async with session_factory() as session:
+            await session.execute(
+                update(ContentItem)
+                .where(ContentItem.id == content_id)
+                .values(updated_at=watermark - timedelta(seconds=10))
+            )
+            await session.commit()
+
+    event_loop.run_until_complete(backdate())
+    assert event_loop.run_until_complete(refresh()) == 1
+    assert [item.id for item in index.suggest("yourte")] == [content_id]
+    assert event_loop.run_until_complete(refresh()) == 0
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+from fastapi.testclient import TestClient
+from sqlalchemy import select, update
+
+from app.commands.recalculate_seo import run
+from app.models.content import ContentItem
+from app.models.job import JobCheckpoint
+from app.models.seo import SEOMetadata
+
+
+def _create(client: TestClient, headers: dict[str, str], slug: str, body: str) -> int:
+    response = client.post(
+        "/api/content",
+        headers=headers,
+        json={"type": "article", "title": f"Titre {slug}", "slug": slug, "body": body},
+    )
+    assert response.status_code == 201
+    return response.json()["id"]
+
+
+def _metadata(session_factory, event_loop, ids: list[int]) -> dict[int, SEOMetadata]:
+    async def load():
+        async with session_factory() as session:
+            rows = await session.scalars(select(SEOMetadata).where(SEOMetadata.content_id.in_(ids)))
+            return {row.content_id: row for row in rows}
+
+    return event_loop.run_until_complete(load())
+
+
+def test_recalculation_upserts_latest_body_and_resumes(
+    client: TestClient, admin_headers: dict[str, str], session_factory, event_loop
+) -> None:
+    ids = [_create(client, admin_headers, f"seo-recalc-{index}", f"Premier jet {index}") for index in range(3)]
+    response = client.patch(f"/api/content/{ids[0]}", headers=admin_headers, json={"body": "Version finale"})
+    assert response.status_code == 200
+
+    handled = event_loop.run_until_complete(run(chunk_size=2, restart=True, session_factory=session_factory))
+    assert handled >= 3
+    metadata = _metadata(session_factory, event_loop, ids)
+    assert metadata[ids[0]].meta_description == "Version finale"
+    assert metadata[ids[1]].meta_title == "Titre seo-recalc-1"
+    assert metadata[ids[2]].canonical_url == "/content/seo-recalc-2"
+
+    async def interrupt_after(last_id: int) -> None:
+        async with session_factory() as session:
+            await session.execute(
+                update(ContentItem).where(ContentItem.id.in_(ids)).values(title=ContentItem.title + " (bis)")
+            )
+            session.add(JobCheckpoint(name="seo_recalculate", last_id=last_id, processed=2))
+            await session.commit()
+
+    event_loop.run_until_complete(interrupt_after(ids[1]))
+    event_loop.run_until_complete(run(chunk_size=2, session_factory=session_factory))
+    metadata = _metadata(session_factory, event_loop, ids)
+    # Items before the checkpoint are not reprocessed; the rest are, and the checkpoint is cleared.
+    assert metadata[ids[1]].meta_title == "Titre seo-recalc-1"
+    assert metadata[ids[2]].meta_title == "Titre seo-recalc-2 (bis)"
+
+    async def checkpoint():
+        async with session_factory() as session:
+            return await session.get(JobCheckpoint, "seo_recalculate")
+
+    assert event_loop.run_until_complete(checkpoint()) is None
@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+from datetime import datetime
+from types import SimpleNamespace
+
+from fastapi.testclient import TestClient
+
+from app.core.serialization import dump_json
+from app.schemas.seo import SitemapEntry
+from app.services.analytics_buffer import event_buffer
+
+
+def test_dump_json_validates_once_from_attributes() -> None:
+    entries = [SimpleNamespace(slug=" a ", type="article", last_modified=None)]
+    assert dump_json(list[SitemapEntry], entries) == b'[{"slug":"a","type":"article","last_modified":null}]'
+
+
+def test_read_only_lists_use_raw_json(client: TestClient, admin_headers: dict[str, str]) -> None:
+    client.post("/api/newsletter/subscribe", json={"email": "fast-path@example.com", "source": "test"})
+    client.post(
+        "/api/analytics/events",
+        json={"event_type": "page_view", "occurred_at": datetime(2026, 1, 1).isoformat()},
+    )
+    client.portal.call(event_buffer.flush)
+    client.post(
+        "/api/media/upload",
+        headers=admin_headers,
+        json={
+            "type": "image",
+            "filename": "a.png",
+            "storage_url": "https://cdn.example.com/a.png",
+            "metadata": {"alt": "A"},
+            "variants": [{"format": "webp", "url": "https://cdn.example.com/a.webp"}],
+        },
+    )
+
+    response = client.get("/api/newsletter/subscribers", headers=admin_headers)
+    assert response.status_code == 200
+    assert "fast-path@example.com" in {row["email"] for row in response.json()}
+
+    response = client.get("/api/analytics/events", headers=admin_headers)
+    assert response.status_code == 200
+    assert response.json()[0]["event_type"]
+
+    response = client.get("/api/media", headers=admin_headers)
+    assert response.status_code == 200
+    asset = next(row for row in response.json() if row["filename"] == "a.png")
+    assert asset["metadata"] == {"alt": "A"}
+    assert asset["variants"][0]["format"] == "webp"
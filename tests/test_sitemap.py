@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import re
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from app.services import seo
+from app.services.content import ContentService
+
+
+def _content_selects(async_engine):
+    statements: list[str] = []
+
+    def listener(conn, cursor, statement, parameters, context, executemany):
+        if "FROM content_items" in statement:
+            statements.append(statement)
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", listener)
+    return statements, lambda: event.remove(async_engine.sync_engine, "before_cursor_execute", listener)
+
+
+def test_sharded_sitemap_is_cached_per_shard(
+    client: TestClient, admin_headers: dict[str, str], async_engine, monkeypatch
+) -> None:
+    monkeypatch.setattr(seo, "SITEMAP_SHARD_SIZE", 3)
+    ids = []
+    for index in range(4):
+        response = client.post(
+            "/api/content",
+            headers=admin_headers,
+            json={"type": "article", "title": f"Plan {index}", "slug": f"plan-du-site-{index}", "body": "Texte"},
+        )
+        ids.append(response.json()["id"])
+        assert client.post(f"/api/content/{ids[-1]}/publish", headers=admin_headers).status_code == 200
+    first, last = ids[0] // 3, ids[-1] // 3
+    assert first != last
+
+    response = client.get("/api/seo/sitemap.xml")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/xml")
+    locations = re.findall(r"<loc>([^<]+)</loc>", response.text)
+    assert f"http://testserver/api/seo/sitemaps/{first}.xml" in locations
+    assert f"http://testserver/api/seo/sitemaps/{last}.xml" in locations
+
+    response = client.get(f"/api/seo/sitemaps/{last}.xml")
+    assert "https://www.lavamedia.example/article/plan-du-site-3" in response.text
+    etag = response.headers["etag"]
+    assert client.get(f"/api/seo/sitemaps/{last}.xml", headers={"If-None-Match": etag}).status_code == 304
+    client.get(f"/api/seo/sitemaps/{first}.xml")
+
+    statements, stop = _content_selects(async_engine)
+    try:
+        client.get(f"/api/seo/sitemaps/{first}.xml")
+        client.get(f"/api/seo/sitemaps/{last}.xml")
+        client.get("/api/seo/sitemap.xml")
+        assert statements == []
+
+        # Only the edited item's shard (and the shard list) are rebuilt.
+        client.patch(f"/api/content/{ids[-1]}", headers=admin_headers, json={"slug": "plan-du-site-renomme"})
+        statements.clear()
+        client.get(f"/api/seo/sitemaps/{first}.xml")
+        response = client.get(f"/api/seo/sitemaps/{last}.xml")
+        shard_queries = [statement for statement in statements if "content_items.slug" in statement]
+        assert len(shard_queries) == 1
+    finally:
+        stop()
+    assert "plan-du-site-renomme" in response.text
+    assert response.headers["etag"] != etag
+
+    slugs = {entry["slug"] for entry in client.get("/api/seo/sitemaps").json()}
+    assert {"plan-du-site-0", "plan-du-site-renomme"} <= slugs
+    assert client.get("/api/seo/sitemaps/99999.xml").status_code == 404
+
+
+def test_sitemap_is_invalidated_only_after_commit(
+    client: TestClient, admin_headers: dict[str, str], session_factory, event_loop
+) -> None:
+    response = client.post(
+        "/api/content",
+        headers=admin_headers,
+        json={"type": "article", "title": "Plan", "slug": "plan-rollback", "body": "Texte"},
+    )
+    content_id = response.json()["id"]
+    assert client.post(f"/api/content/{content_id}/publish", headers=admin_headers).status_code == 200
+    assert client.get("/api/seo/sitemap.xml").status_code == 200
+
+    async def update(*, commit: bool) -> bytes | None:
+        async with session_factory() as session:
+            service = ContentService(session)
+            await service.update_content(await service.get_content(content_id), title="Plan v2")
+            if commit:
+                await session.commit()
+            else:
+                await session.rollback()
+        return await seo.sitemap_cache.get(seo._cache_key("shards"))
+
+    assert event_loop.run_until_complete(update(commit=False)) is not None
+    assert event_loop.run_until_complete(update(commit=True)) is None
+
+
+def test_content_created_published_appears_in_sitemap(client: TestClient, session_factory, event_loop) -> None:
+    assert client.get("/api/seo/sitemaps").status_code == 200
+
+    async def create() -> int:
+        async with session_factory() as session:
+            item = await ContentService(session).create_content(
+                type="article",
+                title="Plan direct",
+                slug="plan-publie-direct",
+                body="Texte",
+                created_by=None,
+                status="published",
+            )
+            await session.commit()
+            return item.id
+
+    content_id = event_loop.run_until_complete(create())
+    slugs = {entry["slug"] for entry in client.get("/api/seo/sitemaps").json()}
+    assert "plan-publie-direct" in slugs
+    response = client.get(f"/api/seo/sitemaps/{seo.sitemap_shard(content_id)}.xml")
+    assert "plan-publie-direct" in response.text
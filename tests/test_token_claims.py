@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+from uuid import uuid4
+
+from fastapi.testclient import TestClient
+from sqlalchemy import update
+
+from app.core.config import settings
+from app.core.security import decode_access_token
+from app.models.user import User
+from app.services.auth import AuthService
+from app.services.principal import roles_version_cache
+from tests.test_principal_cache import count_user_queries
+
+
+def _editor(client: TestClient, admin_headers: dict[str, str], session_factory, event_loop) -> tuple[int, str]:
+    email = f"claims-{uuid4().hex[:8]}@example.com"
+    response = client.post("/api/auth/signup", json={"email": email, "password": "password123"})
+    user_id = response.json()["user_id"]
+
+    async def editor_role() -> int:
+        async with session_factory() as session:
+            role = await AuthService(session).get_or_create_role("editor")
+            await session.commit()
+            return role.id
+
+    role_id = event_loop.run_until_complete(editor_role())
+    response = client.patch(f"/api/users/{user_id}", headers=admin_headers, json={"role_ids": [role_id]})
+    assert response.status_code == 200
+    return user_id, email
+
+
+def test_claims_authorise_without_loading_the_user(
+    client: TestClient, admin_headers: dict[str, str], async_engine, session_factory, event_loop, monkeypatch
+) -> None:
+    monkeypatch.setattr(settings, "auth_token_claims", True)
+    user_id, email = _editor(client, admin_headers, session_factory, event_loop)
+    response = client.post("/api/auth/login", json={"email": email, "password": "password123"})
+    token = response.json()["access_token"]
+    claims = decode_access_token(token)
+    assert "editor" in claims["roles"] and claims["act"] is True and claims["su"] is False
+    headers = {"Authorization": f"Bearer {token}"}
+
+    with count_user_queries(async_engine) as queries:
+        assert client.get("/api/media", headers=headers).status_code == 200
+        # Only the roles version is read, and only once per staleness window.
+        assert len(queries) == 1 and "roles_version" in queries[0] and "user_roles" not in queries[0]
+        assert client.get("/api/media", headers=headers).status_code == 200
+        assert len(queries) == 1
+
+    # A change made by another worker is noticed once the cached version expires.
+    async def bump_elsewhere() -> None:
+        async with session_factory() as session:
+            await session.execute(
+                update(User).where(User.id == user_id).values(roles_version=User.roles_version + 1)
+            )
+            await session.commit()
+
+    event_loop.run_until_complete(bump_elsewhere())
+    assert client.get("/api/media", headers=headers).status_code == 200
+    event_loop.run_until_complete(roles_version_cache.invalidate(str(user_id)))
+    response = client.get("/api/media", headers=headers)
+    assert response.status_code == 401 and response.json()["detail"] == "Token roles are outdated"
+
+    # Changes through AuthService take effect immediately.
+    response = client.post("/api/auth/login", json={"email": email, "password": "password123"})
+    headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+    assert client.get("/api/media", headers=headers).status_code == 200
+    assert client.patch(f"/api/users/{user_id}", headers=admin_headers, json={"role_ids": []}).status_code == 200
+    assert client.get("/api/media", headers=headers).status_code == 401
+
+
+def test_roles_version_is_invalidated_only_after_commit(
+    client: TestClient, admin_headers: dict[str, str], session_factory, event_loop, monkeypatch
+) -> None:
+    monkeypatch.setattr(settings, "auth_token_claims", True)
+    user_id, email = _editor(client, admin_headers, session_factory, event_loop)
+    response = client.post("/api/auth/login", json={"email": email, "password": "password123"})
+    headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+    assert client.get("/api/media", headers=headers).status_code == 200
+
+    async def drop_roles(*, commit: bool) -> bytes | None:
+        async with session_factory() as session:
+            service = AuthService(session)
+            await service.update_user(await service.get_user(user_id), role_ids=[])
+            # Until the commit, concurrent requests must not re-cache the old version.
+            assert await roles_version_cache.get(str(user_id)) is not None
+            if commit:
+                await session.commit()
+            else:
+                await session.rollback()
+        return await roles_version_cache.get(str(user_id))
+
+    assert event_loop.run_until_complete(drop_roles(commit=False)) is not None
+    assert client.get("/api/media", headers=headers).status_code == 200
+    assert event_loop.run_until_complete(drop_roles(commit=True)) is None
+    assert client.get("/api/media", headers=headers).status_code == 401